@@ -3,17 +3,44 @@ Voice AI API Endpoints
 Outbound voice calls using Twilio Voice API
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, FileResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, Dict, List, Literal, Tuple
+from dataclasses import replace
+from functools import partial
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+import asyncio
+import base64
+import binascii
+import json
+import re
+import time
 import uuid
 
 from app.services.sarvam_service import sarvam_service
 from app.services.groq_service import groq_service
+from app.services.campaign_service import campaign_service
+from app.services.twilio_rest import twilio_rest_client, TwilioAPIError
+from app.services.call_pacer import call_pacer
+from app.services.number_pool import number_pool
+from app.services.event_hub import event_hub
+from app.services.media_stream import media_stream_manager
+from app.services.speech_turns import speech_turn_service, SpeechTurn
+from app.services.sentence_tts import speak_sentences
+from app.services.retry_scheduler import retry_scheduler, RetryJob
+from app.services.call_status_ingestor import call_status_ingestor, CallStatusEvent, TWILIO_CALL_STATUSES
+from app.services.greeting_templates import greeting_templates, Segments
+from app.services.tts_cache import tts_cache
+from app.services.llm_cache import llm_cache
+from app.services.audio_store import audio_store
+from app.services.call_session_store import call_session_store, CallSession, SUMMARY_FIELDS, PROJECTABLE_FIELDS
+
+from app.core.config import settings
 
 from app.core.logging import logger, audit_log
-from app.core.security import ConsentManager, get_call_recording_disclosure
+from app.core.security import ConsentManager
 
 router = APIRouter()
 
@@ -28,6 +55,24 @@ class OutboundCallRequest(BaseModel):
     language: str = "en"
     customer_data: dict = {}
     public_url: Optional[str] = None
+    call_mode: Literal["playback", "conversation", "gather"] = "playback"
+
+
+class CampaignRecipient(BaseModel):
+    """Single campaign recipient"""
+    phone_number: str
+    customer_data: dict = {}
+    language: Optional[str] = None  # Overrides the campaign language
+
+
+class CampaignRequest(BaseModel):
+    """Bulk outbound campaign request"""
+    recipients: List[CampaignRecipient]
+    purpose: str
+    sector: str = "banking"
+    language: str = "en"
+    public_url: Optional[str] = None
+    call_mode: Literal["playback", "conversation", "gather"] = "playback"
 
 
 class VoiceQueryRequest(BaseModel):
@@ -38,11 +83,6 @@ class VoiceQueryRequest(BaseModel):
     session_id: Optional[str] = None
 
 
-# ==================== CALL SESSIONS ====================
-
-call_sessions = {}
-
-
 # ==================== ENDPOINTS ====================
 
 @router.post("/outbound")
@@ -59,104 +99,26 @@ async def initiate_outbound_call(request: OutboundCallRequest):
     try:
         logger.info(f"🔵 Initiating REAL voice call to {request.phone_number}")
         
-        # Check consent
-        if not ConsentManager.check_consent(request.phone_number, "outbound_call"):
-            logger.warning(f"No outbound call consent for {request.phone_number}")
-            ConsentManager.record_consent(
-                user_id=request.phone_number,
-                consent_type="outbound_call",
-                granted=False
-            )
-        
-        # Create call session
-        call_id = str(uuid.uuid4())
-        call_sessions[call_id] = {
-            "call_id": call_id,
-            "phone_number": request.phone_number,
-            "purpose": request.purpose,
-            "sector": request.sector,
-            "language": request.language,
-            "customer_data": request.customer_data,
-            "status": "initiated",
-            "created_at": datetime.utcnow().isoformat(),
-            "messages": [],
-            "public_url": request.public_url
-        }
+        call_id = await _create_call_session(request)
         
         # Generate initial greeting
-        greeting = await _generate_call_greeting(request)
+        greeting, segments = _generate_call_greeting(request)
         logger.info(f"📝 Generated greeting: {greeting[:100]}...")
-
-        # Get language config for appropriate speaker
-        lang_config = sarvam_service.get_language_config(request.language)
-        speaker = lang_config.get("speaker", "meera")
-        
-        # Convert to speech using SARVAM AI (High Quality)
-        logger.info(f"🎙️ Generating Sarvam AI high-quality audio with speaker {speaker}...")
-        audio_bytes = await sarvam_service.text_to_speech(
-            text=greeting,
-            language=request.language,
-            speaker=speaker
-        )
-        
-        # Store audio and greeting in session
-        call_sessions[call_id]["audio_bytes"] = audio_bytes
-        call_sessions[call_id]["greeting"] = greeting
-        
-        # Make REAL Twilio Voice call
-        from twilio.rest import Client
-        from app.core.config import settings
-        
-        client = Client(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN
-        )
-        
-        # Create TwiML URL for the call
-        # This will be the URL Twilio calls to get instructions
-        if request.public_url:
-            base_url = request.public_url.rstrip('/')
-        elif settings.PUBLIC_URL:
-            base_url = settings.PUBLIC_URL.rstrip('/')
-        else:
-            base_url = settings.FRONTEND_URL.replace('3000', '8000')
-            
-        twiml_url = f"{base_url}/api/voice/twiml/{call_id}"
-        
-        logger.info(f"📞 Making Twilio Voice call to {request.phone_number}")
-        logger.info(f"🔗 TwiML URL: {twiml_url}")
         
-        # Initiate the call via Twilio
-        # Use PUBLIC_URL for status callback if available
-        status_callback_url = f"{base_url}/api/voice/status/{call_id}"
+        # Synthesize while the phone rings; the TwiML endpoint waits for it
+        started = time.monotonic()
+        audio_task = await _start_call_audio(call_id, request, greeting, segments)
+        try:
+            twilio_call = await _place_twilio_call(call_id, request)
+        except Exception:
+            # The synthesis runs on; it may share segments with other calls
+            await _fail_call_session(call_id)
+            raise
         
-        twilio_call = client.calls.create(
-            to=request.phone_number,
-            from_=settings.TWILIO_PHONE_NUMBER,
-            url=twiml_url,
-            method='POST',
-            status_callback=status_callback_url,
-            status_callback_event=['initiated', 'ringing', 'answered', 'completed']
+        logger.info(
+            f"✅ REAL Twilio call initiated in {(time.monotonic() - started) * 1000:.0f}ms "
+            f"(greeting audio {'ready' if audio_task.done() else 'still synthesizing'})"
         )
-        
-        # Update session with Twilio call SID
-        call_sessions[call_id]["twilio_call_sid"] = twilio_call.sid
-        call_sessions[call_id]["twilio_status"] = twilio_call.status
-        
-        # Audit log
-        audit_log(
-            event="outbound_call_initiated",
-            user_id=request.phone_number,
-            metadata={
-                "call_id": call_id,
-                "twilio_sid": twilio_call.sid,
-                "purpose": request.purpose,
-                "sector": request.sector,
-                "audio_gen": "sarvam_ai"
-            }
-        )
-        
-        logger.info(f"✅ REAL Twilio call initiated with Sarvam AI audio!")
         logger.info(f"   Call ID: {call_id}")
         logger.info(f"   Twilio SID: {twilio_call.sid}")
         
@@ -179,6 +141,90 @@ async def initiate_outbound_call(request: OutboundCallRequest):
         raise HTTPException(status_code=500, detail=f"Failed to initiate call: {str(e)}")
 
 
+@router.post("/campaigns")
+async def create_campaign(request: CampaignRequest):
+    """
+    Start a bulk outbound campaign
+    
+    Recipients flow through greeting -> Sarvam TTS -> Twilio dial stages,
+    each with a bounded queue and its own worker pool. Returns immediately;
+    poll GET /campaigns/{campaign_id} for progress.
+    
+    Args:
+        request: Campaign request
+    
+    Returns:
+        Campaign id and initial status
+    """
+    if not request.recipients:
+        raise HTTPException(status_code=400, detail="Campaign has no recipients")
+    
+    if len(request.recipients) > settings.CAMPAIGN_MAX_RECIPIENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campaign exceeds {settings.CAMPAIGN_MAX_RECIPIENTS} recipients"
+        )
+    
+    calls = [
+        OutboundCallRequest(
+            phone_number=recipient.phone_number,
+            purpose=request.purpose,
+            sector=request.sector,
+            language=recipient.language or request.language,
+            customer_data=recipient.customer_data,
+            public_url=request.public_url,
+            call_mode=request.call_mode
+        )
+        for recipient in request.recipients
+    ]
+    
+    greetings = _render_campaign_greetings(request.purpose, calls)
+    campaign_id = str(uuid.uuid4())
+    
+    campaign = campaign_service.start_campaign(
+        items=list(zip(calls, greetings)),
+        stages=[
+            ("session", partial(_campaign_session_stage, campaign_id), settings.CAMPAIGN_SESSION_WORKERS),
+            ("tts", _campaign_tts_stage, settings.CAMPAIGN_TTS_WORKERS),
+            ("dial", _campaign_dial_stage, settings.CAMPAIGN_DIAL_WORKERS)
+        ],
+        metadata={
+            "purpose": request.purpose,
+            "sector": request.sector,
+            "language": request.language
+        },
+        campaign_id=campaign_id
+    )
+    
+    return {
+        "success": True,
+        "campaign_id": campaign.campaign_id,
+        "status": campaign.status,
+        "total": campaign.total
+    }
+
+
+@router.get("/campaigns/{campaign_id}")
+async def get_campaign_status(campaign_id: str):
+    """
+    Get campaign progress and per-stage throughput
+    
+    Args:
+        campaign_id: Campaign ID
+    
+    Returns:
+        Campaign status
+    """
+    progress = await campaign_service.get_progress(campaign_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    
+    return {
+        "success": True,
+        "data": progress
+    }
+
+
 @router.post("/tts")
 async def text_to_speech(
     text: str,
@@ -203,7 +249,6 @@ async def text_to_speech(
             speaker=speaker
         )
         
-        import base64
         audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
         
         return {
@@ -218,6 +263,20 @@ async def text_to_speech(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/tts/cache")
+async def get_tts_cache_stats():
+    """
+    Get TTS audio cache statistics
+    
+    Returns:
+        Entry count, size and hit/miss counters
+    """
+    return {
+        "success": True,
+        "data": tts_cache.stats()
+    }
+
+
 @router.post("/stt")
 async def speech_to_text(
     audio: UploadFile = File(...),
@@ -284,7 +343,6 @@ async def process_voice_query(request: VoiceQueryRequest):
             language=request.language
         )
         
-        import base64
         audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
         
         return {
@@ -300,6 +358,184 @@ async def process_voice_query(request: VoiceQueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/query/speech")
+async def stream_voice_query(request: VoiceQueryRequest, http_request: Request):
+    """
+    Process voice query and stream the spoken answer sentence by sentence
+    
+    The answer is streamed from the LLM and split into sentences as they
+    complete; sentences are synthesized concurrently
+    (QUERY_TTS_CONCURRENCY) and sent in order as each is ready, so playback
+    can start after the first sentence instead of after the whole answer.
+    
+    Args:
+        request: Voice query request
+    
+    Returns:
+        application/x-ndjson: an "audio" line per sentence (index, text,
+        base64 WAV), then a "done" line with the full text and timings, or
+        an "error" line if the answer failed part way
+    """
+    session_id = request.session_id or str(uuid.uuid4())
+    started = time.monotonic()
+    timing: Dict[str, int] = {}
+    
+    def elapsed_ms() -> int:
+        return round((time.monotonic() - started) * 1000)
+    
+    async def answer_text():
+        deltas = groq_service.stream_bfsi_response(
+            user_query=request.text,
+            context="",
+            sector=request.sector,
+            language=request.language
+        )
+        try:
+            async for delta in deltas:
+                timing.setdefault("first_token_ms", elapsed_ms())
+                yield delta
+            timing["llm_ms"] = elapsed_ms()
+        finally:
+            await deltas.aclose()
+    
+    async def chunk_stream():
+        sentences = []
+        chunks = speak_sentences(answer_text(), language=request.language)
+        try:
+            async for chunk in chunks:
+                if await http_request.is_disconnected():
+                    logger.info(f"🔌 Voice query client left after {chunk.index} sentences")
+                    return
+                
+                timing.setdefault("first_audio_ms", elapsed_ms())
+                sentences.append(chunk.text)
+                yield json.dumps({
+                    "type": "audio",
+                    "index": chunk.index,
+                    "text": chunk.text,
+                    "audio": base64.b64encode(chunk.audio).decode("ascii"),
+                    "tts_ms": chunk.tts_ms
+                }, ensure_ascii=False) + "\n"
+            
+            timing["total_ms"] = elapsed_ms()
+            yield json.dumps({
+                "type": "done",
+                "session_id": session_id,
+                "text_response": " ".join(sentences),
+                "language": request.language,
+                "sentences": len(sentences),
+                "timing": timing
+            }, ensure_ascii=False) + "\n"
+            
+        except Exception as e:
+            logger.error(f"❌ Voice query failed: {str(e)}")
+            yield json.dumps({"type": "error", "session_id": session_id, "detail": str(e)}) + "\n"
+        finally:
+            await chunks.aclose()
+    
+    return StreamingResponse(
+        chunk_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/query/stream")
+async def stream_text_query(request: VoiceQueryRequest):
+    """
+    Process voice query and stream the answer text as it is generated
+    
+    Disconnecting cancels the LLM stream upstream.
+    
+    Args:
+        request: Voice query request
+    
+    Returns:
+        text/event-stream of "token" events ({"delta"}), then "done" with the
+        full text and time to first token, or "error"
+    """
+    session_id = request.session_id or str(uuid.uuid4())
+    
+    async def event_stream():
+        started = time.monotonic()
+        first_token_ms = None
+        parts = []
+        deltas = groq_service.stream_bfsi_response(
+            user_query=request.text,
+            context="",
+            sector=request.sector,
+            language=request.language
+        )
+        try:
+            async for delta in deltas:
+                if first_token_ms is None:
+                    first_token_ms = round((time.monotonic() - started) * 1000)
+                parts.append(delta)
+                yield f"event: token\ndata: {json.dumps({'delta': delta}, ensure_ascii=False)}\n\n"
+            
+            done = {
+                "session_id": session_id,
+                "text_response": "".join(parts),
+                "language": request.language,
+                "timing": {"ttft_ms": first_token_ms, "total_ms": round((time.monotonic() - started) * 1000)}
+            }
+            yield f"event: done\ndata: {json.dumps(done, ensure_ascii=False)}\n\n"
+            
+        except Exception as e:
+            logger.error(f"❌ Streaming query failed: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'session_id': session_id, 'detail': str(e)})}\n\n"
+        finally:
+            await deltas.aclose()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/llm/cache")
+async def get_llm_cache_stats():
+    """
+    Get LLM response cache statistics
+    
+    Returns:
+        Entry count, hit/miss/bypass counters and hit rate
+    """
+    return {
+        "success": True,
+        "data": llm_cache.stats()
+    }
+
+
+@router.get("/llm/stats")
+async def get_llm_stats():
+    """
+    Groq concurrency: requests in flight, queued, and queue-wait percentiles
+    
+    Returns:
+        LLM client statistics
+    """
+    return {
+        "success": True,
+        "data": groq_service.stats()
+    }
+
+
+@router.get("/query/stream/stats")
+async def get_query_stream_stats():
+    """
+    LLM stream outcomes and time-to-first-token percentiles
+    
+    Returns:
+        Stream statistics
+    """
+    return {
+        "success": True,
+        "data": groq_service.stream_stats()
+    }
+
+
 @router.get("/call/{call_id}")
 async def get_call_details(call_id: str):
     """
@@ -311,12 +547,211 @@ async def get_call_details(call_id: str):
     Returns:
         Call details
     """
-    if call_id not in call_sessions:
+    session = await call_session_store.get(call_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Call not found")
+    
+    return {
+        "success": True,
+        "data": session.to_dict()
+    }
+
+
+@router.get("/calls")
+async def list_calls(
+    status: Optional[str] = None,
+    purpose: Optional[str] = None,
+    language: Optional[str] = None,
+    sector: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    fields: Optional[str] = None
+):
+    """
+    List calls, newest first, with keyset cursor pagination
+    
+    Args:
+        status: Current status (initiated, ringing, in-progress, completed, failed, ...)
+        purpose: Call purpose
+        language: Language code
+        sector: Business sector
+        created_after: Only calls created at or after this time (ISO 8601, UTC if naive)
+        created_before: Only calls created before this time
+        cursor: next_cursor from the previous page
+        limit: Page size (max 500)
+        fields: Comma-separated fields to return (default: summary fields)
+    
+    Returns:
+        Page of calls and the cursor for the next page
+    """
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+    
+    names = _split_ids(fields) or SUMMARY_FIELDS
+    unknown = [name for name in names if name not in PROJECTABLE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(sorted(PROJECTABLE_FIELDS))})"
+        )
+    
+    sessions, next_key = await call_session_store.list_sessions(
+        status=status,
+        purpose=purpose,
+        language=language,
+        sector=sector,
+        created_after=_epoch(created_after),
+        created_before=_epoch(created_before),
+        cursor=_decode_cursor(cursor) if cursor else None,
+        limit=limit
+    )
+    
+    return {
+        "success": True,
+        "data": [session.project(names) for session in sessions],
+        "next_cursor": _encode_cursor(next_key) if next_key else None
+    }
+
+
+@router.get("/calls/by-sid/{twilio_call_sid}")
+async def get_call_by_sid(twilio_call_sid: str):
+    """
+    Get a call session by its Twilio call SID
+    
+    Args:
+        twilio_call_sid: Twilio call SID (CA...)
+    
+    Returns:
+        Call details
+    """
+    session = await call_session_store.get_by_sid(twilio_call_sid)
+    if session is None:
         raise HTTPException(status_code=404, detail="Call not found")
     
     return {
         "success": True,
-        "data": call_sessions[call_id]
+        "data": session.to_dict()
+    }
+
+
+@router.get("/calls/by-phone/{phone_number}")
+async def get_calls_by_phone(phone_number: str, limit: int = 20):
+    """
+    Get the latest call and recent calls to a customer number
+    
+    Args:
+        phone_number: Customer number (E.164)
+        limit: Maximum recent calls to return
+    
+    Returns:
+        Latest call plus recent calls, newest first
+    """
+    latest = await call_session_store.latest_for_phone(phone_number)
+    if latest is None:
+        raise HTTPException(status_code=404, detail="No calls to this number")
+    
+    return {
+        "success": True,
+        "data": {
+            "latest": latest.to_dict(),
+            "recent": [
+                session.to_dict()
+                for session in await call_session_store.find_by_phone(phone_number, limit=min(limit, 100))
+            ]
+        }
+    }
+
+
+@router.get("/calls/by-status/{status}")
+async def get_calls_by_status(status: str, limit: int = 100):
+    """
+    Get calls currently in a status (initiated, ringing, in-progress, completed, failed, ...)
+    
+    Args:
+        status: Current call status
+        limit: Maximum calls to return
+    
+    Returns:
+        Matching calls and the total count
+    """
+    sessions = await call_session_store.find_by_status(status, limit=min(limit, 1000))
+    counts = await call_session_store.status_counts()
+    
+    return {
+        "success": True,
+        "data": {
+            "status": status,
+            "total": counts.get(status, 0),
+            "calls": [session.to_dict() for session in sessions]
+        }
+    }
+
+
+@router.get("/dialer/stats")
+async def get_dialer_stats():
+    """
+    Get outbound call pacing statistics
+    
+    Returns:
+        Token levels per caller ID and account, dial slot wait times
+    """
+    return {
+        "success": True,
+        "data": call_pacer.stats()
+    }
+
+
+@router.get("/numbers")
+async def get_number_pool():
+    """
+    Get caller ID pool load and health
+    
+    Returns:
+        Per-number in-flight calls, failures and availability
+    """
+    return {
+        "success": True,
+        "data": number_pool.stats()
+    }
+
+
+@router.post("/numbers/{number}/{action}")
+async def set_number_state(number: str, action: str):
+    """
+    Enable or disable a caller ID in the pool
+    
+    Args:
+        number: Caller ID (E.164)
+        action: enable or disable
+    
+    Returns:
+        Updated pool state
+    """
+    if action not in ("enable", "disable"):
+        raise HTTPException(status_code=400, detail="Action must be 'enable' or 'disable'")
+    
+    if not number_pool.set_enabled(number, action == "enable"):
+        raise HTTPException(status_code=404, detail="Number not in pool")
+    
+    return {
+        "success": True,
+        "data": number_pool.stats()
+    }
+
+
+@router.get("/sessions/stats")
+async def get_session_stats():
+    """
+    Get call session store statistics
+    
+    Returns:
+        Entry counts, estimated memory and eviction counters
+    """
+    return {
+        "success": True,
+        "data": call_session_store.stats()
     }
 
 
@@ -332,17 +767,21 @@ async def complete_call(call_id: str, outcome: str):
     Returns:
         Success status
     """
-    if call_id not in call_sessions:
+    session = await call_session_store.update(
+        call_id,
+        status="completed",
+        outcome=outcome,
+        completed_at=time.time()
+    )
+    if session is None:
         raise HTTPException(status_code=404, detail="Call not found")
     
-    call_sessions[call_id]["status"] = "completed"
-    call_sessions[call_id]["outcome"] = outcome
-    call_sessions[call_id]["completed_at"] = datetime.utcnow().isoformat()
+    event_hub.publish_call_status(session)
     
     # Audit log
     audit_log(
         event="outbound_call_completed",
-        user_id=call_sessions[call_id]["phone_number"],
+        user_id=session.phone_number,
         metadata={
             "call_id": call_id,
             "outcome": outcome
@@ -380,102 +819,77 @@ async def get_available_voices(language: str = "en"):
 
 
 @router.post("/twiml/{call_id}")
-async def get_twiml_for_call(call_id: str):
+async def get_twiml_for_call(call_id: str, waited: float = 0.0):
     """
     TwiML endpoint for Twilio Voice calls
-    Returns instructions to <Play> the Sarvam AI audio
+    
+    Returns the TwiML prebuilt once the greeting audio was stored. If the
+    callee answers before synthesis finishes, the request is held up to
+    TWIML_AUDIO_HOLD_SECONDS, then Twilio is told to <Pause> and
+    <Redirect> back here (`waited` carries the time spent so far). Past
+    TWIML_AUDIO_WAIT_SECONDS, or as soon as synthesis has failed, the
+    greeting is spoken with <Say>.
     """
     try:
-        from fastapi.responses import Response
-        from app.core.config import settings
+        session = await call_session_store.get(call_id)
+        if session is None:
+            logger.error(f"❌ Call session not found: {call_id}")
+            return Response(content=_TWIML_NOT_FOUND, media_type="application/xml")
         
-        logger.info(f"📞 TwiML requested for call: {call_id}")
-        
-        if call_id not in call_sessions:
-            logger.error(f"❌ Call session not found: {call_id}")
-            twiml = '<?xml version="1.0" encoding="UTF-8"?><Response><Say>Meeting not found.</Say></Response>'
-            return Response(content=twiml, media_type="application/xml")
-        
-        session = call_sessions[call_id]
-        
-        # Check if audio is likely the mock audio (Sarvam failed)
-        # The mock audio header is very small (< 100 bytes usually)
-        audio_bytes = session.get("audio_bytes", b"")
-        use_fallback_tts = len(audio_bytes) < 100
-        
-        
-        # Language-specific Twilio voices
-        TWILIO_VOICES = {
-            "en": ("alice", "en-IN"),  # English with Indian accent
-            "hi": ("Polly.Aditi", "hi-IN"),  # Hindi (Amazon Polly via Twilio)
-            "ta": ("Polly.Aditi", "ta-IN"),  # Tamil
-            "te": ("Polly.Aditi", "te-IN"),  # Telugu  
-            "mr": ("Polly.Aditi", "mr-IN"),  # Marathi
-            "bn": ("Polly.Aditi", "bn-IN"),  # Bengali
-        }
-        
-        # Get language from session
-        language = session.get("language", "en")
-        voice, lang_code = TWILIO_VOICES.get(language, ("alice", "en-IN"))
-        
-        if use_fallback_tts:
-            logger.warning(f"⚠️ Sarvam TTS failed (size {len(audio_bytes)}), using Twilio TTS with {voice}")
-            greeting = session.get("greeting", "Hello, this is a call from your bank.")
-            # Escape XML special characters
-            greeting = greeting.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        if session.twiml is None and session.audio_ref is None:
+            if not session.audio_failed:
+                hold = max(0.0, min(settings.TWIML_AUDIO_HOLD_SECONDS, settings.TWIML_AUDIO_WAIT_SECONDS - waited))
+                session = await _wait_for_call_audio(call_id, hold) or session
+                waited += hold
             
-            twiml = f'''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Say voice="{voice}" language="{lang_code}">{greeting}</Say>
-    <Pause length="1"/>
-    <Say voice="{voice}" language="{lang_code}">Thank you for your time. Goodbye.</Say>
-</Response>'''
-        else:
-            # Use public URL for high quality audio
-            if session.get("public_url"):
-                base_url = session["public_url"].rstrip('/')
-            elif settings.PUBLIC_URL:
-                base_url = settings.PUBLIC_URL.rstrip('/')
-            else:
-                base_url = settings.FRONTEND_URL.replace('3000', '8000')
+            if session.audio_ref is None:
+                if session.audio_failed:
+                    logger.warning(f"⚠️ Greeting synthesis failed for call {call_id}, using <Say>")
+                    return Response(content=_render_call_twiml(session), media_type="application/xml")
                 
-            audio_url = f"{base_url}/api/voice/audio/{call_id}.wav"
-            
-            logger.info(f"🔗 Sending TwiML with <Play> URL: {audio_url}")
-            
-            twiml = f'''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Play>{audio_url}</Play>
-    <Pause length="1"/>
-    <Say voice="alice" language="en-IN">Thank you for your time. Goodbye.</Say>
-</Response>'''
+                if waited + 1 <= settings.TWIML_AUDIO_WAIT_SECONDS:
+                    return Response(content=_render_wait_twiml(session, waited + 1), media_type="application/xml")
+                
+                logger.warning(f"⚠️ Greeting audio not ready after {waited:.1f}s for call {call_id}, using <Say>")
+                return Response(content=_render_call_twiml(session), media_type="application/xml")
         
-        return Response(content=twiml, media_type="application/xml")
+        if session.twiml is None:
+            # Sessions dialed before TwiML was prebuilt; render once and keep it
+            session = await call_session_store.update(call_id, twiml=_render_call_twiml(session))
+        
+        return Response(content=session.twiml, media_type="application/xml")
         
     except Exception as e:
-        logger.error(f"❌ TwiML generation failed: {str(e)}")
-        twiml = '<?xml version="1.0" encoding="UTF-8"?><Response><Say>System error.</Say></Response>'
-        return Response(content=twiml, media_type="application/xml")
+        logger.error(f"❌ TwiML lookup failed: {str(e)}")
+        return Response(content=_TWIML_SYSTEM_ERROR, media_type="application/xml")
 
 
-@router.get("/audio/{call_id}.wav")
-async def get_call_audio(call_id: str):
-    """Serve the Sarvam AI audio file for a specific call session"""
-    from fastapi.responses import Response
-    import io
+@router.api_route("/audio/{call_id}.wav", methods=["GET", "HEAD"])
+async def get_call_audio(call_id: str, request: Request):
+    """
+    Serve the Sarvam AI audio file for a specific call session
     
-    if call_id not in call_sessions or "audio_bytes" not in call_sessions[call_id]:
+    Streams the stored file from disk with a strong ETag, Cache-Control
+    and single-range support (206 Partial Content).
+    """
+    session = await call_session_store.get(call_id)
+    digest = session.audio_ref if session else None
+    
+    if digest is None or audio_store.size_of(digest) is None:
         logger.error(f"❌ Audio not found for call: {call_id}")
         raise HTTPException(status_code=404, detail="Audio not found")
     
-    logger.info(f"🔊 Serving audio bytes for call: {call_id}")
-    audio_bytes = call_sessions[call_id]["audio_bytes"]
+    logger.info(f"🔊 Serving audio file for call: {call_id}")
+    return await _serve_audio(digest, request)
+
+
+@router.api_route("/audio/clips/{digest}.wav", methods=["GET", "HEAD"])
+async def get_audio_clip(digest: str, request: Request):
+    """Serve stored audio by digest (per-turn replies of gather calls)"""
+    if not _AUDIO_DIGEST.fullmatch(digest) or audio_store.size_of(digest) is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
     
-    return Response(
-        content=audio_bytes,
-        media_type="audio/wav",
-        headers={"Content-Length": str(len(audio_bytes))}
-    )
+    return await _serve_audio(digest, request)
 
 
 @router.post("/status/{call_id}")
@@ -500,116 +914,766 @@ async def handle_call_status(
     Returns:
         Success response
     """
+    if CallStatus not in TWILIO_CALL_STATUSES:
+        logger.warning(f"⚠️ Ignoring unknown call status '{CallStatus}' for {call_id}")
+        return {"success": False, "error": f"Unknown call status: {CallStatus}"}
+    
+    # Acknowledge now; the ingestor applies updates and audits in batches
+    await call_status_ingestor.submit(CallStatusEvent(
+        call_id=call_id,
+        call_sid=CallSid,
+        status=CallStatus,
+        from_number=From,
+        to_number=To
+    ))
+    
+    return {"success": True}
+
+
+@router.get("/events")
+async def stream_events(request: Request, call_ids: Optional[str] = None, campaign_ids: Optional[str] = None):
+    """
+    Server-Sent Events feed of live call status and campaign progress
+    
+    Updates are coalesced per call/campaign, so one connection can follow
+    thousands of calls. Omit filters to receive everything.
+    
+    Args:
+        call_ids: Comma-separated call IDs to follow
+        campaign_ids: Comma-separated campaign IDs to follow
+    
+    Returns:
+        text/event-stream of call_status and campaign_progress events
+    """
+    try:
+        subscriber = event_hub.subscribe(_split_ids(call_ids), _split_ids(campaign_ids))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                batch = await subscriber.next_batch(event_hub.coalesce_seconds, event_hub.keepalive_seconds)
+                if not batch:
+                    yield ": keepalive\n\n"
+                    continue
+                for event in batch:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            event_hub.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws/events")
+async def websocket_events(websocket: WebSocket, call_ids: Optional[str] = None, campaign_ids: Optional[str] = None):
+    """
+    WebSocket feed of live call status and campaign progress
+    
+    Sends {"events": [...]} per coalesced batch and {"type": "keepalive"}
+    when idle. Filters are the same as GET /events.
+    """
+    await websocket.accept()
+    try:
+        subscriber = event_hub.subscribe(_split_ids(call_ids), _split_ids(campaign_ids))
+    except RuntimeError as e:
+        await websocket.close(code=1013, reason=str(e))
+        return
+    
+    try:
+        while True:
+            batch = await subscriber.next_batch(event_hub.coalesce_seconds, event_hub.keepalive_seconds)
+            if batch:
+                await websocket.send_json({"events": batch})
+            else:
+                await websocket.send_json({"type": "keepalive"})
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        event_hub.unsubscribe(subscriber)
+
+
+@router.get("/events/stats")
+async def get_event_stats():
+    """
+    Get live event feed statistics
+    
+    Returns:
+        Subscriber count and published/delivered/coalesced counters
+    """
+    return {
+        "success": True,
+        "data": event_hub.stats()
+    }
+
+
+@router.websocket("/stream/{call_id}")
+async def media_stream(websocket: WebSocket, call_id: str):
+    """
+    Twilio Media Streams endpoint for conversational calls
+    
+    Caller audio is endpointed by a VAD, transcribed, answered by Groq and
+    spoken back with Sarvam AI as μ-law media frames on the same socket.
+    """
+    await websocket.accept()
+    
+    session = await call_session_store.get(call_id)
+    if session is None or session.call_mode != "conversation":
+        await websocket.close(code=1008, reason="Unknown conversation call")
+        return
+    
     try:
-        logger.info(f"📊 Call status update for {call_id}:")
-        logger.info(f"   Twilio SID: {CallSid}")
-        logger.info(f"   Status: {CallStatus}")
-        logger.info(f"   From: {From}")
-        logger.info(f"   To: {To}")
+        conversation = media_stream_manager.open(websocket, session)
+    except RuntimeError as e:
+        await websocket.close(code=1013, reason=str(e))
+        return
+    
+    try:
+        await conversation.run()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        media_stream_manager.close(conversation)
+
+
+@router.get("/stream/stats")
+async def get_media_stream_stats():
+    """
+    Conversational call counters and per-turn latency percentiles
+    
+    Returns:
+        Stream statistics
+    """
+    return {
+        "success": True,
+        "data": media_stream_manager.stats()
+    }
+
+
+@router.post("/gather/{call_id}")
+async def handle_gather(call_id: str, request: Request):
+    """
+    Next turn of a gather call
+    
+    Twilio posts the caller's SpeechResult; the reply is generated with the
+    call's history, synthesized within the turn budget and returned as the
+    next <Gather>, or as a closing prompt once GATHER_MAX_TURNS is reached.
+    """
+    try:
+        session = await call_session_store.get(call_id)
+        if session is None:
+            logger.error(f"❌ Call session not found: {call_id}")
+            return Response(content=_TWIML_NOT_FOUND, media_type="application/xml")
         
-        if call_id in call_sessions:
-            call_sessions[call_id]["twilio_status"] = CallStatus
-            call_sessions[call_id]["last_status_update"] = datetime.utcnow().isoformat()
-            
-            # Audit log
-            audit_log(
-                event=f"call_status_{CallStatus}",
-                user_id=To or "unknown",
-                metadata={
-                    "call_id": call_id,
-                    "twilio_sid": CallSid,
-                    "status": CallStatus
-                }
-            )
+        form = await request.form()
+        speech = (form.get("SpeechResult") or "").strip()
+        if not speech:
+            return Response(content=_render_gather_twiml(session, "", final=True), media_type="application/xml")
         
-        return {"success": True}
+        try:
+            confidence = float(form.get("Confidence"))
+        except (TypeError, ValueError):
+            confidence = None
+        
+        turn = await speech_turn_service.respond(session, speech, confidence)
+        twiml = _render_gather_twiml(
+            session,
+            _turn_prompt(session, turn),
+            final=turn.turn >= settings.GATHER_MAX_TURNS
+        )
+        return Response(content=twiml, media_type="application/xml")
         
     except Exception as e:
-        logger.error(f"❌ Status callback failed: {str(e)}")
-        return {"success": False, "error": str(e)}
-
+        logger.error(f"❌ Gather turn failed: {str(e)}")
+        return Response(content=_TWIML_SYSTEM_ERROR, media_type="application/xml")
 
-# ==================== HELPER FUNCTIONS ====================
 
-async def _generate_call_greeting(request: OutboundCallRequest) -> str:
-    """Generate personalized call greeting"""
-    
-    # English Greetings (Mutual Fund campaigns)
-    greetings_en = {
-        "sip_debit_reminder": (
-            "Hello, this is a reminder call from your mutual fund service provider. "
-            "Your SIP installment of ₹5,000 is scheduled to be deducted on 5th March. "
-            "Please ensure sufficient balance in your bank account. Thank you."
-        ),
-        "kyc_update_reminder": (
-            "Hello, this is an important message from your mutual fund service provider. "
-            "Our records show that your KYC needs to be updated. "
-            "Please complete your KYC at the earliest to continue uninterrupted investments. Thank you."
-        ),
-        "sip_failure_notification": (
-            "Hello, this is a notification from your mutual fund service provider. "
-            "Your recent SIP transaction could not be processed due to insufficient balance. "
-            "Please update your bank balance to avoid future SIP failures. Thank you."
-        ),
-        "default": "Hello, this is a message from your mutual fund service provider."
+@router.get("/gather/stats")
+async def get_gather_stats():
+    """
+    Gather turn counters, fallbacks and per-stage latency percentiles
+    
+    Returns:
+        Turn statistics
+    """
+    return {
+        "success": True,
+        "data": speech_turn_service.stats()
     }
 
-    # Hindi Greetings (Mutual Fund campaigns)
-    greetings_hi = {
-        "sip_debit_reminder": (
-            "नमस्कार, यह आपके म्यूचुअल फंड सेवा प्रदाता की ओर से एक रिमाइंडर कॉल है। "
-            "आपकी SIP की राशि ₹5,000, 5 मार्च को कटने वाली है। "
-            "कृपया अपने बैंक खाते में पर्याप्त बैलेंस सुनिश्चित करें। धन्यवाद।"
-        ),
-        "kyc_update_reminder": (
-            "नमस्कार, यह आपके म्यूचुअल फंड सेवा प्रदाता की ओर से एक महत्वपूर्ण सूचना है। "
-            "हमारे रिकॉर्ड के अनुसार आपका KYC अपडेट लंबित है। "
-            "कृपया बिना किसी रुकावट के निवेश जारी रखने के लिए जल्द से जल्द KYC पूरा करें। धन्यवाद।"
-        ),
-        "sip_failure_notification": (
-            "नमस्कार, यह आपके म्यूचुअल फंड सेवा प्रदाता की ओर से एक सूचना है। "
-            "अपर्याप्त बैलेंस के कारण आपकी हाल की SIP प्रक्रिया पूरी नहीं हो पाई। "
-            "कृपया भविष्य में SIP फेल होने से बचने के लिए अपना बैंक बैलेंस अपडेट करें। धन्यवाद।"
-        ),
-        "default": "नमस्कार, यह आपके म्यूचुअल फंड सेवा प्रदाता की ओर से एक संदेश है।"
+
+@router.get("/retries/stats")
+async def get_retry_stats():
+    """
+    Get call retry scheduler statistics
+    
+    Returns:
+        Pending retries, next due time and dispatch counters
+    """
+    return {
+        "success": True,
+        "data": retry_scheduler.stats()
     }
 
-    # Tamil Greetings (Mutual Fund campaigns)
-    greetings_ta = {
-        "sip_debit_reminder": (
-            "வணக்கம், இது உங்கள் மியூச்சுவல் ஃபண்ட் சேவை வழங்குநரிடமிருந்து வரும் நினைவூட்டல் அழைப்பு. "
-            "உங்கள் SIP தொகை ரூ.5,000, மார்ச் 5ஆம் தேதி பிடித்தம் செய்யப்படும். "
-            "உங்கள் வங்கி கணக்கில் போதிய இருப்பு இருப்பதை உறுதி செய்யுங்கள். நன்றி."
-        ),
-        "kyc_update_reminder": (
-            "வணக்கம், இது உங்கள் மியூச்சுவல் ஃபண்ட் சேவை வழங்குநரிடமிருந்து வரும் முக்கிய தகவல். "
-            "உங்கள் KYC புதுப்பிக்கப்பட வேண்டியுள்ளது. "
-            "உங்கள் முதலீடுகள் தடையின்றி தொடர, தயவுசெய்து KYC-யை விரைவில் முடிக்கவும். நன்றி."
-        ),
-        "sip_failure_notification": (
-            "வணக்கம், இது உங்கள் மியூச்சுவல் ஃபண்ட் சேவை வழங்குநரிடமிருந்து வரும் அறிவிப்பு. "
-            "போதிய இருப்பு இல்லாததால், உங்கள் சமீபத்திய SIP பரிவர்த்தனை செயல்படுத்தப்படவில்லை. "
-            "எதிர்கால SIP தோல்விகளைத் தவிர்க்க, உங்கள் வங்கி இருப்பை புதுப்பிக்கவும். நன்றி."
-        ),
-        "default": "வணக்கம், இது உங்கள் மியூச்சுவல் ஃபண்ட் சேவை வழங்குநரிடமிருந்து வரும் செய்தி."
+
+@router.delete("/retries/{chain_id}")
+async def cancel_call_retry(chain_id: str):
+    """
+    Cancel the pending retry of a call chain
+    
+    Args:
+        chain_id: call_id of the chain's first call
+    
+    Returns:
+        Success status
+    """
+    if not await retry_scheduler.cancel(chain_id):
+        raise HTTPException(status_code=404, detail="No pending retry for this call")
+    
+    audit_log(event="call_retry_cancelled", metadata={"chain_id": chain_id})
+    
+    return {"success": True, "chain_id": chain_id}
+
+
+@router.get("/status-queue/stats")
+async def get_status_queue_stats():
+    """
+    Get status callback ingestion statistics
+    
+    Returns:
+        Queue depth, batch sizes and applied/ignored counts
+    """
+    return {
+        "success": True,
+        "data": call_status_ingestor.stats()
     }
 
-    # Map languages to greetings
-    all_greetings = {
-        "en": greetings_en,
-        "hi": greetings_hi,
-        "ta": greetings_ta
+
+# ==================== HELPER FUNCTIONS ====================
+
+# Language-specific Twilio voices for the <Say> fallback
+TWILIO_VOICES = {
+    "en": ("alice", "en-IN"),  # English with Indian accent
+    "hi": ("Polly.Aditi", "hi-IN"),  # Hindi (Amazon Polly via Twilio)
+    "ta": ("Polly.Aditi", "ta-IN"),  # Tamil
+    "te": ("Polly.Aditi", "te-IN"),  # Telugu
+    "mr": ("Polly.Aditi", "mr-IN"),  # Marathi
+    "bn": ("Polly.Aditi", "bn-IN"),  # Bengali
+}
+
+_TWIML_NOT_FOUND = b'<?xml version="1.0" encoding="UTF-8"?><Response><Say>Meeting not found.</Say></Response>'
+_TWIML_SYSTEM_ERROR = b'<?xml version="1.0" encoding="UTF-8"?><Response><Say>System error.</Say></Response>'
+
+# Call audio never changes once stored under a call id
+_AUDIO_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+_AUDIO_DIGEST = re.compile(r"[0-9a-f]{64}")
+_BYTE_RANGE = re.compile(r"bytes\s*=\s*(\d*)\s*-\s*(\d*)", re.IGNORECASE)
+
+# Twilio errors caused by the dialed number rather than the caller ID
+_TWILIO_DESTINATION_ERRORS = frozenset({21211, 21214, 21216, 21217, 21219})
+
+# call_id -> greeting synthesis running alongside the Twilio dial (this worker only)
+_pending_call_audio: Dict[str, asyncio.Task] = {}
+
+def _split_ids(value: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated id filter"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()] or None
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    """Epoch seconds for a query datetime (naive values are UTC, like the API's timestamps)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _encode_cursor(key: Tuple[float, str]) -> str:
+    """Opaque page cursor for a (created_at, call_id) key"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        created_at, call_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(created_at), str(call_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _resolve_base_url(public_url: Optional[str]) -> str:
+    """Public base URL Twilio uses to reach this API"""
+    if public_url:
+        return public_url.rstrip('/')
+    elif settings.PUBLIC_URL:
+        return settings.PUBLIC_URL.rstrip('/')
+    else:
+        return settings.FRONTEND_URL.replace('3000', '8000')
+
+
+def _render_call_twiml(session: CallSession) -> str:
+    """
+    Render the TwiML for a call
+    
+    <Play>s the Sarvam AI audio, or falls back to Twilio <Say> when Sarvam
+    returned demo audio (the mock WAV header is < 100 bytes). Conversation
+    calls then <Connect> a Media Stream instead of saying goodbye; gather
+    calls play the greeting inside a speech <Gather>.
+    """
+    voice, lang_code = TWILIO_VOICES.get(session.language, TWILIO_VOICES["en"])
+    base_url = _resolve_base_url(session.public_url)
+    
+    if session.audio_size < 100:
+        logger.warning(f"⚠️ Sarvam TTS failed (size {session.audio_size}), using Twilio TTS with {voice}")
+        greeting = escape(session.greeting or "Hello, this is a call from your bank.")
+        opening = f'<Say voice="{voice}" language="{lang_code}">{greeting}</Say>'
+        goodbye = f'<Say voice="{voice}" language="{lang_code}">Thank you for your time. Goodbye.</Say>'
+    else:
+        # Use public URL for high quality audio
+        audio_url = f"{base_url}/api/voice/audio/{session.call_id}.wav"
+        logger.info(f"🔗 TwiML will <Play> URL: {audio_url}")
+        opening = f"<Play>{escape(audio_url)}</Play>"
+        goodbye = '<Say voice="alice" language="en-IN">Thank you for your time. Goodbye.</Say>'
+    
+    if session.call_mode == "gather":
+        return _render_gather_twiml(session, opening)
+    
+    if session.call_mode == "conversation":
+        stream_url = _websocket_url(f"{base_url}/api/voice/stream/{session.call_id}")
+        return f'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    {opening}
+    <Connect>
+        <Stream url="{escape(stream_url)}"/>
+    </Connect>
+</Response>'''
+    
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    {opening}
+    <Pause length="1"/>
+    {goodbye}
+</Response>'''
+
+
+def _render_gather_twiml(session: CallSession, prompt: str, final: bool = False) -> str:
+    """
+    Speak a prompt and collect the caller's answer with <Gather input="speech">
+    
+    Twilio posts the transcript to /gather/{call_id}; if the caller stays
+    silent the call continues past the <Gather> and says goodbye. A final
+    prompt hangs up instead of listening.
+    """
+    voice, lang_code = TWILIO_VOICES.get(session.language, TWILIO_VOICES["en"])
+    goodbye = f'<Say voice="{voice}" language="{lang_code}">Thank you for your time. Goodbye.</Say>'
+    
+    if final:
+        return f'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    {prompt}
+    <Pause length="1"/>
+    {goodbye}
+    <Hangup/>
+</Response>'''
+    
+    action_url = f"{_resolve_base_url(session.public_url)}/api/voice/gather/{session.call_id}"
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Gather input="speech" action="{escape(action_url)}" method="POST" language="{lang_code}" speechTimeout="auto" timeout="{settings.GATHER_TIMEOUT_SECONDS}">
+        {prompt}
+    </Gather>
+    {goodbye}
+</Response>'''
+
+
+def _turn_prompt(session: CallSession, turn: SpeechTurn) -> str:
+    """<Play> the turn's stored audio, or <Say> the reply when synthesis fell back"""
+    if turn.audio_ref is not None:
+        clip_url = f"{_resolve_base_url(session.public_url)}/api/voice/audio/clips/{turn.audio_ref}.wav"
+        return f"<Play>{escape(clip_url)}</Play>"
+    
+    voice, lang_code = TWILIO_VOICES.get(session.language, TWILIO_VOICES["en"])
+    return f'<Say voice="{voice}" language="{lang_code}">{escape(turn.reply)}</Say>'
+
+
+def _render_wait_twiml(session: CallSession, waited: float) -> str:
+    """Hold the answered call for a second, then fetch the TwiML again"""
+    base_url = _resolve_base_url(session.public_url)
+    redirect_url = f"{base_url}/api/voice/twiml/{session.call_id}?waited={waited:g}"
+    
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Pause length="1"/>
+    <Redirect method="POST">{escape(redirect_url)}</Redirect>
+</Response>'''
+
+
+def _websocket_url(url: str) -> str:
+    """ws(s):// form of an http(s):// URL"""
+    if url.startswith("https://"):
+        return "wss://" + url[len("https://"):]
+    if url.startswith("http://"):
+        return "ws://" + url[len("http://"):]
+    return url
+
+
+async def _serve_audio(digest: str, request: Request) -> Response:
+    """Stored audio with a strong ETag, Cache-Control and single-range support"""
+    size = audio_store.size_of(digest)
+    if size is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    
+    path = audio_store.path_for(digest)
+    headers = {
+        "ETag": f'"{digest}"',
+        "Cache-Control": _AUDIO_CACHE_CONTROL,
+        "Accept-Ranges": "bytes"
     }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    range_header = request.headers.get("range")
+    byte_range = _parse_byte_range(range_header, size) if range_header else None
+    if byte_range is not None:
+        start, end = byte_range
+        length = end - start + 1
+        content = b"" if request.method == "HEAD" else await asyncio.to_thread(_read_file_range, path, start, length)
+        
+        return Response(
+            content=content,
+            status_code=206,
+            media_type="audio/wav",
+            headers={
+                **headers,
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(length)
+            }
+        )
+    
+    return FileResponse(path, media_type="audio/wav", headers=headers)
+
+
+def _parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=start-end" or "bytes=-suffix" Range header
+    
+    Returns:
+        Inclusive (start, end) offsets, or None when the header must be
+        ignored (malformed, another unit or several ranges) and the whole
+        file served with a 200, as RFC 9110 requires
+    
+    Raises:
+        HTTPException: 416 for a well-formed range that starts past the end
+    """
+    match = _BYTE_RANGE.fullmatch(range_header.strip())
+    if match is None:
+        return None
+    
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = int(last) if last else max(start, size - 1)
+        if end < start:
+            return None
+    elif last:
+        # Suffix range: the final N bytes; "-0" asks for none
+        suffix = int(last)
+        start = max(size - suffix, 0) if suffix else size
+        end = size - 1
+    else:
+        return None
+    
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Range not satisfiable",
+            headers={"Accept-Ranges": "bytes", "Content-Range": f"bytes */{size}"}
+        )
+    
+    return start, min(end, size - 1)
+
+
+def _read_file_range(path, start: int, length: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(length)
+
+
+async def _create_call_session(
+    request: OutboundCallRequest,
+    attempt: int = 1,
+    retry_of: Optional[str] = None,
+    campaign_id: Optional[str] = None
+) -> str:
+    """Check consent and register a new call session"""
+    if not await ConsentManager.check_consent(request.phone_number, "outbound_call"):
+        logger.warning(f"No outbound call consent for {request.phone_number}")
+        await ConsentManager.record_consent(
+            user_id=request.phone_number,
+            consent_type="outbound_call",
+            granted=False
+        )
+    
+    session = await call_session_store.add(CallSession(
+        call_id=str(uuid.uuid4()),
+        phone_number=request.phone_number,
+        purpose=request.purpose,
+        sector=request.sector,
+        language=request.language,
+        customer_data=request.customer_data,
+        public_url=request.public_url,
+        attempt=attempt,
+        retry_of=retry_of,
+        campaign_id=campaign_id,
+        call_mode=request.call_mode
+    ))
+    
+    return session.call_id
+
+
+async def _synthesize_call_audio(
+    call_id: str,
+    request: OutboundCallRequest,
+    greeting: str,
+    segments: Segments
+) -> bytes:
+    """Convert the greeting segments to speech with Sarvam AI and attach it to the session"""
+    # Get language config for appropriate speaker
+    lang_config = sarvam_service.get_language_config(request.language)
+    speaker = lang_config.get("speaker", "meera")
+    
+    logger.info(f"🎙️ Generating Sarvam AI high-quality audio with speaker {speaker}...")
+    audio_bytes = await sarvam_service.synthesize_segments(
+        segments=segments,
+        language=request.language,
+        speaker=speaker,
+        encoding=settings.CALL_AUDIO_ENCODING
+    )
+    
+    session = await call_session_store.get(call_id)
+    if session is None or session.is_finished:
+        # The dial failed while we synthesized; nobody will fetch this audio
+        return audio_bytes
+    
+    # Keep audio on disk; the session only holds a reference. The TwiML is
+    # prebuilt in the same write, so Twilio's fetch is a lookup and no other
+    # writer (dial, status callbacks) touches these fields.
+    audio_ref = await audio_store.put(audio_bytes)
+    ready = replace(session, audio_ref=audio_ref, audio_size=len(audio_bytes), greeting=greeting)
+    await call_session_store.update(
+        call_id,
+        audio_ref=audio_ref,
+        audio_size=len(audio_bytes),
+        greeting=greeting,
+        twiml=_render_call_twiml(ready)
+    )
+    
+    return audio_bytes
+
+
+async def _start_call_audio(call_id: str, request: OutboundCallRequest, greeting: str, segments: Segments) -> asyncio.Task:
+    """Synthesize the greeting in the background so dialing does not wait for Sarvam"""
+    # The <Say> fallback needs the text before the audio exists
+    await call_session_store.update(call_id, greeting=greeting)
+    
+    async def synthesize():
+        try:
+            return await _synthesize_call_audio(call_id, request, greeting, segments)
+        except BaseException:
+            # Tells TwiML fetches (on any worker) to fall back to <Say> now
+            await call_session_store.update(call_id, audio_failed=True)
+            raise
+    
+    task = asyncio.create_task(synthesize())
+    _pending_call_audio[call_id] = task
+    
+    def _done(finished: asyncio.Task):
+        _pending_call_audio.pop(call_id, None)
+        if not finished.cancelled() and finished.exception() is not None:
+            logger.error(f"❌ Greeting synthesis failed for call {call_id}: {str(finished.exception())}")
+    
+    task.add_done_callback(_done)
+    return task
+
+
+async def _wait_for_call_audio(call_id: str, timeout: float) -> Optional[CallSession]:
+    """
+    Wait up to timeout for the call's greeting audio
+    
+    Awaits the synthesis task when it runs on this worker; otherwise polls
+    the (shared) session store. Returns early once synthesis has failed.
+    """
+    deadline = time.monotonic() + timeout
+    task = _pending_call_audio.get(call_id)
+    if task is not None:
+        await asyncio.wait({task}, timeout=timeout)
+    
+    while True:
+        session = await call_session_store.get(call_id)
+        if session is None or session.audio_ref is not None or session.audio_failed or time.monotonic() >= deadline:
+            return session
+        await asyncio.sleep(min(0.25, max(0.0, deadline - time.monotonic())))
+
+
+async def _place_twilio_call(call_id: str, request: OutboundCallRequest):
+    """Dial the customer through Twilio and record the call SID on the session"""
+    # TwiML URL Twilio calls to get instructions
+    base_url = _resolve_base_url(request.public_url)
+    twiml_url = f"{base_url}/api/voice/twiml/{call_id}"
+    status_callback_url = f"{base_url}/api/voice/status/{call_id}"
+    
+    # The synthesis task writes the TwiML together with the audio
+    if await call_session_store.get(call_id) is None:
+        raise RuntimeError(f"Call session {call_id} no longer exists")
+    
+    logger.info(f"📞 Making Twilio Voice call to {request.phone_number}")
+    logger.info(f"🔗 TwiML URL: {twiml_url}")
+    
+    # Reserve a caller ID; held until the call reaches a terminal status
+    from_number = await number_pool.acquire(call_id, request.phone_number)
+    await call_session_store.update(call_id, from_number=from_number)
+    
+    try:
+        twilio_call = await _create_paced_call(from_number, request.phone_number, twiml_url, status_callback_url)
+    except TwilioAPIError as e:
+        number_pool.release(call_id)
+        if e.code not in _TWILIO_DESTINATION_ERRORS:
+            number_pool.record_failure(from_number)
+        raise
+    except BaseException:
+        number_pool.release(call_id)
+        raise
+    
+    number_pool.record_success(from_number)
+    
+    # A status callback may beat create() back; never roll its status back to "queued"
+    await call_session_store.update(
+        call_id,
+        twilio_call_sid=twilio_call.sid,
+        if_unset={"twilio_status": twilio_call.status}
+    )
+    
+    audit_log(
+        event="outbound_call_initiated",
+        user_id=request.phone_number,
+        metadata={
+            "call_id": call_id,
+            "twilio_sid": twilio_call.sid,
+            "purpose": request.purpose,
+            "sector": request.sector,
+            "audio_gen": "sarvam_ai"
+        }
+    )
+    
+    return twilio_call
+
+
+async def _create_paced_call(from_number: str, to_number: str, twiml_url: str, status_callback_url: str):
+    """Create the Twilio call once the pacer grants a slot, backing off on 429"""
+    for attempt in range(settings.TWILIO_RATE_LIMIT_RETRIES + 1):
+        # Wait for a calls-per-second slot instead of hammering the API
+        waited = await call_pacer.acquire(from_number)
+        if waited >= 1:
+            logger.info(f"⏳ Waited {waited:.1f}s for a dial slot on {from_number}")
+        
+        try:
+            return await twilio_rest_client.create_call(
+                to=to_number,
+                from_=from_number,
+                url=twiml_url,
+                method='POST',
+                status_callback=status_callback_url,
+                status_callback_event=['initiated', 'ringing', 'answered', 'completed']
+            )
+        except TwilioAPIError as e:
+            if e.status_code != 429 or attempt == settings.TWILIO_RATE_LIMIT_RETRIES:
+                raise
+            call_pacer.throttle(from_number, settings.TWILIO_RATE_LIMIT_BACKOFF_SECONDS * 2 ** attempt)
 
-    # Get localized greetings based on request language, default to English
-    selected_greetings = all_greetings.get(request.language, greetings_en)
+
+async def redial_call(job: RetryJob):
+    """Place a scheduled retry through the regular outbound path (retry scheduler dispatch)"""
+    request = OutboundCallRequest(
+        phone_number=job.phone_number,
+        purpose=job.purpose,
+        sector=job.sector,
+        language=job.language,
+        customer_data=job.customer_data,
+        public_url=job.public_url,
+        call_mode=job.call_mode
+    )
     
-    # Get specific purpose greeting or default
-    greeting = selected_greetings.get(request.purpose, selected_greetings["default"])
+    call_id = await _create_call_session(
+        request, attempt=job.attempt, retry_of=job.chain_id, campaign_id=job.campaign_id
+    )
+    greeting, segments = _generate_call_greeting(request)
+    await _start_call_audio(call_id, request, greeting, segments)
     
-    # Add call recording disclosure
-    disclosure = get_call_recording_disclosure(request.language)
+    try:
+        await _place_twilio_call(call_id, request)
+    except Exception:
+        await _fail_call_session(call_id)
+        raise
+
+
+async def _fail_call_session(call_id: str):
+    """Mark a call that never reached the customer as failed and tell live subscribers"""
+    session = await call_session_store.update(call_id, status="failed")
+    if session is not None:
+        event_hub.publish_call_status(session)
+
+
+# Campaign pipeline stages: each receives the previous stage's return value
+
+async def _campaign_session_stage(campaign_id: str, item: Tuple[OutboundCallRequest, Tuple[str, Segments]]) -> dict:
+    request, (greeting, segments) = item
+    call_id = await _create_call_session(request, campaign_id=campaign_id)
+    return {"call_id": call_id, "request": request, "greeting": greeting, "segments": segments}
+
+
+async def _campaign_tts_stage(job: dict) -> dict:
+    try:
+        await _synthesize_call_audio(job["call_id"], job["request"], job["greeting"], job["segments"])
+    except (Exception, asyncio.CancelledError):
+        await _fail_call_session(job["call_id"])
+        raise
+    return job
+
+
+async def _campaign_dial_stage(job: dict) -> dict:
+    try:
+        await _place_twilio_call(job["call_id"], job["request"])
+    except Exception:
+        await _fail_call_session(job["call_id"])
+        raise
+    return job
+
+
+def _generate_call_greeting(request: OutboundCallRequest) -> Tuple[str, Segments]:
+    """Personalized call greeting as full text plus TTS segments"""
+    return greeting_templates.render(request.purpose, request.language, request.customer_data)
+
+
+def _render_campaign_greetings(purpose: str, calls: List[OutboundCallRequest]) -> List[Tuple[str, Segments]]:
+    """Render every recipient's greeting up front, one template lookup per language"""
+    by_language: Dict[str, List[int]] = {}
+    for index, call in enumerate(calls):
+        by_language.setdefault(call.language, []).append(index)
     
-    full_greeting = f"{greeting} {disclosure}"
+    greetings: List[Tuple[str, Segments]] = [None] * len(calls)
+    for language, indexes in by_language.items():
+        rendered = greeting_templates.render_batch(purpose, language, (calls[i].customer_data for i in indexes))
+        for index, greeting in zip(indexes, rendered):
+            greetings[index] = greeting
     
-    return full_greeting
+    return greetings
@@ -2,4 +2,4 @@
 Core Package Initialization
 """
 
-__all__ = ["config", "logging", "security"]
+__all__ = ["config", "logging", "security", "session_backend"]
@@ -22,6 +22,9 @@ class Settings(BaseSettings):
     GROQ_MODEL: str = "mixtral-8x7b-32768"
     GROQ_TEMPERATURE: float = 0.3
     GROQ_MAX_TOKENS: int = 2048
+    GROQ_API_URL: str = "https://api.groq.com"
+    GROQ_HTTP_TIMEOUT: float = 30.0
+    GROQ_MAX_IN_FLIGHT: int = 16  # Concurrent requests and streams; the rest queue
     
     # Sarvam AI
     SARVAM_API_KEY: str
@@ -29,11 +32,50 @@ class Settings(BaseSettings):
     SARVAM_STT_MODEL: str = "saaras:v1"
     SARVAM_API_URL: str = "https://api.sarvam.ai"
     
+    # TTS audio cache (disk-backed LRU)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_DIR: str = "./data/tts_cache"
+    TTS_CACHE_MAX_MB: int = 512
+    
+    # LLM response cache (in-memory LRU with TTL; context-free questions only)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    
+    # Per-call audio served to Twilio (content-addressed files)
+    AUDIO_STORE_DIR: str = "./data/audio"
+    # Audio is only fetched while its call is live; files unused for
+    # AUDIO_STORE_MAX_AGE_SECONDS (well past any session TTL) are pruned periodically
+    AUDIO_STORE_MAX_AGE_SECONDS: int = 86400
+    AUDIO_STORE_PRUNE_INTERVAL_SECONDS: int = 3600
+    CALL_AUDIO_ENCODING: str = "mulaw"  # mulaw (G.711, half the bytes) or pcm
+    # Greeting audio is synthesized while the phone rings; an early answer
+    # waits up to TWIML_AUDIO_WAIT_SECONDS for it before falling back to <Say>
+    TWIML_AUDIO_WAIT_SECONDS: float = 8.0
+    TWIML_AUDIO_HOLD_SECONDS: float = 3.0  # Per TwiML request, before <Pause>/<Redirect>
+    
     # Twilio
     TWILIO_ACCOUNT_SID: str
     TWILIO_AUTH_TOKEN: str
     TWILIO_WHATSAPP_NUMBER: str
     TWILIO_PHONE_NUMBER: str
+    TWILIO_PHONE_NUMBERS: str = ""  # Comma-separated caller ID pool (default: TWILIO_PHONE_NUMBER)
+    TWILIO_NUMBER_SELECTION: str = "least_loaded"  # least_loaded or round_robin
+    TWILIO_NUMBER_MAX_IN_FLIGHT: int = 0  # Concurrent calls per number (0 = unlimited)
+    TWILIO_NUMBER_FAILURE_THRESHOLD: int = 5
+    TWILIO_NUMBER_COOLDOWN_SECONDS: int = 300
+    TWILIO_NUMBER_MAX_HOLD_SECONDS: int = 14400
+    TWILIO_NUMBER_RECONCILE_SECONDS: float = 5.0  # Blocked dials re-check holds against shared sessions
+    TWILIO_API_URL: str = "https://api.twilio.com"
+    TWILIO_HTTP_MAX_CONNECTIONS: int = 50
+    TWILIO_HTTP_MAX_KEEPALIVE: int = 20
+    TWILIO_HTTP_TIMEOUT: float = 15.0
+    TWILIO_CPS_PER_NUMBER: float = 1.0
+    TWILIO_CPS_BURST: int = 1
+    TWILIO_ACCOUNT_CPS: float = 1.0
+    TWILIO_ACCOUNT_CPS_BURST: int = 1
+    TWILIO_RATE_LIMIT_BACKOFF_SECONDS: float = 2.0
+    TWILIO_RATE_LIMIT_RETRIES: int = 3
     
 
     
@@ -41,6 +83,12 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./data/bfsi_ai.db"
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Session backend shared across workers: memory (single worker), sqlite (one host), redis
+    SESSION_BACKEND: str = "memory"
+    SESSION_SQLITE_PATH: str = "./data/sessions.db"
+    WEB_CONCURRENCY: int = 1  # uvicorn worker processes (Dockerfile --workers)
+    WHATSAPP_SESSION_TTL_SECONDS: int = 86400
+    
     # ChromaDB
     CHROMA_PERSIST_DIR: str = "./data/chromadb"
     CHROMA_COLLECTION_NAME: str = "bfsi_documents"
@@ -65,6 +113,12 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173,http://127.0.0.1:3000,http://127.0.0.1:5173"
     
+    @property
+    def twilio_phone_numbers_list(self) -> List[str]:
+        """Parse the caller ID pool, falling back to the single TWILIO_PHONE_NUMBER"""
+        numbers = [number.strip() for number in self.TWILIO_PHONE_NUMBERS.split(",") if number.strip()]
+        return numbers or [self.TWILIO_PHONE_NUMBER]
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string"""
@@ -95,6 +149,61 @@ class Settings(BaseSettings):
     SUPPORTED_LANGUAGES: str = "en,hi,ta,te,mr,bn"
     DEFAULT_LANGUAGE: str = "en"
     
+    # ==================== CALL SESSIONS ====================
+    CALL_SESSION_MAX_ENTRIES: int = 100000
+    CALL_SESSION_MAX_BYTES: int = 268435456  # 256 MiB of session data per worker
+    CALL_SESSION_FINISHED_TTL_SECONDS: int = 3600
+    CALL_SESSION_ACTIVE_TTL_SECONDS: int = 21600
+    CALL_SESSION_SWEEP_INTERVAL_SECONDS: int = 60
+    STATUS_CALLBACK_QUEUE_SIZE: int = 10000
+    STATUS_CALLBACK_BATCH_SIZE: int = 200
+    
+    # Live event feed (SSE / WebSocket)
+    EVENT_HUB_MAX_SUBSCRIBERS: int = 500
+    EVENT_HUB_COALESCE_MS: int = 250
+    EVENT_HUB_KEEPALIVE_SECONDS: int = 15
+    
+    # ==================== CALL RETRIES ====================
+    CALL_RETRY_STATUSES: str = "no-answer,busy,failed"
+    CALL_RETRY_MAX_ATTEMPTS: int = 3  # Including the first call
+    CALL_RETRY_BASE_DELAY_SECONDS: int = 1800
+    CALL_RETRY_MAX_DELAY_SECONDS: int = 14400
+    CALL_RETRY_WINDOW_SPREAD_SECONDS: int = 1800
+    CALL_RETRY_DIAL_CONCURRENCY: int = 4
+    # Permitted calling hours (TRAI: 09:00-21:00 IST)
+    CALL_WINDOW_START_HOUR: int = 9
+    CALL_WINDOW_END_HOUR: int = 21
+    CALL_WINDOW_UTC_OFFSET_MINUTES: int = 330
+    
+    # ==================== CONVERSATIONAL CALLS ====================
+    # Twilio Media Streams (call_mode="conversation")
+    MEDIA_STREAM_MAX_STREAMS: int = 50
+    MEDIA_STREAM_MAX_TURNS: int = 20
+    MEDIA_STREAM_VAD_THRESHOLD: int = 400  # RMS of 16-bit PCM that counts as speech
+    MEDIA_STREAM_SILENCE_MS: int = 700  # Trailing silence that ends an utterance
+    MEDIA_STREAM_MIN_SPEECH_MS: int = 250
+    MEDIA_STREAM_MAX_UTTERANCE_SECONDS: float = 15.0
+    MEDIA_STREAM_TURN_TIMEOUT_SECONDS: float = 10.0  # STT -> LLM -> TTS budget per turn
+    # <Gather input="speech"> turns (call_mode="gather"); Twilio's webhook timeout is 15s
+    GATHER_MAX_TURNS: int = 10
+    GATHER_TURN_BUDGET_SECONDS: float = 10.0
+    GATHER_TTS_RESERVE_SECONDS: float = 3.0  # Part of the budget the LLM may not use
+    GATHER_TIMEOUT_SECONDS: int = 6  # Silence before the caller is considered done
+    
+    # ==================== VOICE QUERIES ====================
+    # Sentence-pipelined answers (POST /api/voice/query/speech)
+    QUERY_TTS_CONCURRENCY: int = 3
+    QUERY_SENTENCE_MIN_CHARS: int = 20  # Shorter sentences are merged into the next
+    
+    # ==================== CAMPAIGNS ====================
+    CAMPAIGN_MAX_RECIPIENTS: int = 50000
+    CAMPAIGN_QUEUE_SIZE: int = 100
+    CAMPAIGN_SESSION_WORKERS: int = 2
+    CAMPAIGN_TTS_WORKERS: int = 8
+    CAMPAIGN_DIAL_WORKERS: int = 4
+    CAMPAIGN_RETENTION_SECONDS: int = 86400  # Finished campaigns stay queryable this long
+    CAMPAIGN_MAX_FINISHED: int = 1000  # Oldest finished campaigns are dropped beyond this
+    
     # ==================== MONITORING ====================
     ENABLE_METRICS: bool = True
     SENTRY_DSN: str = ""
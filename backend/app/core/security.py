@@ -11,6 +11,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings, get_pii_patterns
 from app.core.logging import logger, audit_log
+from app.core.session_backend import session_backend
 
 
 # Password hashing
@@ -96,11 +97,12 @@ class PIIMasker:
 class ConsentManager:
     """Manage user consent for calls and messages"""
     
-    # In-memory storage (use Redis/DB in production)
-    consent_records = {}
+    # Stored in the configured session backend (memory, sqlite or redis)
+    backend = session_backend
+    NAMESPACE = "consent"
     
     @classmethod
-    def record_consent(
+    async def record_consent(
         cls,
         user_id: str,
         consent_type: str,
@@ -118,13 +120,13 @@ class ConsentManager:
         """
         consent_id = f"{user_id}:{consent_type}"
         
-        cls.consent_records[consent_id] = {
+        await cls.backend.set(cls.NAMESPACE, consent_id, {
             "user_id": user_id,
             "consent_type": consent_type,
             "granted": granted,
             "timestamp": datetime.utcnow().isoformat(),
             "metadata": metadata or {}
-        }
+        })
         
         # Audit log
         audit_log(
@@ -136,7 +138,7 @@ class ConsentManager:
         logger.info(f"Consent recorded: {user_id} - {consent_type} - {granted}")
     
     @classmethod
-    def check_consent(cls, user_id: str, consent_type: str) -> bool:
+    async def check_consent(cls, user_id: str, consent_type: str) -> bool:
         """
         Check if user has granted consent
         
@@ -148,7 +150,7 @@ class ConsentManager:
             True if consent granted, False otherwise
         """
         consent_id = f"{user_id}:{consent_type}"
-        record = cls.consent_records.get(consent_id)
+        record = await cls.backend.get(cls.NAMESPACE, consent_id)
         
         if not record:
             return False
@@ -156,10 +158,10 @@ class ConsentManager:
         return record.get("granted", False)
     
     @classmethod
-    def get_consent_history(cls, user_id: str) -> list:
+    async def get_consent_history(cls, user_id: str) -> list:
         """Get consent history for user"""
         return [
-            record for record in cls.consent_records.values()
+            record for record in await cls.backend.values(cls.NAMESPACE)
             if record["user_id"] == user_id
         ]
 
@@ -180,7 +182,9 @@ def get_call_recording_disclosure(language: str = "en") -> str:
         "en": "This call may be recorded for quality and training purposes. By continuing, you consent to this recording.",
         "hi": "यह कॉल गुणवत्ता और प्रशिक्षण उद्देश्यों के लिए रिकॉर्ड की जा सकती है। जारी रखकर, आप इस रिकॉर्डिंग के लिए सहमति देते हैं।",
         "ta": "இந்த அழைப்பு தரம் மற்றும் பயிற்சி நோக்கங்களுக்காக பதிவு செய்யப்படலாம். தொடர்வதன் மூலம், இந்த பதிவுக்கு நீங்கள் ஒப்புக்கொள்கிறீர்கள்.",
-        "te": "ఈ కాల్ నాణ్యత మరియు శిక్షణ ప్రయోజనాల కోసం రికార్డ్ చేయబడవచ్చని దయచేసి గమనించండి. కొనసాగడం ద్వారా, మీరు ఈ రికార్డింగ్‌కు అంగీకరిస్తున్నారు."
+        "te": "ఈ కాల్ నాణ్యత మరియు శిక్షణ ప్రయోజనాల కోసం రికార్డ్ చేయబడవచ్చని దయచేసి గమనించండి. కొనసాగడం ద్వారా, మీరు ఈ రికార్డింగ్‌కు అంగీకరిస్తున్నారు.",
+        "mr": "हा कॉल गुणवत्ता आणि प्रशिक्षणाच्या उद्देशाने रेकॉर्ड केला जाऊ शकतो. पुढे सुरू ठेवून, तुम्ही या रेकॉर्डिंगला संमती देता.",
+        "bn": "এই কলটি গুণমান এবং প্রশিক্ষণের উদ্দেশ্যে রেকর্ড করা হতে পারে। কথা চালিয়ে গিয়ে, আপনি এই রেকর্ডিংয়ে সম্মতি দিচ্ছেন।"
     }
     
     return disclosures.get(language, disclosures["en"])
@@ -0,0 +1,771 @@
+"""
+Session Backend
+Pluggable key-value storage for state shared across API workers
+"""
+
+import asyncio
+import heapq
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+# Mutates a record in place and returns its new TTL in seconds (None: never expires)
+RecordUpdate = Callable[[Dict[str, Any]], Optional[float]]
+
+# Index name -> sort score for one record, e.g. {"status:ringing": created_at}
+RecordIndexer = Callable[[Dict[str, Any]], Dict[str, float]]
+
+
+class SessionBackend(ABC):
+    """
+    Namespaced store of JSON-serializable dict records
+    
+    Namespaces separate record kinds ("call", "consent", "whatsapp", "call_retry").
+    Shared backends make records visible to every worker and instance.
+    
+    A namespace may register an indexer: every write then keeps sorted
+    secondary indexes over its records in the same transaction, and index
+    entries go away with the records they point at.
+    
+    Every method is a coroutine so request handlers never block the event
+    loop on storage I/O: Redis uses the asyncio client and SQLite runs its
+    statements on worker threads.
+    """
+    
+    name = "base"
+    shared = False
+    
+    def __init__(self):
+        self._indexers: Dict[str, RecordIndexer] = {}
+    
+    def register_indexer(self, namespace: str, indexer: RecordIndexer):
+        """Maintain secondary indexes over a namespace (register before writing to it)"""
+        self._indexers[namespace] = indexer
+    
+    @abstractmethod
+    async def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """Fetch a record, or None if missing or expired"""
+    
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        """Create or replace a record, optionally expiring after ttl_seconds"""
+    
+    @abstractmethod
+    async def delete(self, namespace: str, key: str):
+        """Remove a record"""
+    
+    @abstractmethod
+    async def values(self, namespace: str) -> List[Dict[str, Any]]:
+        """All live records in a namespace"""
+    
+    @abstractmethod
+    async def pop(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """Atomically fetch and remove a record; only one caller can win it"""
+    
+    @abstractmethod
+    async def index_range(
+        self,
+        namespace: str,
+        index: str,
+        below: Optional[Tuple[float, str]] = None,
+        min_score: Optional[float] = None,
+        limit: int = 100
+    ) -> List[Tuple[float, str]]:
+        """
+        Entries of a secondary index, highest (score, key) first
+        
+        Args:
+            namespace: Indexed namespace
+            index: Index name
+            below: Only entries whose (score, key) sorts before this one (a keyset cursor)
+            min_score: Only entries scored at least this
+            limit: Maximum entries
+        
+        Returns:
+            (score, key) pairs of live records
+        """
+    
+    @abstractmethod
+    async def index_counts(self, namespace: str, prefix: str = "") -> Dict[str, int]:
+        """Number of live records in each index whose name starts with prefix"""
+    
+    async def get_many(self, namespace: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch several records at once; missing or expired keys are left out"""
+        records = {}
+        for key in keys:
+            value = await self.get(namespace, key)
+            if value is not None:
+                records[key] = value
+        return records
+    
+    async def set_many(self, namespace: str, items: List[Tuple[str, Dict[str, Any], Optional[float]]]):
+        """Create or replace several (key, value, ttl_seconds) records at once"""
+        for key, value, ttl_seconds in items:
+            await self.set(namespace, key, value, ttl_seconds=ttl_seconds)
+    
+    async def modify(self, namespace: str, key: str, apply: RecordUpdate) -> Optional[Dict[str, Any]]:
+        """
+        Atomically read, change and write back one record
+        
+        No other writer, in this process or another, can change the record
+        between the read and the write, so concurrent updates to different
+        fields never drop each other's changes. apply may run more than once
+        when writers collide and must not have side effects.
+        
+        Args:
+            namespace: Record namespace
+            key: Record key
+            apply: Mutates the record in place and returns its new TTL
+        
+        Returns:
+            The record as written, or None if it does not exist
+        """
+        return (await self.modify_many(namespace, [(key, apply)])).get(key)
+    
+    async def modify_many(self, namespace: str, items: List[Tuple[str, RecordUpdate]]) -> Dict[str, Dict[str, Any]]:
+        """Atomically modify several (key, apply) records; missing keys are left out"""
+        records = {}
+        for key, apply in items:
+            record = await self.get(namespace, key)
+            if record is not None:
+                await self.set(namespace, key, record, ttl_seconds=apply(record))
+                records[key] = record
+        return records
+    
+    async def purge_expired(self) -> int:
+        """Delete expired records eagerly; returns the number removed"""
+        return 0
+    
+    async def aclose(self):
+        """Release connections"""
+
+
+class InMemorySessionBackend(SessionBackend):
+    """
+    Per-process dict storage; records are kept by reference, not copied
+    
+    No method suspends, so the default modify() cannot interleave with
+    another writer. Index queries scan the namespace: this backend holds
+    one worker's data, which the call session store indexes itself.
+    """
+    
+    name = "memory"
+    shared = False
+    
+    def __init__(self):
+        super().__init__()
+        # namespace -> key -> (expires_at or None, value)
+        self._data: Dict[str, Dict[str, Tuple[Optional[float], Dict[str, Any]]]] = {}
+    
+    async def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        return self._get(namespace, key)
+    
+    async def set(self, namespace: str, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else None
+        self._data.setdefault(namespace, {})[key] = (expires_at, value)
+    
+    async def delete(self, namespace: str, key: str):
+        self._data.get(namespace, {}).pop(key, None)
+    
+    async def values(self, namespace: str) -> List[Dict[str, Any]]:
+        return [value for _, value in self._live(namespace)]
+    
+    async def pop(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        value = self._get(namespace, key)
+        self._data.get(namespace, {}).pop(key, None)
+        return value
+    
+    async def index_range(
+        self,
+        namespace: str,
+        index: str,
+        below: Optional[Tuple[float, str]] = None,
+        min_score: Optional[float] = None,
+        limit: int = 100
+    ) -> List[Tuple[float, str]]:
+        indexer = self._indexers.get(namespace)
+        if indexer is None:
+            return []
+        
+        entries = []
+        for key, value in self._live(namespace):
+            score = indexer(value).get(index)
+            if score is None or (min_score is not None and score < min_score):
+                continue
+            if below is None or (score, key) < below:
+                entries.append((score, key))
+        return heapq.nlargest(limit, entries)
+    
+    async def index_counts(self, namespace: str, prefix: str = "") -> Dict[str, int]:
+        indexer = self._indexers.get(namespace)
+        counts: Dict[str, int] = {}
+        if indexer is None:
+            return counts
+        
+        for _, value in self._live(namespace):
+            for name in indexer(value):
+                if name.startswith(prefix):
+                    counts[name] = counts.get(name, 0) + 1
+        return counts
+    
+    async def purge_expired(self) -> int:
+        now = time.monotonic()
+        removed = 0
+        for records in self._data.values():
+            expired = [key for key, (expires_at, _) in records.items() if expires_at is not None and expires_at <= now]
+            for key in expired:
+                del records[key]
+            removed += len(expired)
+        return removed
+    
+    def _get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._data.get(namespace, {}).get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[namespace][key]
+            return None
+        return value
+    
+    def _live(self, namespace: str) -> List[Tuple[str, Dict[str, Any]]]:
+        now = time.monotonic()
+        return [
+            (key, value) for key, (expires_at, value) in self._data.get(namespace, {}).items()
+            if expires_at is None or expires_at > now
+        ]
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    SQLite storage shared by workers on one host; statements run on worker threads
+    
+    Index entries live in their own table, written in the same transaction
+    as their record. Reads join them to live records, so entries of expired
+    records are never returned even before purge_expired() deletes them.
+    """
+    
+    name = "sqlite"
+    shared = True
+    
+    def __init__(self, path: str):
+        super().__init__()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_index ("
+            "namespace TEXT NOT NULL, name TEXT NOT NULL, key TEXT NOT NULL, score REAL NOT NULL, "
+            "PRIMARY KEY (namespace, name, key))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS session_index_by_score ON session_index (namespace, name, score, key)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS session_index_by_key ON session_index (namespace, key)")
+    
+    async def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, namespace, key)
+    
+    async def set(self, namespace: str, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        await asyncio.to_thread(self._set_many, namespace, [(key, value, ttl_seconds)])
+    
+    async def delete(self, namespace: str, key: str):
+        await asyncio.to_thread(self._delete, namespace, key)
+    
+    async def values(self, namespace: str) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._values, namespace)
+    
+    async def pop(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._pop, namespace, key)
+    
+    async def index_range(
+        self,
+        namespace: str,
+        index: str,
+        below: Optional[Tuple[float, str]] = None,
+        min_score: Optional[float] = None,
+        limit: int = 100
+    ) -> List[Tuple[float, str]]:
+        return await asyncio.to_thread(self._index_range, namespace, index, below, min_score, limit)
+    
+    async def index_counts(self, namespace: str, prefix: str = "") -> Dict[str, int]:
+        return await asyncio.to_thread(self._index_counts, namespace, prefix)
+    
+    async def get_many(self, namespace: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not keys:
+            return {}
+        return await asyncio.to_thread(self._get_many, namespace, keys)
+    
+    async def set_many(self, namespace: str, items: List[Tuple[str, Dict[str, Any], Optional[float]]]):
+        if not items:
+            return
+        await asyncio.to_thread(self._set_many, namespace, items)
+    
+    async def modify_many(self, namespace: str, items: List[Tuple[str, RecordUpdate]]) -> Dict[str, Dict[str, Any]]:
+        if not items:
+            return {}
+        return await asyncio.to_thread(self._modify_many, namespace, items)
+    
+    async def purge_expired(self) -> int:
+        return await asyncio.to_thread(self._purge_expired)
+    
+    async def aclose(self):
+        await asyncio.to_thread(self._close)
+    
+    @contextmanager
+    def _transaction(self, mode: str = "") -> Iterator[None]:
+        """One transaction under the connection lock; IMMEDIATE takes the write lock up front"""
+        with self._lock:
+            self._conn.execute(f"BEGIN {mode}")
+            try:
+                yield
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def _write(self, namespace: str, key: str, value: Dict[str, Any], ttl_seconds: Optional[float], now: float):
+        """Write a record and its index entries (inside a transaction)"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value, ensure_ascii=False), now + ttl_seconds if ttl_seconds else None)
+        )
+        
+        indexer = self._indexers.get(namespace)
+        if indexer is not None:
+            self._conn.execute("DELETE FROM session_index WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.executemany(
+                "INSERT INTO session_index (namespace, name, key, score) VALUES (?, ?, ?, ?)",
+                [(namespace, name, key, score) for name, score in indexer(value).items()]
+            )
+    
+    def _get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM sessions WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return json.loads(row[0])
+    
+    def _delete(self, namespace: str, key: str):
+        with self._transaction():
+            self._conn.execute("DELETE FROM sessions WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.execute("DELETE FROM session_index WHERE namespace = ? AND key = ?", (namespace, key))
+    
+    def _get_many(self, namespace: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        rows = []
+        now = time.time()
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows += self._conn.execute(
+                    f"SELECT key, value FROM sessions WHERE namespace = ? AND key IN ({', '.join('?' * len(chunk))}) "
+                    "AND (expires_at IS NULL OR expires_at > ?)",
+                    (namespace, *chunk, now)
+                ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+    
+    def _set_many(self, namespace: str, items: List[Tuple[str, Dict[str, Any], Optional[float]]]):
+        # One transaction, so the batch costs one commit
+        now = time.time()
+        with self._transaction():
+            for key, value, ttl_seconds in items:
+                self._write(namespace, key, value, ttl_seconds, now)
+    
+    def _modify_many(self, namespace: str, items: List[Tuple[str, RecordUpdate]]) -> Dict[str, Dict[str, Any]]:
+        records = {}
+        # IMMEDIATE holds the write lock from the read to the commit, across processes too
+        with self._transaction("IMMEDIATE"):
+            now = time.time()
+            for key, apply in items:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM sessions WHERE namespace = ? AND key = ?",
+                    (namespace, key)
+                ).fetchone()
+                if row is None or (row[1] is not None and row[1] <= now):
+                    continue
+                
+                record = json.loads(row[0])
+                self._write(namespace, key, record, apply(record), now)
+                records[key] = record
+        return records
+    
+    def _values(self, namespace: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT value FROM sessions WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, time.time())
+            ).fetchall()
+        return [json.loads(value) for (value,) in rows]
+    
+    def _pop(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        # IMMEDIATE takes the write lock up front, so other processes cannot interleave
+        with self._transaction("IMMEDIATE"):
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM sessions WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM sessions WHERE namespace = ? AND key = ?", (namespace, key))
+                self._conn.execute("DELETE FROM session_index WHERE namespace = ? AND key = ?", (namespace, key))
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return json.loads(row[0])
+    
+    def _index_range(
+        self,
+        namespace: str,
+        index: str,
+        below: Optional[Tuple[float, str]],
+        min_score: Optional[float],
+        limit: int
+    ) -> List[Tuple[float, str]]:
+        sql = (
+            "SELECT i.score, i.key FROM session_index i "
+            "JOIN sessions s ON s.namespace = i.namespace AND s.key = i.key "
+            "WHERE i.namespace = ? AND i.name = ? AND (s.expires_at IS NULL OR s.expires_at > ?)"
+        )
+        params: List[Any] = [namespace, index, time.time()]
+        if below is not None:
+            sql += " AND (i.score < ? OR (i.score = ? AND i.key < ?))"
+            params += [below[0], below[0], below[1]]
+        if min_score is not None:
+            sql += " AND i.score >= ?"
+            params.append(min_score)
+        sql += " ORDER BY i.score DESC, i.key DESC LIMIT ?"
+        params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [(score, key) for score, key in rows]
+    
+    def _index_counts(self, namespace: str, prefix: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT i.name, COUNT(*) FROM session_index i "
+                "JOIN sessions s ON s.namespace = i.namespace AND s.key = i.key "
+                "WHERE i.namespace = ? AND substr(i.name, 1, ?) = ? AND (s.expires_at IS NULL OR s.expires_at > ?) "
+                "GROUP BY i.name",
+                (namespace, len(prefix), prefix, time.time())
+            ).fetchall()
+        return dict(rows)
+    
+    def _purge_expired(self) -> int:
+        with self._transaction():
+            removed = self._conn.execute(
+                "DELETE FROM sessions WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),)
+            ).rowcount
+            if removed:
+                self._conn.execute(
+                    "DELETE FROM session_index WHERE NOT EXISTS ("
+                    "SELECT 1 FROM sessions s WHERE s.namespace = session_index.namespace AND s.key = session_index.key)"
+                )
+        return removed
+    
+    def _close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Redis storage shared by workers across hosts (asyncio client)
+    
+    Each index is a sorted set. Per namespace, a hash remembers which
+    indexes hold each record and a sorted set tracks record expiry times,
+    so entries of expired records can be found and removed; index reads
+    purge them first.
+    """
+    
+    name = "redis"
+    shared = True
+    
+    def __init__(self, url: str, prefix: str = "bfsi", client: Any = None):
+        super().__init__()
+        if client is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError as e:
+                raise RuntimeError("SESSION_BACKEND=redis requires the 'redis' package") from e
+            client = aioredis.Redis.from_url(url, decode_responses=True)
+        
+        self._redis = client
+        self.prefix = prefix
+    
+    @property
+    def client(self) -> Any:
+        """The asyncio Redis client, for pub/sub"""
+        return self._redis
+    
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+    
+    def _index_key(self, namespace: str, index: str) -> str:
+        return f"{self.prefix}:~index:{namespace}:{index}"
+    
+    def _index_names_key(self, namespace: str) -> str:
+        # record key -> JSON list of the indexes holding it
+        return f"{self.prefix}:~indexed:{namespace}"
+    
+    def _expiry_key(self, namespace: str) -> str:
+        # record key -> epoch seconds it expires at
+        return f"{self.prefix}:~expiry:{namespace}"
+    
+    async def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        value = await self._redis.get(self._key(namespace, key))
+        return json.loads(value) if value is not None else None
+    
+    async def set(self, namespace: str, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        await self.set_many(namespace, [(key, value, ttl_seconds)])
+    
+    async def delete(self, namespace: str, key: str):
+        await self.pop(namespace, key)
+    
+    async def values(self, namespace: str) -> List[Dict[str, Any]]:
+        records = []
+        batch: List[str] = []
+        async for redis_key in self._redis.scan_iter(match=self._key(namespace, "*"), count=500):
+            batch.append(redis_key)
+            if len(batch) == 500:
+                records += await self._mget(batch)
+                batch = []
+        if batch:
+            records += await self._mget(batch)
+        return records
+    
+    async def pop(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        if namespace not in self._indexers:
+            value = await self._redis.getdel(self._key(namespace, key))
+            return json.loads(value) if value is not None else None
+        
+        async def pop_indexed(pipe) -> Optional[str]:
+            value = await pipe.get(self._key(namespace, key))
+            names = await self._indexed_names(pipe, namespace, [key])
+            pipe.multi()
+            pipe.delete(self._key(namespace, key))
+            self._queue_unindex(pipe, namespace, [key], names)
+            return value
+        
+        value = await self._redis.transaction(pop_indexed, self._key(namespace, key), value_from_callable=True)
+        return json.loads(value) if value is not None else None
+    
+    async def index_range(
+        self,
+        namespace: str,
+        index: str,
+        below: Optional[Tuple[float, str]] = None,
+        min_score: Optional[float] = None,
+        limit: int = 100
+    ) -> List[Tuple[float, str]]:
+        await self._purge_index(namespace)
+        index_key = self._index_key(namespace, index)
+        
+        high, skip = "+inf", 0
+        if below is not None:
+            # Equal scores come back in reverse key order; skip the ties at or after the cursor
+            high = below[0]
+            ties = await self._redis.zrangebyscore(index_key, below[0], below[0])
+            skip = sum(1 for key in ties if key >= below[1])
+        
+        entries = await self._redis.zrevrangebyscore(
+            index_key, high, min_score if min_score is not None else "-inf", start=skip, num=limit, withscores=True
+        )
+        return [(score, key) for key, score in entries]
+    
+    async def index_counts(self, namespace: str, prefix: str = "") -> Dict[str, int]:
+        await self._purge_index(namespace)
+        counts = {}
+        base = self._index_key(namespace, "")
+        async for index_key in self._redis.scan_iter(match=f"{base}{prefix}*", count=500):
+            counts[index_key[len(base):]] = await self._redis.zcard(index_key)
+        return counts
+    
+    async def get_many(self, namespace: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not keys:
+            return {}
+        values = await self._redis.mget([self._key(namespace, key) for key in keys])
+        return {key: json.loads(value) for key, value in zip(keys, values) if value is not None}
+    
+    async def set_many(self, namespace: str, items: List[Tuple[str, Dict[str, Any], Optional[float]]]):
+        if not items:
+            return
+        if namespace not in self._indexers:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value, ttl_seconds in items:
+                    pipe.set(self._key(namespace, key), json.dumps(value, ensure_ascii=False), ex=_expiry(ttl_seconds))
+                await pipe.execute()
+            return
+        
+        async def write_indexed(pipe):
+            names = await self._indexed_names(pipe, namespace, [key for key, _, _ in items])
+            pipe.multi()
+            for key, value, ttl_seconds in items:
+                self._queue_write(pipe, namespace, key, value, ttl_seconds, names.get(key, []))
+        
+        await self._redis.transaction(write_indexed, *[self._key(namespace, key) for key, _, _ in items])
+    
+    async def modify_many(self, namespace: str, items: List[Tuple[str, RecordUpdate]]) -> Dict[str, Dict[str, Any]]:
+        if not items:
+            return {}
+        redis_keys = [self._key(namespace, key) for key, _ in items]
+        
+        async def modify(pipe) -> Dict[str, Dict[str, Any]]:
+            # Runs again from the top if another writer touches a watched key before EXEC
+            values = await pipe.mget(redis_keys)
+            names = await self._indexed_names(pipe, namespace, [key for key, _ in items])
+            
+            records = {}
+            pipe.multi()
+            for (key, apply), value in zip(items, values):
+                if value is None:
+                    continue
+                record = json.loads(value)
+                self._queue_write(pipe, namespace, key, record, apply(record), names.get(key, []))
+                records[key] = record
+            return records
+        
+        return await self._redis.transaction(modify, *redis_keys, value_from_callable=True)
+    
+    async def purge_expired(self) -> int:
+        # Redis expires records itself; this clears index entries they left behind
+        removed = 0
+        for namespace in list(self._indexers):
+            removed += await self._purge_index(namespace)
+        return removed
+    
+    async def aclose(self):
+        await self._redis.aclose()
+    
+    async def _mget(self, redis_keys: List[str]) -> List[Dict[str, Any]]:
+        return [json.loads(value) for value in await self._redis.mget(redis_keys) if value is not None]
+    
+    async def _indexed_names(self, pipe: Any, namespace: str, keys: List[str]) -> Dict[str, List[str]]:
+        """Indexes currently holding each record (read inside a WATCH)"""
+        if namespace not in self._indexers:
+            return {}
+        values = await pipe.hmget(self._index_names_key(namespace), keys)
+        return {key: json.loads(value) for key, value in zip(keys, values) if value is not None}
+    
+    def _queue_write(
+        self,
+        pipe: Any,
+        namespace: str,
+        key: str,
+        value: Dict[str, Any],
+        ttl_seconds: Optional[float],
+        old_names: List[str]
+    ):
+        """Queue a record write and its index changes on a MULTI pipeline"""
+        expiry = _expiry(ttl_seconds)
+        pipe.set(self._key(namespace, key), json.dumps(value, ensure_ascii=False), ex=expiry)
+        
+        indexer = self._indexers.get(namespace)
+        if indexer is None:
+            return
+        
+        entries = indexer(value)
+        for name in old_names:
+            if name not in entries:
+                pipe.zrem(self._index_key(namespace, name), key)
+        for name, score in entries.items():
+            pipe.zadd(self._index_key(namespace, name), {key: score})
+        pipe.hset(self._index_names_key(namespace), key, json.dumps(list(entries), ensure_ascii=False))
+        if expiry:
+            pipe.zadd(self._expiry_key(namespace), {key: time.time() + expiry})
+        else:
+            pipe.zrem(self._expiry_key(namespace), key)
+    
+    def _queue_unindex(self, pipe: Any, namespace: str, keys: List[str], names: Dict[str, List[str]]):
+        for key in keys:
+            for name in names.get(key, []):
+                pipe.zrem(self._index_key(namespace, name), key)
+        pipe.hdel(self._index_names_key(namespace), *keys)
+        pipe.zrem(self._expiry_key(namespace), *keys)
+    
+    async def _purge_index(self, namespace: str) -> int:
+        """Drop index entries of records that have expired; returns how many"""
+        expired = await self._redis.zrangebyscore(self._expiry_key(namespace), "-inf", time.time(), start=0, num=1000)
+        if not expired:
+            return 0
+        redis_keys = [self._key(namespace, key) for key in expired]
+        
+        async def purge(pipe) -> int:
+            # A record rewritten since the expiry read exists again and keeps its entries
+            values = await pipe.mget(redis_keys)
+            gone = [key for key, value in zip(expired, values) if value is None]
+            names = await self._indexed_names(pipe, namespace, gone) if gone else {}
+            pipe.multi()
+            if gone:
+                self._queue_unindex(pipe, namespace, gone, names)
+            return len(gone)
+        
+        return await self._redis.transaction(purge, *redis_keys, value_from_callable=True)
+
+
+def _expiry(ttl_seconds: Optional[float]) -> Optional[int]:
+    """Redis EX seconds: whole, at least one, or None to never expire"""
+    return max(int(ttl_seconds), 1) if ttl_seconds else None
+
+
+def create_session_backend(kind: Optional[str] = None) -> SessionBackend:
+    """
+    Build the configured session backend
+    
+    Args:
+        kind: memory, sqlite or redis (default: settings.SESSION_BACKEND)
+    
+    Returns:
+        Session backend instance
+    """
+    kind = (kind or settings.SESSION_BACKEND).lower()
+    
+    if kind == "memory":
+        backend = InMemorySessionBackend()
+    elif kind == "sqlite":
+        backend = SQLiteSessionBackend(settings.SESSION_SQLITE_PATH)
+    elif kind == "redis":
+        backend = RedisSessionBackend(settings.REDIS_URL)
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND '{kind}' (expected memory, sqlite or redis)")
+    
+    logger.info(f"✅ Session backend: {backend.name}")
+    return backend
+
+
+# Create singleton instance
+session_backend = create_session_backend()
+
+
+# Export
+__all__ = [
+    "session_backend",
+    "create_session_backend",
+    "SessionBackend",
+    "RecordUpdate",
+    "RecordIndexer",
+    "InMemorySessionBackend",
+    "SQLiteSessionBackend",
+    "RedisSessionBackend"
+]
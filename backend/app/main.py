@@ -11,7 +11,16 @@ import time
 
 from app.core.config import settings
 from app.core.logging import setup_logging, logger
+from app.core.session_backend import session_backend
 from app.api import voice
+from app.services.campaign_service import campaign_service
+from app.services.twilio_rest import twilio_rest_client
+from app.services.groq_service import groq_service
+from app.services.audio_store import audio_store
+from app.services.call_session_store import call_session_store
+from app.services.call_status_ingestor import call_status_ingestor
+from app.services.retry_scheduler import retry_scheduler
+from app.services.event_hub import event_hub
 
 # Setup logging
 setup_logging()
@@ -23,11 +32,27 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug Mode: {settings.DEBUG}")
     
+    await twilio_rest_client.start()
+    audio_store.start_pruner()
+    call_session_store.start_sweeper()
+    call_status_ingestor.start()
+    event_hub.start()
+    await retry_scheduler.start(dispatch=voice.redial_call)
+    
     logger.info("✅ All services initialized successfully")
     
     yield
     
     logger.info("🛑 Shutting down BFSI AI Platform...")
+    await campaign_service.shutdown()
+    await retry_scheduler.stop()
+    await call_status_ingestor.stop()
+    await event_hub.stop()
+    await call_session_store.stop_sweeper()
+    await audio_store.stop_pruner()
+    await twilio_rest_client.aclose()
+    await groq_service.aclose()
+    await session_backend.aclose()
 
 
 # Create FastAPI app
@@ -0,0 +1,115 @@
+"""
+Call Audio Store
+Content-addressed on-disk storage for call audio served to Twilio
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class AudioStore:
+    """Write-once audio files named by their SHA-256 digest"""
+    
+    def __init__(self, root_dir: str, max_age_seconds: float, prune_interval_seconds: float):
+        self.root_dir = Path(root_dir)
+        self.max_age_seconds = max_age_seconds
+        self.prune_interval_seconds = prune_interval_seconds
+        self._pruner: Optional[asyncio.Task] = None
+    
+    async def put(self, audio_bytes: bytes) -> str:
+        """
+        Store audio and return its digest
+        
+        Identical audio (e.g. an unpersonalized greeting) is stored once.
+        
+        Args:
+            audio_bytes: Audio file bytes
+        
+        Returns:
+            Hex SHA-256 digest referencing the stored file
+        """
+        digest = hashlib.sha256(audio_bytes).hexdigest()
+        await asyncio.to_thread(self._write, self.path_for(digest), audio_bytes)
+        return digest
+    
+    def path_for(self, digest: str) -> Path:
+        """Filesystem path for a digest"""
+        return self.root_dir / digest[:2] / f"{digest}.wav"
+    
+    def size_of(self, digest: str) -> Optional[int]:
+        """Stored size in bytes, or None if the audio is missing"""
+        try:
+            return self.path_for(digest).stat().st_size
+        except OSError:
+            return None
+    
+    def prune(self, max_age_seconds: Optional[float] = None) -> int:
+        """Delete audio not written or reused within max_age_seconds"""
+        if not self.root_dir.exists():
+            return 0
+        
+        if max_age_seconds is None:
+            max_age_seconds = self.max_age_seconds
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for path in self.root_dir.glob("*/*.wav"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        
+        if removed:
+            logger.info(f"🧹 Pruned {removed} expired call audio files")
+        return removed
+    
+    def start_pruner(self):
+        """Start the periodic prune (called from the app lifespan)"""
+        if self._pruner is None:
+            self._pruner = asyncio.create_task(self._prune_loop())
+    
+    async def stop_pruner(self):
+        if self._pruner is not None:
+            self._pruner.cancel()
+            await asyncio.gather(self._pruner, return_exceptions=True)
+            self._pruner = None
+    
+    async def _prune_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.prune)
+            except Exception as e:
+                logger.error(f"Audio prune failed: {e}")
+            await asyncio.sleep(self.prune_interval_seconds)
+    
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        if path.exists():
+            # Already stored; refresh mtime so pruning keeps it
+            os.utime(path)
+            return
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+# Create singleton instance
+audio_store = AudioStore(
+    settings.AUDIO_STORE_DIR,
+    max_age_seconds=settings.AUDIO_STORE_MAX_AGE_SECONDS,
+    prune_interval_seconds=settings.AUDIO_STORE_PRUNE_INTERVAL_SECONDS
+)
+
+
+# Export
+__all__ = ["audio_store", "AudioStore"]
@@ -0,0 +1,275 @@
+"""
+Audio Utilities
+WAV parsing, PCM-level stitching and G.711 μ-law encoding for synthesized speech
+"""
+
+import io
+import struct
+import wave
+from typing import List, Tuple
+
+import numpy as np
+
+
+# (channels, sample width in bytes, sample rate)
+WavFormat = Tuple[int, int, int]
+
+
+def read_wav(audio_bytes: bytes) -> Tuple[WavFormat, bytes]:
+    """
+    Split a PCM WAV file into its format and raw frames
+    
+    Args:
+        audio_bytes: WAV file bytes
+    
+    Returns:
+        ((channels, sample_width, sample_rate), pcm_frames)
+    
+    Raises:
+        ValueError: If the bytes are not a readable PCM WAV file
+    """
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wav:
+            fmt = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Invalid WAV audio: {str(e)}") from e
+    
+    return fmt, frames
+
+
+def write_wav(fmt: WavFormat, frames: bytes) -> bytes:
+    """Wrap raw PCM frames in a WAV header"""
+    channels, sample_width, sample_rate = fmt
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+def concat_wav(segments: List[bytes], gap_ms: int = 0) -> bytes:
+    """
+    Concatenate WAV files at the PCM level
+    
+    Args:
+        segments: WAV files with identical channel count, width and rate
+        gap_ms: Silence inserted between segments
+    
+    Returns:
+        Single WAV file
+    
+    Raises:
+        ValueError: If a segment is unreadable or formats differ
+    """
+    if not segments:
+        raise ValueError("No audio segments to concatenate")
+    
+    fmt = None
+    chunks = []
+    for index, segment in enumerate(segments):
+        segment_fmt, frames = read_wav(segment)
+        if fmt is None:
+            fmt = segment_fmt
+        elif segment_fmt != fmt:
+            raise ValueError(f"Segment {index} format {segment_fmt} does not match {fmt}")
+        chunks.append(frames)
+    
+    channels, sample_width, sample_rate = fmt
+    silence = b"\x00" * (sample_rate * gap_ms // 1000) * channels * sample_width
+    
+    return write_wav(fmt, silence.join(chunks))
+
+
+# ==================== G.711 μ-LAW ====================
+
+WAVE_FORMAT_MULAW = 7
+
+# μ-law byte for a zero sample, used as inter-segment silence
+MULAW_SILENCE = b"\xff"
+
+_MULAW_BIAS = 0x84
+_MULAW_CLIP = 32635
+
+
+def _build_mulaw_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Encode table for every 16-bit sample and decode table for every μ-law byte"""
+    samples = np.arange(-32768, 32768, dtype=np.int32)
+    sign = np.where(samples < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(samples), _MULAW_CLIP) + _MULAW_BIAS
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    encoded = (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8)
+    # Index by the sample's unsigned 16-bit pattern so lookups need no offset
+    encode_table = np.empty(65536, dtype=np.uint8)
+    encode_table[samples.astype(np.uint16)] = encoded
+    
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + _MULAW_BIAS) << exponent) - _MULAW_BIAS
+    decode_table = np.where(codes & 0x80, -magnitude, magnitude).astype("<i2")
+    
+    return encode_table, decode_table
+
+
+_MULAW_ENCODE, _MULAW_DECODE = _build_mulaw_tables()
+
+
+def encode_mulaw(pcm_frames: bytes) -> bytes:
+    """Encode 16-bit little-endian PCM samples as μ-law bytes (one table lookup per sample)"""
+    samples = np.frombuffer(pcm_frames, dtype="<u2")
+    return _MULAW_ENCODE[samples].tobytes()
+
+
+def decode_mulaw(mulaw_frames: bytes) -> bytes:
+    """Decode μ-law bytes to 16-bit little-endian PCM"""
+    return _MULAW_DECODE[np.frombuffer(mulaw_frames, dtype=np.uint8)].tobytes()
+
+
+def write_mulaw_wav(channels: int, sample_rate: int, frames: bytes) -> bytes:
+    """Wrap μ-law frames in a WAVE_FORMAT_MULAW header (with the fact chunk non-PCM files need)"""
+    pad = b"\x00" if len(frames) % 2 else b""
+    fmt_chunk = struct.pack(
+        "<4sIHHIIHHH", b"fmt ", 18, WAVE_FORMAT_MULAW, channels,
+        sample_rate, sample_rate * channels, channels, 8, 0
+    )
+    fact_chunk = struct.pack("<4sII", b"fact", 4, len(frames) // channels)
+    data_header = struct.pack("<4sI", b"data", len(frames))
+    body = fmt_chunk + fact_chunk + data_header + frames + pad
+    return struct.pack("<4sI4s", b"RIFF", 4 + len(body), b"WAVE") + body
+
+
+def read_mulaw_wav(audio_bytes: bytes) -> Tuple[Tuple[int, int], bytes]:
+    """
+    Split a μ-law WAV file into (channels, sample_rate) and its frames
+    
+    Raises:
+        ValueError: If the bytes are not a μ-law WAV file
+    """
+    if len(audio_bytes) < 12 or audio_bytes[:4] != b"RIFF" or audio_bytes[8:12] != b"WAVE":
+        raise ValueError("Invalid WAV audio: not a RIFF/WAVE file")
+    
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(audio_bytes):
+        chunk_id, size = struct.unpack_from("<4sI", audio_bytes, offset)
+        body = audio_bytes[offset + 8:offset + 8 + size]
+        if chunk_id == b"fmt ":
+            if len(body) < 16:
+                raise ValueError("Invalid WAV audio: short fmt chunk")
+            format_tag, channels, sample_rate = struct.unpack_from("<HHI", body)
+            if format_tag != WAVE_FORMAT_MULAW:
+                raise ValueError(f"Invalid WAV audio: format {format_tag} is not μ-law")
+            fmt = (channels, sample_rate)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("Invalid WAV audio: data before fmt chunk")
+            return fmt, body
+        offset += 8 + size + (size % 2)
+    
+    raise ValueError("Invalid WAV audio: no data chunk")
+
+
+def pcm_wav_to_mulaw(audio_bytes: bytes, sample_rate: int = 8000) -> bytes:
+    """
+    Transcode a 16-bit PCM WAV file to a μ-law WAV at the telephony rate
+    
+    Half the bytes (less again when resampled from a TTS rate), in the
+    encoding Twilio plays natively at 8 kHz.
+    
+    Raises:
+        ValueError: If the input is not 16-bit PCM WAV
+    """
+    (channels, sample_width, rate), frames = read_wav(audio_bytes)
+    if sample_width != 2:
+        raise ValueError(f"Cannot μ-law encode {sample_width * 8}-bit PCM")
+    
+    if rate != sample_rate:
+        samples = np.frombuffer(frames, dtype="<i2")
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+        frames = np.column_stack([
+            resample_pcm16(samples[:, channel], rate, sample_rate) for channel in range(channels)
+        ]).astype("<i2").tobytes()
+    
+    return write_mulaw_wav(channels, sample_rate, encode_mulaw(frames))
+
+
+def concat_mulaw_wav(segments: List[bytes], gap_ms: int = 0) -> bytes:
+    """
+    Concatenate μ-law WAV files frame-wise (μ-law is per-sample, so no re-encoding)
+    
+    Raises:
+        ValueError: If a segment is unreadable or formats differ
+    """
+    if not segments:
+        raise ValueError("No audio segments to concatenate")
+    
+    fmt = None
+    chunks = []
+    for index, segment in enumerate(segments):
+        segment_fmt, frames = read_mulaw_wav(segment)
+        if fmt is None:
+            fmt = segment_fmt
+        elif segment_fmt != fmt:
+            raise ValueError(f"Segment {index} format {segment_fmt} does not match {fmt}")
+        chunks.append(frames)
+    
+    channels, sample_rate = fmt
+    silence = MULAW_SILENCE * ((sample_rate * gap_ms // 1000) * channels)
+    
+    return write_mulaw_wav(channels, sample_rate, silence.join(chunks))
+
+
+def resample_pcm16(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Linear-interpolation resampler (no anti-alias filter; meant for speech already near the target rate)"""
+    if from_rate == to_rate or not len(samples):
+        return samples
+    count = int(round(len(samples) * to_rate / from_rate))
+    positions = np.arange(count) * (from_rate / to_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype("<i2")
+
+
+def telephony_mulaw(audio_bytes: bytes, sample_rate: int = 8000) -> bytes:
+    """
+    Raw mono μ-law frames at the telephony rate for a PCM or μ-law WAV
+    (the payload format of Twilio Media Streams)
+    
+    Raises:
+        ValueError: If the input is neither 16-bit PCM nor μ-law WAV
+    """
+    try:
+        (channels, rate), frames = read_mulaw_wav(audio_bytes)
+        if channels == 1 and rate == sample_rate:
+            return frames
+        pcm = decode_mulaw(frames)
+    except ValueError:
+        (channels, sample_width, rate), pcm = read_wav(audio_bytes)
+        if sample_width != 2:
+            raise ValueError(f"Cannot μ-law encode {sample_width * 8}-bit PCM")
+    
+    samples = np.frombuffer(pcm, dtype="<i2")
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1).astype("<i2")
+    samples = resample_pcm16(samples, rate, sample_rate)
+    
+    return encode_mulaw(samples.tobytes())
+
+
+# Export
+__all__ = [
+    "read_wav",
+    "write_wav",
+    "concat_wav",
+    "encode_mulaw",
+    "decode_mulaw",
+    "read_mulaw_wav",
+    "write_mulaw_wav",
+    "pcm_wav_to_mulaw",
+    "concat_mulaw_wav",
+    "resample_pcm16",
+    "telephony_mulaw"
+]
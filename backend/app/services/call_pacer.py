@@ -0,0 +1,141 @@
+"""
+Call Pacer
+Token-bucket pacing of Twilio call creation per caller ID and per account
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`"""
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, now: float) -> float:
+        """Seconds until a whole token is available (0 if one is available now)"""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+    
+    def take(self):
+        self.tokens -= 1.0
+    
+    def drain(self, seconds: float):
+        """Push the bucket into debt so no token is available for `seconds`"""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 1.0) - seconds * self.rate
+
+
+class CallPacer:
+    """
+    Awaitable call-slot pacer
+    
+    A call may start only when both its caller ID bucket and the account-wide
+    bucket hold a token. Limits apply per API process; divide them across
+    workers when WEB_CONCURRENCY > 1.
+    """
+    
+    def __init__(self, per_number_rate: float, per_number_burst: float, global_rate: float, global_burst: float):
+        self.per_number_rate = per_number_rate
+        self.per_number_burst = per_number_burst
+        self._global = TokenBucket(global_rate, global_burst)
+        self._buckets: Dict[str, TokenBucket] = {}
+        
+        self.acquired = 0
+        self.waiting = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+    
+    async def acquire(self, from_number: str) -> float:
+        """
+        Wait for a call slot on a caller ID
+        
+        Args:
+            from_number: Caller ID the call will be placed from
+        
+        Returns:
+            Seconds spent waiting
+        """
+        bucket = self._bucket(from_number)
+        started = time.monotonic()
+        self.waiting += 1
+        
+        try:
+            while True:
+                now = time.monotonic()
+                wait = max(bucket.wait_time(now), self._global.wait_time(now))
+                if wait <= 0:
+                    # No await between the check and the take, so this is race-free
+                    bucket.take()
+                    self._global.take()
+                    break
+                await asyncio.sleep(wait)
+        finally:
+            self.waiting -= 1
+        
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        
+        return waited
+    
+    def throttle(self, from_number: Optional[str], seconds: float):
+        """Back off after Twilio rejects a call with 429 Too Many Requests"""
+        self.throttled += 1
+        self._global.drain(seconds)
+        if from_number:
+            self._bucket(from_number).drain(seconds)
+        logger.warning(f"⚠️ Twilio rate limited {from_number}; pausing dials for {seconds:.1f}s")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pacing metrics for monitoring"""
+        now = time.monotonic()
+        return {
+            "acquired": self.acquired,
+            "waiting": self.waiting,
+            "throttled": self.throttled,
+            "avg_wait_ms": round(self.total_wait_seconds / self.acquired * 1000, 1) if self.acquired else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+            "global": self._bucket_stats(self._global, now),
+            "numbers": {number: self._bucket_stats(bucket, now) for number, bucket in self._buckets.items()}
+        }
+    
+    def _bucket(self, from_number: str) -> TokenBucket:
+        bucket = self._buckets.get(from_number)
+        if bucket is None:
+            bucket = self._buckets[from_number] = TokenBucket(self.per_number_rate, self.per_number_burst)
+        return bucket
+    
+    @staticmethod
+    def _bucket_stats(bucket: TokenBucket, now: float) -> Dict[str, Any]:
+        bucket._refill(now)
+        return {"rate": bucket.rate, "burst": bucket.burst, "tokens": round(bucket.tokens, 3)}
+
+
+# Create singleton instance
+call_pacer = CallPacer(
+    per_number_rate=settings.TWILIO_CPS_PER_NUMBER,
+    per_number_burst=settings.TWILIO_CPS_BURST,
+    global_rate=settings.TWILIO_ACCOUNT_CPS,
+    global_burst=settings.TWILIO_ACCOUNT_CPS_BURST
+)
+
+
+# Export
+__all__ = ["call_pacer", "CallPacer", "TokenBucket"]
@@ -0,0 +1,743 @@
+"""
+Call Session Store
+Bounded, TTL-evicting storage for outbound call sessions
+"""
+
+import asyncio
+import bisect
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.session_backend import RecordUpdate, SessionBackend, session_backend
+
+
+# Twilio call statuses after which a call will receive no further updates
+TERMINAL_STATUSES = frozenset({"completed", "failed", "busy", "no-answer", "canceled"})
+
+# Our own outcomes: completed by the agent, or failed before Twilio accepted the call
+FINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+def _is_finished(status: Optional[str], twilio_status: Optional[str]) -> bool:
+    # A dial the provider rejected never gets a terminal twilio_status
+    return status in FINAL_STATUSES or twilio_status in TERMINAL_STATUSES
+
+
+def _current_status(status: str, twilio_status: Optional[str]) -> str:
+    # Our own outcome once decided, otherwise the latest Twilio status
+    if status in FINAL_STATUSES:
+        return status
+    return twilio_status or status
+
+
+def _record_indexes(record: Dict[str, Any]) -> Dict[str, float]:
+    """Backend index entries for a session record, scored by creation time"""
+    created_at = record["created_at"]
+    return {
+        "created": created_at,
+        f"status:{_current_status(record['status'], record.get('twilio_status'))}": created_at,
+        f"phone:{record['phone_number']}": created_at
+    }
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.utcfromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+
+@dataclass(slots=True)
+class CallSession:
+    """Compact outbound call record"""
+    call_id: str
+    phone_number: str
+    purpose: str
+    sector: str
+    language: str
+    customer_data: dict = field(default_factory=dict)
+    public_url: Optional[str] = None
+    status: str = "initiated"
+    outcome: Optional[str] = None
+    greeting: Optional[str] = None
+    audio_ref: Optional[str] = None
+    audio_size: int = 0
+    audio_failed: bool = False  # greeting synthesis ended without audio
+    twiml: Optional[str] = None
+    twilio_call_sid: Optional[str] = None
+    twilio_status: Optional[str] = None
+    from_number: Optional[str] = None
+    attempt: int = 1
+    retry_of: Optional[str] = None  # call_id of the chain's first attempt
+    campaign_id: Optional[str] = None  # campaign that placed the call, if any
+    call_mode: str = "playback"  # playback (<Play> greeting) or conversation (Media Streams)
+    messages: list = field(default_factory=list)
+    
+    # Wall-clock epoch seconds, for display only
+    created_at: float = field(default_factory=time.time)
+    last_status_update: Optional[float] = None
+    completed_at: Optional[float] = None
+    
+    # Monotonic seconds, for TTL bookkeeping
+    created_monotonic: float = field(default_factory=time.monotonic)
+    finished_monotonic: Optional[float] = None
+    
+    @property
+    def is_finished(self) -> bool:
+        return _is_finished(self.status, self.twilio_status)
+    
+    @property
+    def current_status(self) -> str:
+        """Our own outcome once decided, otherwise the latest Twilio status"""
+        return _current_status(self.status, self.twilio_status)
+    
+    def conversation_history(self, max_messages: int = 12) -> List[Dict[str, str]]:
+        """LLM chat history: the greeting as the opening assistant turn, then the latest messages"""
+        history = [{"role": "assistant", "content": self.greeting}] if self.greeting else []
+        history += [
+            {"role": message["role"], "content": message["content"]}
+            for message in self.messages[-max_messages:]
+        ]
+        return history
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """API representation with ISO timestamps"""
+        return {
+            "call_id": self.call_id,
+            "phone_number": self.phone_number,
+            "purpose": self.purpose,
+            "sector": self.sector,
+            "language": self.language,
+            "customer_data": self.customer_data,
+            "public_url": self.public_url,
+            "status": self.status,
+            "outcome": self.outcome,
+            "greeting": self.greeting,
+            "audio_ref": self.audio_ref,
+            "audio_size": self.audio_size,
+            "twilio_call_sid": self.twilio_call_sid,
+            "twilio_status": self.twilio_status,
+            "from_number": self.from_number,
+            "attempt": self.attempt,
+            "retry_of": self.retry_of,
+            "campaign_id": self.campaign_id,
+            "call_mode": self.call_mode,
+            "messages": self.messages,
+            "created_at": _iso(self.created_at),
+            "last_status_update": _iso(self.last_status_update),
+            "completed_at": _iso(self.completed_at)
+        }
+    
+    def project(self, names: Iterable[str]) -> Dict[str, Any]:
+        """API representation limited to the given fields (see PROJECTABLE_FIELDS)"""
+        projected = {}
+        for name in names:
+            if name == "status":
+                projected[name] = self.current_status
+            elif name in _TIMESTAMP_FIELDS:
+                projected[name] = _iso(getattr(self, name))
+            else:
+                projected[name] = getattr(self, name)
+        return projected
+    
+    def to_record(self) -> Dict[str, Any]:
+        """Process-independent record for shared session backends"""
+        return {name: getattr(self, name) for name in _RECORD_FIELDS}
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "CallSession":
+        """Rebuild a session, rebasing wall-clock ages onto this process's monotonic clock"""
+        session = cls(**{name: value for name, value in record.items() if name in _RECORD_FIELDS})
+        now_wall, now_mono = time.time(), time.monotonic()
+        
+        session.created_monotonic = now_mono - max(now_wall - session.created_at, 0.0)
+        if session.is_finished:
+            finished_at = session.completed_at or session.last_status_update or now_wall
+            session.finished_monotonic = now_mono - max(now_wall - finished_at, 0.0)
+        
+        return session
+
+
+_SESSION_FIELDS = frozenset(f.name for f in fields(CallSession))
+_RECORD_FIELDS = _SESSION_FIELDS - {"created_monotonic", "finished_monotonic"}
+
+_TIMESTAMP_FIELDS = frozenset({"created_at", "last_status_update", "completed_at"})
+
+# Fields listings may return; bulky or internal ones (twiml, messages, audio) are never listed
+SUMMARY_FIELDS = (
+    "call_id", "phone_number", "purpose", "sector", "language", "status", "twilio_status",
+    "twilio_call_sid", "from_number", "outcome", "attempt", "created_at", "last_status_update", "completed_at"
+)
+PROJECTABLE_FIELDS = frozenset(SUMMARY_FIELDS) | {
+    "greeting", "customer_data", "audio_size", "retry_of", "campaign_id", "call_mode"
+}
+
+# Fields whose changes must be reflected in each secondary index
+_STATUS_FIELDS = frozenset({"status", "twilio_status", "created_at"})
+_LOOKUP_FIELDS = frozenset({"twilio_call_sid", "phone_number", "created_at"})
+
+
+class CallSessionStore:
+    """
+    Call session store
+    
+    Finished calls expire after a TTL, abandoned active calls after a longer
+    one, and a hard entry cap plus a byte budget evict the oldest finished
+    (then oldest active) sessions first. Each session's deep size is
+    measured when it is stored and adjusted field by field on updates, so
+    the budget is checked against a running total rather than a sample.
+    
+    With a shared session backend (sqlite, redis) every write goes through
+    to the backend and reads refresh from it, so a Twilio callback may land
+    on any worker. The local entries then act as a bounded per-worker view.
+    Updates merge only the changed fields into the stored record, atomically,
+    so writers racing on one call (synthesis, dialing, status callbacks)
+    never drop each other's fields.
+    
+    Secondary indexes (Twilio SID, customer phone, current status) cover the
+    local entries and are maintained on every add, update and eviction. With
+    a shared backend the phone and status indexes are kept in the backend
+    too, in the same transaction as each write, and lookups by phone or
+    status read from there so they see every worker's calls. SIDs map to
+    calls through pointer records.
+    """
+    
+    NAMESPACE = "call"
+    SID_NAMESPACE = "call_sid"
+    
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        finished_ttl_seconds: float,
+        active_ttl_seconds: float,
+        sweep_interval_seconds: float,
+        backend: SessionBackend
+    ):
+        self.backend = backend
+        self.backend.register_indexer(self.NAMESPACE, _record_indexes)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.finished_ttl_seconds = finished_ttl_seconds
+        self.active_ttl_seconds = active_ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        
+        # call_id -> session, in creation order
+        self._sessions: "OrderedDict[str, CallSession]" = OrderedDict()
+        # call_id -> None, in the order calls finished
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        # call_id -> deep size in bytes, and their running total
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        
+        # Secondary indexes over local entries
+        self._by_sid: Dict[str, str] = {}
+        self._by_phone: Dict[str, Dict[str, float]] = {}
+        # (created_at, call_id), ascending, for keyset-paginated listings: all
+        # sessions, and the sessions in each current status
+        self._timeline: List[Tuple[float, str]] = []
+        self._by_status: Dict[str, List[Tuple[float, str]]] = {}
+        
+        self.evictions = 0
+        self.expirations = 0
+        self._sweeper: Optional[asyncio.Task] = None
+    
+    def __contains__(self, call_id: str) -> bool:
+        return call_id in self._sessions
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    async def add(self, session: CallSession) -> CallSession:
+        """Insert a new session, evicting if the store is full"""
+        self._unindex_call(session.call_id)
+        self._sessions[session.call_id] = session
+        self._index(session)
+        self._measure(session)
+        await self._persist(session)
+        self._enforce_cap()
+        return session
+    
+    async def get(self, call_id: str) -> Optional[CallSession]:
+        if self.backend.shared:
+            record = await self.backend.get(self.NAMESPACE, call_id)
+            if record is not None:
+                return self._cache(CallSession.from_record(record))
+        return self._sessions.get(call_id)
+    
+    async def update(
+        self,
+        call_id: str,
+        if_unset: Optional[Dict[str, Any]] = None,
+        **changes
+    ) -> Optional[CallSession]:
+        """
+        Apply field changes to a session
+        
+        Args:
+            call_id: Call ID
+            if_unset: Field values written only where the stored value is still
+                None, e.g. a status a callback may already have moved on
+            **changes: CallSession field values
+        
+        Returns:
+            Updated session, or None if it no longer exists
+        """
+        if_unset = if_unset or {}
+        _check_fields(changes)
+        _check_fields(if_unset)
+        if not self.backend.shared:
+            session = self._sessions.get(call_id)
+            if session is not None:
+                defaults = {name: value for name, value in if_unset.items() if getattr(session, name) is None}
+                self._apply(session, {**defaults, **changes})
+            return session
+        
+        record = await self.backend.modify(self.NAMESPACE, call_id, self._merge(changes, if_unset))
+        if record is None:
+            return None
+        
+        session = self._refresh(record)
+        if changes.get("twilio_call_sid"):
+            await self._persist_pointer(self.SID_NAMESPACE, session.twilio_call_sid, session)
+        return session
+    
+    async def get_many(self, call_ids: List[str]) -> Dict[str, CallSession]:
+        """Fetch several sessions with one backend read; unknown IDs are left out"""
+        sessions = {call_id: self._sessions[call_id] for call_id in call_ids if call_id in self._sessions}
+        if self.backend.shared:
+            records = await self.backend.get_many(self.NAMESPACE, list(dict.fromkeys(call_ids)))
+            for call_id, record in records.items():
+                sessions[call_id] = self._cache(CallSession.from_record(record))
+        return sessions
+    
+    async def update_many(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, CallSession]:
+        """
+        Apply field changes to several sessions in one backend transaction
+        
+        Args:
+            updates: call_id -> CallSession field values
+        
+        Returns:
+            call_id -> updated session, for the sessions that still exist
+        """
+        for changes in updates.values():
+            _check_fields(changes)
+        
+        if not self.backend.shared:
+            sessions = {call_id: self._sessions[call_id] for call_id in updates if call_id in self._sessions}
+            for call_id, session in sessions.items():
+                self._apply(session, updates[call_id])
+            return sessions
+        
+        records = await self.backend.modify_many(self.NAMESPACE, [
+            (call_id, self._merge(changes)) for call_id, changes in updates.items()
+        ])
+        sessions = {call_id: self._refresh(record) for call_id, record in records.items()}
+        for call_id, session in sessions.items():
+            if updates[call_id].get("twilio_call_sid"):
+                await self._persist_pointer(self.SID_NAMESPACE, session.twilio_call_sid, session)
+        return sessions
+    
+    def _merge(self, changes: Dict[str, Any], if_unset: Optional[Dict[str, Any]] = None) -> RecordUpdate:
+        """Backend record update that sets only the changed fields and refreshes the TTL"""
+        record_changes = {name: value for name, value in changes.items() if name in _RECORD_FIELDS}
+        
+        def apply(record: Dict[str, Any]) -> float:
+            for name, value in (if_unset or {}).items():
+                if record.get(name) is None:
+                    record[name] = value
+            record.update(record_changes)
+            finished = _is_finished(record.get("status"), record.get("twilio_status"))
+            return self.finished_ttl_seconds if finished else self.active_ttl_seconds
+        
+        return apply
+    
+    def _refresh(self, record: Dict[str, Any]) -> CallSession:
+        """Bring the local copy in line with a record just written to the backend"""
+        session = self._sessions.get(record["call_id"])
+        if session is None:
+            return self._cache(CallSession.from_record(record))
+        
+        # Also picks up fields other workers changed since this copy was loaded
+        self._apply(session, {
+            name: value for name, value in record.items()
+            if name in _RECORD_FIELDS and getattr(session, name) != value
+        })
+        return session
+    
+    def _apply(self, session: CallSession, changes: Dict[str, Any]):
+        """Set fields on a local session and keep the indexes in step"""
+        # Status callbacks only move the session between status sets
+        reindex_status = not _STATUS_FIELDS.isdisjoint(changes)
+        reindex_lookup = not _LOOKUP_FIELDS.isdisjoint(changes)
+        if reindex_status:
+            self._unindex_status(session)
+        if reindex_lookup:
+            self._unindex_lookup(session)
+        for name, value in changes.items():
+            self._set(session, name, value)
+        if reindex_lookup:
+            self._index_lookup(session)
+        if reindex_status:
+            self._index_status(session)
+        
+        if session.finished_monotonic is None and session.is_finished:
+            self._set(session, "finished_monotonic", time.monotonic())
+            self._finished[session.call_id] = None
+    
+    def _set(self, session: CallSession, name: str, value: Any):
+        """Set one field, keeping the session's measured size current"""
+        self._resize(session.call_id, _deep_sizeof(value) - _deep_sizeof(getattr(session, name)))
+        setattr(session, name, value)
+    
+    def remove(self, call_id: str) -> Optional[CallSession]:
+        """Drop the local entry (shared records expire via the backend TTL)"""
+        self._finished.pop(call_id, None)
+        self._unindex_call(call_id)
+        self._bytes -= self._sizes.pop(call_id, 0)
+        return self._sessions.pop(call_id, None)
+    
+    async def get_by_sid(self, twilio_call_sid: str) -> Optional[CallSession]:
+        """Look up a session by its Twilio call SID"""
+        call_id = self._by_sid.get(twilio_call_sid)
+        if call_id is None and self.backend.shared:
+            record = await self.backend.get(self.SID_NAMESPACE, twilio_call_sid)
+            call_id = record["call_id"] if record else None
+        return await self.get(call_id) if call_id else None
+    
+    async def latest_for_phone(self, phone_number: str) -> Optional[CallSession]:
+        """Most recent call to a customer number"""
+        sessions = await self.find_by_phone(phone_number, limit=1)
+        return sessions[0] if sessions else None
+    
+    async def find_by_phone(self, phone_number: str, limit: int = 20) -> List[CallSession]:
+        """Calls to a customer number, newest first"""
+        if self.backend.shared:
+            return await self._from_index(f"phone:{phone_number}", limit)
+        
+        call_ids = self._by_phone.get(phone_number, {})
+        newest = sorted(call_ids, key=call_ids.get, reverse=True)[:limit]
+        return [self._sessions[call_id] for call_id in newest]
+    
+    async def find_by_status(self, status: str, limit: int = 100) -> List[CallSession]:
+        """Calls whose current status matches, newest first"""
+        if self.backend.shared:
+            return await self._from_index(f"status:{status}", limit)
+        
+        keys = self._by_status.get(status, [])
+        return [self._sessions[call_id] for _, call_id in reversed(keys[-limit:])]
+    
+    async def status_counts(self) -> Dict[str, int]:
+        """Number of calls in each current status"""
+        if self.backend.shared:
+            counts = await self.backend.index_counts(self.NAMESPACE, "status:")
+            return {name[len("status:"):]: count for name, count in counts.items()}
+        return self._local_status_counts()
+    
+    async def _from_index(self, index: str, limit: int) -> List[CallSession]:
+        """Sessions listed in a backend index, newest first"""
+        entries = await self.backend.index_range(self.NAMESPACE, index, limit=limit)
+        sessions = await self._load_many([call_id for _, call_id in entries])
+        return [sessions[call_id] for _, call_id in entries if call_id in sessions]
+    
+    async def _load_many(self, call_ids: List[str]) -> Dict[str, CallSession]:
+        """Read sessions from the backend without caching them locally (listings)"""
+        records = await self.backend.get_many(self.NAMESPACE, call_ids)
+        return {call_id: CallSession.from_record(record) for call_id, record in records.items()}
+    
+    async def list_sessions(
+        self,
+        status: Optional[str] = None,
+        purpose: Optional[str] = None,
+        language: Optional[str] = None,
+        sector: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+        cursor: Optional[Tuple[float, str]] = None,
+        limit: int = 50
+    ) -> Tuple[List[CallSession], Optional[Tuple[float, str]]]:
+        """
+        Page through sessions, newest first
+        
+        Paging is keyset-based on (created_at, call_id): a page starts with a
+        binary search for the cursor, so deep pages cost the same as the first.
+        A status filter walks that status's index instead of the timeline.
+        With a shared backend, pages come from the backend's indexes, so
+        every worker returns the same pages; otherwise from local entries.
+        
+        Args:
+            status: Current status filter
+            purpose: Purpose filter
+            language: Language filter
+            sector: Sector filter
+            created_after: Only calls created at or after this epoch time
+            created_before: Only calls created before this epoch time
+            cursor: Key of the last session on the previous page
+            limit: Page size
+        
+        Returns:
+            (sessions, cursor for the next page or None)
+        """
+        upper_key = cursor
+        if created_before is not None and (upper_key is None or (created_before, "") < upper_key):
+            upper_key = (created_before, "")
+        
+        def matches(session: CallSession) -> bool:
+            return (
+                (purpose is None or session.purpose == purpose)
+                and (language is None or session.language == language)
+                and (sector is None or session.sector == sector)
+            )
+        
+        if self.backend.shared:
+            index = f"status:{status}" if status is not None else "created"
+            return await self._page_from_index(index, upper_key, created_after, matches, limit)
+        
+        keys = self._by_status.get(status, []) if status is not None else self._timeline
+        upper = len(keys)
+        if upper_key is not None:
+            upper = bisect.bisect_left(keys, upper_key)
+        
+        page: List[CallSession] = []
+        for index in range(upper - 1, -1, -1):
+            created_at, call_id = keys[index]
+            if created_after is not None and created_at < created_after:
+                break
+            
+            session = self._sessions[call_id]
+            if not matches(session):
+                continue
+            
+            if len(page) == limit:
+                last = page[-1]
+                return page, (last.created_at, last.call_id)
+            page.append(session)
+        
+        return page, None
+    
+    async def _page_from_index(
+        self,
+        index: str,
+        upper_key: Optional[Tuple[float, str]],
+        created_after: Optional[float],
+        matches: Callable[[CallSession], bool],
+        limit: int
+    ) -> Tuple[List[CallSession], Optional[Tuple[float, str]]]:
+        """One listing page read from a backend index, in batches until the filters fill it"""
+        page: List[CallSession] = []
+        below = upper_key
+        while True:
+            entries = await self.backend.index_range(
+                self.NAMESPACE, index, below=below, min_score=created_after, limit=limit + 1
+            )
+            sessions = await self._load_many([call_id for _, call_id in entries])
+            for _, call_id in entries:
+                session = sessions.get(call_id)
+                if session is None or not matches(session):
+                    continue
+                
+                if len(page) == limit:
+                    last = page[-1]
+                    return page, (last.created_at, last.call_id)
+                page.append(session)
+            
+            if len(entries) <= limit:
+                return page, None
+            below = entries[-1]
+    
+    def _local_status_counts(self) -> Dict[str, int]:
+        return {status: len(call_ids) for status, call_ids in self._by_status.items()}
+    
+    def sweep(self) -> int:
+        """Drop expired sessions; returns the number removed"""
+        now = time.monotonic()
+        removed = 0
+        
+        while self._finished:
+            call_id = next(iter(self._finished))
+            session = self._sessions.get(call_id)
+            if session is not None and now - session.finished_monotonic < self.finished_ttl_seconds:
+                break
+            self.remove(call_id)
+            removed += 1
+        
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.created_monotonic < self.active_ttl_seconds:
+                break
+            self.remove(session.call_id)
+            removed += 1
+        
+        self.expirations += removed
+        return removed
+    
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts and the resident size of the sessions"""
+        return {
+            "entries": len(self._sessions),
+            "finished": len(self._finished),
+            "active": len(self._sessions) - len(self._finished),
+            "max_entries": self.max_entries,
+            "estimated_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "finished_ttl_seconds": self.finished_ttl_seconds,
+            "active_ttl_seconds": self.active_ttl_seconds,
+            "indexed_sids": len(self._by_sid),
+            "indexed_phones": len(self._by_phone),
+            "by_status": self._local_status_counts()
+        }
+    
+    def start_sweeper(self):
+        """Start the periodic TTL sweep (called from the app lifespan)"""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+    
+    async def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+    
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            removed = self.sweep()
+            await self.backend.purge_expired()
+            if removed:
+                logger.info(f"🧹 Expired {removed} call sessions ({len(self._sessions)} remaining)")
+    
+    def _ttl(self, session: CallSession) -> float:
+        return self.finished_ttl_seconds if session.is_finished else self.active_ttl_seconds
+    
+    async def _persist(self, session: CallSession):
+        if self.backend.shared:
+            await self.backend.set(self.NAMESPACE, session.call_id, session.to_record(), ttl_seconds=self._ttl(session))
+    
+    async def _persist_pointer(self, namespace: str, key: str, session: CallSession):
+        """Share an index entry (SID or phone -> call_id) with other workers"""
+        if self.backend.shared:
+            # Outlive the session record so the pointer never dangles early
+            await self.backend.set(namespace, key, {"call_id": session.call_id}, ttl_seconds=self.active_ttl_seconds)
+    
+    def _cache(self, session: CallSession) -> CallSession:
+        """Replace the local copy with a fresher one loaded from the backend"""
+        self._unindex_call(session.call_id)
+        self._sessions[session.call_id] = session
+        self._index(session)
+        self._measure(session)
+        if session.finished_monotonic is not None and session.call_id not in self._finished:
+            self._finished[session.call_id] = None
+        self._enforce_cap()
+        return session
+    
+    def _index(self, session: CallSession):
+        self._index_lookup(session)
+        self._index_status(session)
+    
+    def _unindex(self, session: CallSession):
+        self._unindex_lookup(session)
+        self._unindex_status(session)
+    
+    def _index_lookup(self, session: CallSession):
+        """Timeline, SID and phone entries (keyed on fields that rarely change)"""
+        call_id = session.call_id
+        bisect.insort(self._timeline, (session.created_at, call_id))
+        if session.twilio_call_sid:
+            self._by_sid[session.twilio_call_sid] = call_id
+        self._by_phone.setdefault(session.phone_number, {})[call_id] = session.created_at
+    
+    def _unindex_lookup(self, session: CallSession):
+        call_id = session.call_id
+        _remove_key(self._timeline, (session.created_at, call_id))
+        
+        if session.twilio_call_sid and self._by_sid.get(session.twilio_call_sid) == call_id:
+            del self._by_sid[session.twilio_call_sid]
+        
+        call_ids = self._by_phone.get(session.phone_number)
+        if call_ids is not None:
+            call_ids.pop(call_id, None)
+            if not call_ids:
+                del self._by_phone[session.phone_number]
+    
+    def _index_status(self, session: CallSession):
+        bisect.insort(self._by_status.setdefault(session.current_status, []), (session.created_at, session.call_id))
+    
+    def _unindex_status(self, session: CallSession):
+        keys = self._by_status.get(session.current_status)
+        if keys is not None:
+            _remove_key(keys, (session.created_at, session.call_id))
+            if not keys:
+                del self._by_status[session.current_status]
+    
+    def _unindex_call(self, call_id: str):
+        session = self._sessions.get(call_id)
+        if session is not None:
+            self._unindex(session)
+    
+    def _measure(self, session: CallSession):
+        """Record the deep size of a session just stored"""
+        self._resize(session.call_id, _deep_sizeof(session) - self._sizes.get(session.call_id, 0))
+    
+    def _resize(self, call_id: str, delta: int):
+        self._sizes[call_id] = self._sizes.get(call_id, 0) + delta
+        self._bytes += delta
+    
+    def _enforce_cap(self):
+        while len(self._sessions) > self.max_entries or (self._sessions and self._bytes > self.max_bytes):
+            if self._finished:
+                call_id = next(iter(self._finished))
+            else:
+                call_id = next(iter(self._sessions))
+            self.remove(call_id)
+            self.evictions += 1
+
+
+def _remove_key(keys: List[Tuple[float, str]], key: Tuple[float, str]):
+    position = bisect.bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
+
+
+def _check_fields(changes: Dict[str, Any]):
+    for name in changes:
+        if name not in _SESSION_FIELDS:
+            raise AttributeError(f"CallSession has no field '{name}'")
+
+
+def _deep_sizeof(obj: Any) -> int:
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k) + _deep_sizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item) for item in obj)
+    elif isinstance(obj, CallSession):
+        size += sum(_deep_sizeof(getattr(obj, name)) for name in _SESSION_FIELDS)
+    return size
+
+
+# Create singleton instance
+call_session_store = CallSessionStore(
+    max_entries=settings.CALL_SESSION_MAX_ENTRIES,
+    max_bytes=settings.CALL_SESSION_MAX_BYTES,
+    finished_ttl_seconds=settings.CALL_SESSION_FINISHED_TTL_SECONDS,
+    active_ttl_seconds=settings.CALL_SESSION_ACTIVE_TTL_SECONDS,
+    sweep_interval_seconds=settings.CALL_SESSION_SWEEP_INTERVAL_SECONDS,
+    backend=session_backend
+)
+
+
+# Export
+__all__ = [
+    "call_session_store",
+    "CallSessionStore",
+    "CallSession",
+    "TERMINAL_STATUSES",
+    "SUMMARY_FIELDS",
+    "PROJECTABLE_FIELDS"
+]
@@ -0,0 +1,188 @@
+"""
+Call Status Ingestor
+Queue-backed, batched application of Twilio status callbacks
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import logger, audit_log
+from app.services.call_session_store import call_session_store, TERMINAL_STATUSES
+from app.services.number_pool import number_pool
+from app.services.event_hub import event_hub
+from app.services.retry_scheduler import retry_scheduler
+
+
+# Every CallStatus value Twilio sends to a status callback
+TWILIO_CALL_STATUSES = frozenset({
+    "queued", "initiated", "ringing", "in-progress",
+    "completed", "busy", "failed", "no-answer", "canceled"
+})
+
+
+@dataclass(slots=True)
+class CallStatusEvent:
+    """One Twilio status callback"""
+    call_id: str
+    call_sid: str
+    status: str
+    from_number: Optional[str] = None
+    to_number: Optional[str] = None
+    received_at: float = field(default_factory=time.time)
+
+
+class CallStatusIngestor:
+    """
+    Status callback ingestion
+    
+    The webhook only enqueues; one consumer applies events to call sessions
+    in arrival order, in batches of whatever has queued up, with one store
+    read and one store write per batch. Each call's resulting state goes to
+    the event hub and the batch gets one audit entry. When
+    the queue is full the webhook applies its event inline rather than
+    dropping it.
+    """
+    
+    def __init__(self, queue_size: int, batch_size: int):
+        self.batch_size = max(1, batch_size)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self._consumer: Optional[asyncio.Task] = None
+        
+        self.enqueued = 0
+        self.applied = 0
+        self.inline = 0
+        self.ignored = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.max_depth = 0
+    
+    async def submit(self, event: CallStatusEvent):
+        """Queue an event for the consumer, or apply it now if the queue is full"""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.inline += 1
+            await self.apply_batch([event])
+            return
+        
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+    
+    async def apply_batch(self, events: List[CallStatusEvent]):
+        """Apply status events to their call sessions and audit them as a group"""
+        sessions = await call_session_store.get_many([event.call_id for event in events])
+        
+        # Twilio status per call as of the events accepted so far in this batch
+        statuses = {call_id: session.twilio_status for call_id, session in sessions.items()}
+        changes: Dict[str, Dict[str, Any]] = {}
+        updates = []
+        for event in events:
+            session = sessions.get(event.call_id)
+            if session is None:
+                self.ignored += 1
+                continue
+            
+            # Duplicate, late or reordered callback; never move a finished call
+            # backwards, release its number twice or schedule a second retry
+            if statuses[event.call_id] in TERMINAL_STATUSES:
+                self.ignored += 1
+                continue
+            if event.status not in TERMINAL_STATUSES and session.is_finished:
+                self.ignored += 1
+                continue
+            
+            statuses[event.call_id] = event.status
+            changes[event.call_id] = {"twilio_status": event.status, "last_status_update": event.received_at}
+            if event.status in TERMINAL_STATUSES:
+                number_pool.release(event.call_id)
+            updates.append({
+                "call_id": event.call_id,
+                "twilio_sid": event.call_sid,
+                "status": event.status,
+                "to": event.to_number
+            })
+        
+        # One backend write for the batch; the hub only keeps a call's latest state anyway
+        for session in (await call_session_store.update_many(changes)).values():
+            event_hub.publish_call_status(session)
+            if session.twilio_status in TERMINAL_STATUSES and retry_scheduler.should_retry(session):
+                await retry_scheduler.schedule_for(session)
+        
+        self.applied += len(updates)
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(events))
+        
+        if updates:
+            audit_log(
+                event="call_status_batch",
+                metadata={"count": len(updates), "updates": updates}
+            )
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and throughput counters"""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "applied": self.applied,
+            "applied_inline": self.inline,
+            "ignored": self.ignored,
+            "batches": self.batches,
+            "avg_batch_size": round((self.applied + self.ignored) / self.batches, 1) if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+            "running": self._consumer is not None
+        }
+    
+    def start(self):
+        """Start the consumer (called from the app lifespan)"""
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+    
+    async def stop(self, timeout: float = 10.0):
+        """Drain queued events, then stop the consumer"""
+        if self._consumer is None:
+            return
+        
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Shutdown with {self._queue.qsize()} call status events unapplied")
+        
+        self._consumer.cancel()
+        await asyncio.gather(self._consumer, return_exceptions=True)
+        self._consumer = None
+    
+    async def _consume(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                await self.apply_batch(batch)
+            except Exception as e:
+                logger.error(f"❌ Failed to apply {len(batch)} call status events: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            
+            # Let webhook handlers run between batches
+            await asyncio.sleep(0)
+
+
+# Create singleton instance
+call_status_ingestor = CallStatusIngestor(
+    queue_size=settings.STATUS_CALLBACK_QUEUE_SIZE,
+    batch_size=settings.STATUS_CALLBACK_BATCH_SIZE
+)
+
+
+# Export
+__all__ = ["call_status_ingestor", "CallStatusIngestor", "CallStatusEvent", "TWILIO_CALL_STATUSES"]
@@ -0,0 +1,316 @@
+"""
+Campaign Dialing Service
+Bounded-concurrency staged pipeline for bulk outbound calls
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger, audit_log
+from app.core.session_backend import InMemorySessionBackend, SessionBackend, session_backend
+from app.services.event_hub import event_hub
+
+
+StageHandler = Callable[[Any], Awaitable[Any]]
+
+
+class PipelineStage:
+    """One pipeline stage: a bounded input queue drained by a fixed worker pool"""
+    
+    def __init__(self, name: str, handler: StageHandler, workers: int, queue_size: int):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        
+        self.processed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.busy_seconds = 0.0
+        self.first_started_at: Optional[float] = None
+        self.last_finished_at: Optional[float] = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage throughput snapshot"""
+        elapsed = 0.0
+        if self.first_started_at is not None:
+            end = self.last_finished_at if not self.in_flight and self.queue.empty() else time.monotonic()
+            elapsed = max((end or time.monotonic()) - self.first_started_at, 0.0)
+        done = self.processed + self.failed
+        
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "throughput_per_sec": round(self.processed / elapsed, 3) if elapsed > 0 else 0.0,
+            "avg_latency_ms": round(self.busy_seconds / done * 1000, 1) if done else 0.0
+        }
+
+
+class Campaign:
+    """A bulk dialing run flowing through the staged pipeline"""
+    
+    def __init__(self, campaign_id: str, total: int, metadata: Dict[str, Any]):
+        self.campaign_id = campaign_id
+        self.total = total
+        self.metadata = metadata
+        self.status = "queued"
+        self.created_at = datetime.utcnow().isoformat()
+        self.completed_at: Optional[str] = None
+        self.started_monotonic = time.monotonic()
+        self.finished_monotonic: Optional[float] = None
+        self.stages: List[PipelineStage] = []
+        self.completed = 0
+        self.errors: List[Dict[str, str]] = []
+        self.task: Optional[asyncio.Task] = None
+        self.last_published = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable campaign progress"""
+        failed = sum(stage.failed for stage in self.stages)
+        return {
+            "campaign_id": self.campaign_id,
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": failed,
+            "pending": max(self.total - self.completed - failed, 0),
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "elapsed_seconds": round((self.finished_monotonic or time.monotonic()) - self.started_monotonic, 3),
+            "metadata": self.metadata,
+            "stages": {stage.name: stage.stats() for stage in self.stages},
+            "recent_errors": self.errors[-20:]
+        }
+
+
+class CampaignService:
+    """
+    Runs campaigns as asyncio pipelines of bounded queues and worker pools
+    
+    Finished campaigns are kept for status lookups for retention_seconds,
+    and at most max_finished of them; running campaigns are never dropped.
+    
+    A campaign runs on the worker that started it. With a shared session
+    backend its progress is also saved there on every progress update, so
+    a status lookup landing on any other worker sees it too.
+    """
+    
+    NAMESPACE = "campaign"
+    MAX_RECORDED_ERRORS = 100
+    PROGRESS_INTERVAL_SECONDS = 0.5
+    
+    def __init__(
+        self,
+        retention_seconds: float = 86400,
+        max_finished: int = 1000,
+        backend: Optional[SessionBackend] = None
+    ):
+        self.queue_size = settings.CAMPAIGN_QUEUE_SIZE
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self.backend = backend or InMemorySessionBackend()
+        self.campaigns: Dict[str, Campaign] = {}
+        self.evicted = 0
+    
+    def start_campaign(
+        self,
+        items: List[Any],
+        stages: List[Tuple[str, StageHandler, int]],
+        metadata: Optional[Dict[str, Any]] = None,
+        campaign_id: Optional[str] = None
+    ) -> Campaign:
+        """
+        Start a campaign in the background
+        
+        Args:
+            items: Work items fed into the first stage
+            stages: Ordered (name, handler, worker_count) tuples; each handler
+                receives the previous stage's return value
+            metadata: Extra fields reported with the campaign
+            campaign_id: Id to run under, when stages need it up front
+                (default: a new UUID)
+        
+        Returns:
+            The running campaign
+        """
+        self._evict()
+        campaign = Campaign(campaign_id or str(uuid.uuid4()), len(items), metadata or {})
+        campaign.stages = [
+            PipelineStage(name, handler, workers, self.queue_size)
+            for name, handler, workers in stages
+        ]
+        campaign.task = asyncio.create_task(self._run(campaign, items))
+        self.campaigns[campaign.campaign_id] = campaign
+        
+        audit_log(
+            event="campaign_started",
+            metadata={"campaign_id": campaign.campaign_id, "total": campaign.total, **campaign.metadata}
+        )
+        logger.info(f"🚀 Campaign {campaign.campaign_id} started with {campaign.total} items")
+        
+        return campaign
+    
+    def get_campaign(self, campaign_id: str) -> Optional[Campaign]:
+        """Look up a campaign running (or kept) on this worker"""
+        self._evict()
+        return self.campaigns.get(campaign_id)
+    
+    async def get_progress(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Campaign progress, wherever the campaign runs
+        
+        Returns:
+            Live progress for this worker's campaigns, the last saved
+            progress for other workers' campaigns, or None if unknown
+        """
+        campaign = self.get_campaign(campaign_id)
+        if campaign is not None:
+            return campaign.to_dict()
+        if self.backend.shared:
+            return await self.backend.get(self.NAMESPACE, campaign_id)
+        return None
+    
+    async def shutdown(self):
+        """Cancel campaigns that are still running"""
+        running = [c.task for c in self.campaigns.values() if c.task and not c.task.done()]
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+            logger.info(f"🛑 Cancelled {len(running)} running campaign(s)")
+    
+    def _evict(self):
+        """Drop finished campaigns past the retention window or over the cap"""
+        finished = sorted(
+            (c for c in self.campaigns.values() if c.finished_monotonic is not None),
+            key=lambda c: c.finished_monotonic
+        )
+        cutoff = time.monotonic() - self.retention_seconds
+        excess = len(finished) - self.max_finished
+        for index, campaign in enumerate(finished):
+            if index >= excess and campaign.finished_monotonic > cutoff:
+                break
+            del self.campaigns[campaign.campaign_id]
+            self.evicted += 1
+    
+    async def _run(self, campaign: Campaign, items: List[Any]):
+        """Feed items through the stages and wait for the pipeline to drain"""
+        campaign.status = "running"
+        await self._publish_progress(campaign, force=True)
+        workers = []
+        
+        for index, stage in enumerate(campaign.stages):
+            next_stage = campaign.stages[index + 1] if index + 1 < len(campaign.stages) else None
+            workers.extend(
+                asyncio.create_task(self._worker(campaign, stage, next_stage))
+                for _ in range(stage.workers)
+            )
+        
+        try:
+            # put() blocks while the first queue is full, so the feeder is backpressured
+            first = campaign.stages[0]
+            for item in items:
+                await first.queue.put(item)
+            
+            # Stages drain front to back; a stage only receives work from the one before it
+            for stage in campaign.stages:
+                await stage.queue.join()
+            
+            campaign.status = "completed"
+        except asyncio.CancelledError:
+            campaign.status = "cancelled"
+            raise
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            campaign.completed_at = datetime.utcnow().isoformat()
+            campaign.finished_monotonic = time.monotonic()
+            
+            audit_log(event=f"campaign_{campaign.status}", metadata=campaign.to_dict())
+            await self._publish_progress(campaign, force=True)
+            logger.info(
+                f"🏁 Campaign {campaign.campaign_id} {campaign.status}: "
+                f"{campaign.completed}/{campaign.total} dialed"
+            )
+    
+    async def _worker(self, campaign: Campaign, stage: PipelineStage, next_stage: Optional[PipelineStage]):
+        """Pull items from a stage queue, run the handler and pass results on"""
+        while True:
+            item = await stage.queue.get()
+            stage.in_flight += 1
+            started = time.monotonic()
+            handled_at: Optional[float] = None
+            if stage.first_started_at is None:
+                stage.first_started_at = started
+            
+            try:
+                result = await stage.handler(item)
+                handled_at = time.monotonic()
+                stage.processed += 1
+                
+                if next_stage is not None:
+                    await next_stage.queue.put(result)
+                else:
+                    campaign.completed += 1
+            
+            except asyncio.CancelledError:
+                # Only cancelling this worker (campaign shutdown) stops it; a handler
+                # that raised CancelledError on its own just failed this item
+                if asyncio.current_task().cancelling():
+                    raise
+                self._record_failure(campaign, stage, "cancelled")
+            except Exception as e:
+                self._record_failure(campaign, stage, str(e))
+            
+            finally:
+                # Time blocked on a full next queue is the next stage's backlog, not this stage's work
+                handled_at = handled_at or time.monotonic()
+                stage.in_flight -= 1
+                stage.busy_seconds += handled_at - started
+                stage.last_finished_at = handled_at
+                stage.queue.task_done()
+                await self._publish_progress(campaign)
+    
+    def _record_failure(self, campaign: Campaign, stage: PipelineStage, error: str):
+        stage.failed += 1
+        logger.error(f"❌ Campaign {campaign.campaign_id} stage '{stage.name}' failed: {error}")
+        if len(campaign.errors) >= self.MAX_RECORDED_ERRORS:
+            campaign.errors.pop(0)
+        campaign.errors.append({"stage": stage.name, "error": error})
+    
+    async def _publish_progress(self, campaign: Campaign, force: bool = False):
+        """Push campaign progress to live subscribers and the shared backend, at most every PROGRESS_INTERVAL_SECONDS"""
+        now = time.monotonic()
+        if not force and now - campaign.last_published < self.PROGRESS_INTERVAL_SECONDS:
+            return
+        
+        campaign.last_published = now
+        progress = campaign.to_dict()
+        event_hub.publish({"type": "campaign_progress", **progress})
+        
+        if self.backend.shared:
+            try:
+                await self.backend.set(self.NAMESPACE, campaign.campaign_id, progress, ttl_seconds=self.retention_seconds)
+            except Exception as e:
+                logger.error(f"❌ Failed to save campaign {campaign.campaign_id} progress: {str(e)}")
+
+
+# Create singleton instance
+campaign_service = CampaignService(
+    retention_seconds=settings.CAMPAIGN_RETENTION_SECONDS,
+    max_finished=settings.CAMPAIGN_MAX_FINISHED,
+    backend=session_backend
+)
+
+
+# Export
+__all__ = ["campaign_service", "CampaignService", "Campaign", "PipelineStage"]
@@ -0,0 +1,258 @@
+"""
+Event Hub
+Broadcast of live call and campaign progress to subscribers, relayed across workers over Redis
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.session_backend import session_backend, RedisSessionBackend
+from app.services.call_session_store import CallSession
+
+
+class Subscriber:
+    """
+    One live connection (SSE stream or WebSocket)
+    
+    Pending events are keyed by subject (call or campaign), so a slow
+    reader only ever holds the latest state per subject and memory stays
+    bounded by the number of subjects it follows.
+    """
+    
+    def __init__(self, call_ids: Optional[Set[str]] = None, campaign_ids: Optional[Set[str]] = None):
+        self.call_ids = call_ids or None
+        self.campaign_ids = campaign_ids or None
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+        self.delivered = 0
+        self.coalesced = 0
+    
+    def wants(self, event: Dict[str, Any]) -> bool:
+        if event.get("call_id") is not None:
+            if self.call_ids is None and self.campaign_ids is None:
+                return True
+            # A call is followed by its id or through the campaign that placed it
+            return (self.call_ids is not None and event["call_id"] in self.call_ids) or (
+                self.campaign_ids is not None and event.get("campaign_id") in self.campaign_ids
+            )
+        if event.get("campaign_id") is not None:
+            return self.campaign_ids is None or event["campaign_id"] in self.campaign_ids
+        return True
+    
+    def offer(self, subject: str, event: Dict[str, Any]):
+        if subject in self._pending:
+            self.coalesced += 1
+        self._pending[subject] = event
+        self._ready.set()
+    
+    async def next_batch(self, coalesce_seconds: float, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Wait for events, then gather for a short window so bursts coalesce
+        
+        Returns:
+            Latest event per subject, or [] on timeout (send a keepalive)
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+        
+        if coalesce_seconds > 0:
+            await asyncio.sleep(coalesce_seconds)
+        
+        batch = list(self._pending.values())
+        self._pending = {}
+        self._ready.clear()
+        self.delivered += len(batch)
+        return batch
+
+
+class EventHub:
+    """
+    Fan-out of progress events to every matching subscriber
+    
+    A status callback or campaign can be handled by any worker, so with a
+    Redis client every event is also published on a pub/sub channel and
+    events from other workers are delivered to this worker's subscribers.
+    Without one, events never leave the process: subscriptions are refused
+    when more than one worker is configured, since they would silently
+    miss most updates.
+    """
+    
+    def __init__(
+        self,
+        max_subscribers: int,
+        coalesce_ms: int,
+        keepalive_seconds: float,
+        redis: Any = None,
+        channel: str = "bfsi:events",
+        workers: int = 1,
+        outbox_size: int = 10000
+    ):
+        self.max_subscribers = max_subscribers
+        self.coalesce_seconds = coalesce_ms / 1000
+        self.keepalive_seconds = keepalive_seconds
+        self.channel = channel
+        self.workers = workers
+        self._redis = redis
+        self._origin = uuid.uuid4().hex
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=outbox_size)
+        self._relay: List[asyncio.Task] = []
+        self._subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.relayed = 0
+        self.dropped = 0
+    
+    @property
+    def distributed(self) -> bool:
+        return self._redis is not None
+    
+    def subscribe(
+        self,
+        call_ids: Optional[Iterable[str]] = None,
+        campaign_ids: Optional[Iterable[str]] = None
+    ) -> Subscriber:
+        """
+        Register a subscriber
+        
+        Args:
+            call_ids: Only these calls (default: all)
+            campaign_ids: Only these campaigns and the calls they place
+                (default: all)
+        
+        Raises:
+            RuntimeError: If the subscriber limit is reached, or events
+                cannot reach this worker from the others
+        """
+        if self.workers > 1 and not self.distributed:
+            raise RuntimeError("Live events with more than one worker require SESSION_BACKEND=redis")
+        if len(self._subscribers) >= self.max_subscribers:
+            raise RuntimeError("Too many event subscribers")
+        
+        subscriber = Subscriber(
+            call_ids=set(call_ids) if call_ids else None,
+            campaign_ids=set(campaign_ids) if campaign_ids else None
+        )
+        self._subscribers.add(subscriber)
+        logger.info(f"📡 Event subscriber connected ({len(self._subscribers)} active)")
+        return subscriber
+    
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+        logger.info(f"📡 Event subscriber disconnected ({len(self._subscribers)} active)")
+    
+    def publish(self, event: Dict[str, Any]):
+        """
+        Broadcast an event
+        
+        Args:
+            event: JSON-serializable dict with a "type" and a "call_id" or
+                "campaign_id"; newer events replace undelivered ones for the
+                same subject
+        """
+        self.published += 1
+        event.setdefault("at", time.time())
+        if self._relay:
+            try:
+                self._outbox.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped += 1
+        self._deliver(event)
+    
+    def _deliver(self, event: Dict[str, Any]):
+        if not self._subscribers:
+            return
+        
+        if event.get("call_id") is not None:
+            subject = f"call:{event['call_id']}"
+        else:
+            subject = f"campaign:{event.get('campaign_id')}"
+        
+        for subscriber in self._subscribers:
+            if subscriber.wants(event):
+                subscriber.offer(subject, event)
+    
+    def publish_call_status(self, session: CallSession):
+        """Broadcast a call session's current status"""
+        self.publish({
+            "type": "call_status",
+            "call_id": session.call_id,
+            "campaign_id": session.campaign_id,
+            "status": session.current_status,
+            "twilio_status": session.twilio_status,
+            "twilio_call_sid": session.twilio_call_sid,
+            "outcome": session.outcome
+        })
+    
+    def start(self):
+        """Start relaying events through Redis (called from the app lifespan)"""
+        if self.distributed and not self._relay:
+            self._relay = [asyncio.create_task(self._send()), asyncio.create_task(self._receive())]
+    
+    async def stop(self):
+        for task in self._relay:
+            task.cancel()
+        await asyncio.gather(*self._relay, return_exceptions=True)
+        self._relay = []
+    
+    async def _send(self):
+        while True:
+            event = await self._outbox.get()
+            try:
+                await self._redis.publish(self.channel, json.dumps({"origin": self._origin, "event": event}, ensure_ascii=False))
+            except Exception as e:
+                self.dropped += 1
+                logger.error(f"❌ Failed to relay event to other workers: {str(e)}")
+    
+    async def _receive(self):
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    # This worker already delivered its own events
+                    if payload["origin"] != self._origin:
+                        self.relayed += 1
+                        self._deliver(payload["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Event relay subscription lost, reconnecting: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "distributed": self.distributed,
+            "workers": self.workers,
+            "published": self.published,
+            "relayed": self.relayed,
+            "dropped": self.dropped,
+            "delivered": sum(subscriber.delivered for subscriber in self._subscribers),
+            "coalesced": sum(subscriber.coalesced for subscriber in self._subscribers)
+        }
+
+
+# Create singleton instance
+event_hub = EventHub(
+    max_subscribers=settings.EVENT_HUB_MAX_SUBSCRIBERS,
+    coalesce_ms=settings.EVENT_HUB_COALESCE_MS,
+    keepalive_seconds=settings.EVENT_HUB_KEEPALIVE_SECONDS,
+    redis=session_backend.client if isinstance(session_backend, RedisSessionBackend) else None,
+    workers=settings.WEB_CONCURRENCY
+)
+
+
+# Export
+__all__ = ["event_hub", "EventHub", "Subscriber"]
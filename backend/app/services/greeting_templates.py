@@ -0,0 +1,307 @@
+"""
+Greeting Templates
+Outbound call greetings loaded once from app/templates/greetings and compiled per (purpose, language)
+"""
+
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from string import Formatter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings, get_supported_languages
+from app.core.logging import logger
+from app.core.security import get_call_recording_disclosure
+
+
+# (text, is_static) TTS segments, as consumed by the call audio pipeline
+Segments = List[Tuple[str, bool]]
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "greetings"
+
+DEFAULT_PURPOSE = "default"
+
+# Punctuation that stays attached to the slot it follows
+_SLOT_TRAILING_PUNCTUATION = ".,;:!?।"
+
+# Currency markers customers' systems put around amounts ("Rs. 5,000", "INR 5000", "₹5,000")
+_AMOUNT_NOISE = re.compile(r"(?i)rs\.?|inr|₹|ரூ\.?|[,\s]")
+
+_MAX_NAME_LENGTH = 40
+
+
+class TextSlot:
+    """Free-text slot: the customer value as given, else the template default"""
+    
+    def __init__(self, spec: Dict[str, Any]):
+        self.default = str(spec.get("default", ""))
+        self.format = spec.get("format", "{}")
+    
+    def render(self, value: Any) -> str:
+        if value is None:
+            return self.default
+        text = self.clean(value)
+        return self.format.format(text) if text else self.default
+    
+    def clean(self, value: Any) -> str:
+        return " ".join(str(value).split())
+
+
+class NameSlot(TextSlot):
+    """Customer name, stripped of template/markup characters and length-capped"""
+    
+    def clean(self, value: Any) -> str:
+        text = re.sub(r"[{}<>\[\]\"]", "", str(value))
+        return " ".join(text.split())[:_MAX_NAME_LENGTH].strip()
+
+
+class AmountSlot(TextSlot):
+    """Rupee amount with Indian digit grouping (1,23,456); unparseable values are spoken as given"""
+    
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec)
+        self.currency = spec.get("currency", "₹")
+    
+    def clean(self, value: Any) -> str:
+        try:
+            amount = Decimal(_AMOUNT_NOISE.sub("", str(value)))
+        except InvalidOperation:
+            return super().clean(value)
+        if not amount.is_finite():
+            return super().clean(value)
+        return f"{self.currency}{format_indian_number(amount)}"
+
+
+class DateSlot(TextSlot):
+    """Due date (ISO, DD/MM/YYYY or DD-MM-YYYY) spoken with localized month names"""
+    
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec)
+        self.format = "{}"
+        self.date_format = spec["format"]
+        self.months = spec["months"]
+        if len(self.months) != 12:
+            raise ValueError("date slot needs 12 month names")
+    
+    def clean(self, value: Any) -> str:
+        parsed = _parse_date(value)
+        if parsed is None:
+            return super().clean(value)
+        return self.date_format.format(
+            day=parsed.day,
+            day_ordinal=_ordinal(parsed.day),
+            month=self.months[parsed.month - 1],
+            year=parsed.year
+        )
+
+
+_SLOT_TYPES = {
+    "text": TextSlot,
+    "name": NameSlot,
+    "amount": AmountSlot,
+    "date": DateSlot
+}
+
+
+def format_indian_number(amount: Decimal) -> str:
+    """Group digits the Indian way: 1234567.5 -> 12,34,567.50"""
+    sign = "-" if amount < 0 else ""
+    amount = abs(amount)
+    if amount == amount.to_integral_value():
+        whole, fraction = str(int(amount)), ""
+    else:
+        whole, fraction = f"{amount:.2f}".split(".")
+        fraction = "." + fraction
+    
+    head, tail = whole[:-3], whole[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    if head:
+        groups.insert(0, head)
+    
+    return sign + ",".join(groups + [tail]) + fraction
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    
+    text = str(value).strip()
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    
+    match = re.fullmatch(r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})", text)
+    if match:
+        day, month, year = (int(part) for part in match.groups())
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+    return None
+
+
+def _ordinal(day: int) -> str:
+    if 10 <= day % 100 <= 20:
+        return f"{day}th"
+    suffix = {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    return f"{day}{suffix}"
+
+
+def _append_static(segments: Segments, literal: str):
+    """Add template text, attaching leading punctuation to the previous segment"""
+    text = literal.strip()
+    
+    leading = len(text) - len(text.lstrip(_SLOT_TRAILING_PUNCTUATION))
+    if leading and segments:
+        previous, is_static = segments[-1]
+        segments[-1] = (previous + text[:leading], is_static)
+        text = text[leading:].strip()
+    
+    if not text:
+        return
+    
+    # An empty slot leaves two literals side by side; speak them as one segment
+    if segments and segments[-1][1]:
+        segments[-1] = (f"{segments[-1][0]} {text}", True)
+    else:
+        segments.append((text, True))
+
+
+class CompiledGreeting:
+    """A parsed greeting template: literal/slot parts plus the language's slot formatters"""
+    
+    def __init__(self, purpose: str, language: str, template: str, slots: Dict[str, TextSlot], disclosure: str):
+        self.purpose = purpose
+        self.language = language
+        self.disclosure = disclosure
+        self.parts: List[Tuple[str, Optional[str]]] = []
+        
+        for literal, field_name, _, _ in Formatter().parse(template):
+            if field_name is not None and field_name not in slots:
+                raise ValueError(f"{language}/{purpose}: unknown slot {{{field_name}}}")
+            self.parts.append((literal, field_name))
+        
+        self.slots = {name: slots[name] for _, name in self.parts if name is not None}
+    
+    def render(self, customer_data: Optional[Dict[str, Any]] = None) -> Tuple[str, Segments]:
+        """
+        Fill the slots from customer_data
+        
+        Returns:
+            (full_text, segments): literal text becomes static segments and
+            slots variable ones; the recording disclosure is the last segment
+        """
+        customer_data = customer_data or {}
+        values = {name: slot.render(customer_data.get(name)) for name, slot in self.slots.items()}
+        
+        text_parts = []
+        segments: Segments = []
+        for literal, field_name in self.parts:
+            text_parts.append(literal)
+            _append_static(segments, literal)
+            
+            if field_name is not None:
+                value = values[field_name]
+                text_parts.append(value)
+                if value.strip():
+                    segments.append((value.strip(), False))
+        
+        segments.append((self.disclosure, True))
+        
+        return f"{''.join(text_parts).strip()} {self.disclosure}", segments
+
+
+class GreetingTemplateRegistry:
+    """
+    Compiled greetings keyed by (purpose, language)
+    
+    Fallback policy: an unknown purpose uses the language's "default"
+    greeting; a language without a template file uses the fallback
+    language (English), matching the language of the spoken disclosure.
+    """
+    
+    def __init__(self, templates: Dict[Tuple[str, str], CompiledGreeting], fallback_language: str):
+        if (DEFAULT_PURPOSE, fallback_language) not in templates:
+            raise ValueError(f"No '{DEFAULT_PURPOSE}' greeting for fallback language '{fallback_language}'")
+        
+        self._templates = templates
+        self.fallback_language = fallback_language
+        self.languages = sorted({language for _, language in templates})
+        self.purposes = sorted({purpose for purpose, _ in templates})
+    
+    @classmethod
+    def load(cls, directory: Path = TEMPLATES_DIR, fallback_language: str = "en") -> "GreetingTemplateRegistry":
+        """Read and compile every <language>.json under directory"""
+        templates: Dict[Tuple[str, str], CompiledGreeting] = {}
+        
+        for path in sorted(directory.glob("*.json")):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            
+            language = data.get("language", path.stem)
+            slots = {
+                name: _SLOT_TYPES[spec.get("type", "text")](spec)
+                for name, spec in data.get("slots", {}).items()
+            }
+            disclosure = get_call_recording_disclosure(language)
+            
+            greetings = data["greetings"]
+            if DEFAULT_PURPOSE not in greetings:
+                raise ValueError(f"{path.name}: missing '{DEFAULT_PURPOSE}' greeting")
+            
+            for purpose, template in greetings.items():
+                templates[(purpose, language)] = CompiledGreeting(purpose, language, template, slots, disclosure)
+        
+        registry = cls(templates, fallback_language)
+        
+        missing = [language for language in get_supported_languages() if language not in registry.languages]
+        if missing:
+            logger.warning(f"No greeting templates for {missing}; falling back to '{fallback_language}'")
+        
+        logger.info(
+            f"Loaded {len(templates)} greeting templates "
+            f"({len(registry.languages)} languages, {len(registry.purposes)} purposes)"
+        )
+        return registry
+    
+    def resolve(self, purpose: str, language: str) -> CompiledGreeting:
+        """Template for (purpose, language) after applying the fallback policy"""
+        if (DEFAULT_PURPOSE, language) not in self._templates:
+            language = self.fallback_language
+        return self._templates.get((purpose, language)) or self._templates[(DEFAULT_PURPOSE, language)]
+    
+    def render(self, purpose: str, language: str, customer_data: Optional[Dict[str, Any]] = None) -> Tuple[str, Segments]:
+        """Render one greeting as (full_text, segments)"""
+        return self.resolve(purpose, language).render(customer_data)
+    
+    def render_batch(
+        self,
+        purpose: str,
+        language: str,
+        customer_data_list: Iterable[Optional[Dict[str, Any]]]
+    ) -> List[Tuple[str, Segments]]:
+        """Render many greetings sharing one (purpose, language), resolving the template once"""
+        compiled = self.resolve(purpose, language)
+        return [compiled.render(customer_data) for customer_data in customer_data_list]
+
+
+# Create global registry instance (templates are read once, at import)
+greeting_templates = GreetingTemplateRegistry.load(fallback_language=settings.DEFAULT_LANGUAGE)
+
+
+# Export
+__all__ = [
+    "greeting_templates",
+    "GreetingTemplateRegistry",
+    "CompiledGreeting",
+    "format_indian_number",
+    "Segments"
+]
@@ -3,20 +3,77 @@ Groq LLM Service
 Open-source LLM integration for BFSI AI
 """
 
-from groq import Groq
-from typing import Optional, Dict, Any, List
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from groq import AsyncGroq
+from typing import Optional, Dict, Any, List, AsyncIterator
 from app.core.config import settings
 from app.core.logging import logger
+from app.services.latency_stats import LatencyStats
+from app.services.llm_cache import llm_cache
+
+
+# Part of the LLM response cache key; bump when the BFSI prompts change
+BFSI_PROMPT_VERSION = "1"
 
 
 class GroqService:
-    """Groq LLM service for natural language understanding"""
+    """
+    Groq LLM service for natural language understanding
+    
+    Requests go through the async client, so waiting on Groq never blocks
+    the event loop (Twilio webhooks keep being answered). At most
+    GROQ_MAX_IN_FLIGHT requests or streams run at once; the rest queue, and
+    the time spent queued is tracked in `queue_wait`.
+    """
     
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        self.client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            base_url=settings.GROQ_API_URL,
+            timeout=settings.GROQ_HTTP_TIMEOUT
+        )
         self.model = settings.GROQ_MODEL
         self.temperature = settings.GROQ_TEMPERATURE
         self.max_tokens = settings.GROQ_MAX_TOKENS
+        
+        self.max_in_flight = settings.GROQ_MAX_IN_FLIGHT
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.queue_wait = LatencyStats(("queue_wait_ms",))
+        
+        self.stream_latency = LatencyStats(("ttft_ms", "total_ms"))
+        self.streams = {"completed": 0, "cancelled": 0, "failed": 0}
+    
+    async def aclose(self):
+        """Close the HTTP connection pool (application shutdown)"""
+        await self.client.close()
+    
+    @asynccontextmanager
+    async def _slot(self):
+        """Hold one of the GROQ_MAX_IN_FLIGHT request slots"""
+        queued = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        
+        waited_ms = round((time.monotonic() - queued) * 1000)
+        self.queue_wait.record({"queue_wait_ms": waited_ms})
+        if waited_ms >= 1000:
+            logger.warning(f"⚠️ Groq request queued {waited_ms}ms ({self.in_flight}/{self.max_in_flight} in flight)")
+        
+        self.in_flight += 1
+        self.requests += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
     
     async def generate_response(
         self,
@@ -38,13 +95,14 @@ class GroqService:
             Generated response text
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature or self.temperature,
-                max_tokens=max_tokens or self.max_tokens,
-                response_format={"type": "json_object"} if json_mode else {"type": "text"}
-            )
+            async with self._slot():
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature or self.temperature,
+                    max_tokens=max_tokens or self.max_tokens,
+                    response_format={"type": "json_object"} if json_mode else {"type": "text"}
+                )
             
             content = response.choices[0].message.content
             logger.info(f"✅ Groq response generated ({len(content)} chars)")
@@ -55,6 +113,92 @@ class GroqService:
             logger.error(f"❌ Groq API error: {str(e)}")
             raise
     
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from Groq LLM as text deltas
+        
+        Closing the generator (e.g. when the client disconnects) closes the
+        upstream stream, so no more tokens are generated or paid for. Time to
+        first token (including any queue wait) and total time land in
+        `stream_latency`.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0-2)
+            max_tokens: Maximum tokens to generate
+        
+        Yields:
+            Response text pieces, in order
+        """
+        started = time.monotonic()
+        timing: Dict[str, Any] = {"ttft_ms": None}
+        chars = 0
+        outcome = "cancelled"
+        
+        # The slot is held until the stream is closed, like a request in flight
+        async with self._slot():
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature or self.temperature,
+                    max_tokens=max_tokens or self.max_tokens,
+                    stream=True
+                )
+            except Exception as e:
+                self.streams["failed"] += 1
+                logger.error(f"❌ Groq API error: {str(e)}")
+                raise
+            
+            try:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    if timing["ttft_ms"] is None:
+                        timing["ttft_ms"] = round((time.monotonic() - started) * 1000)
+                    chars += len(delta)
+                    yield delta
+                outcome = "completed"
+            except Exception as e:
+                outcome = "failed"
+                logger.error(f"❌ Groq stream error: {str(e)}")
+                raise
+            finally:
+                await stream.close()
+                timing["total_ms"] = round((time.monotonic() - started) * 1000)
+                self.streams[outcome] += 1
+                self.stream_latency.record(timing)
+                logger.info(
+                    f"{'✅' if outcome == 'completed' else '⚠️'} Groq stream {outcome} "
+                    f"({chars} chars, first token {timing['ttft_ms']}ms, total {timing['total_ms']}ms)"
+                )
+    
+    def stats(self) -> Dict[str, Any]:
+        """Concurrency and queue-wait metrics for monitoring"""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "queue_wait_ms": self.queue_wait.summary().get("queue_wait_ms", {}),
+            "streams": self.stream_stats(),
+            "cache": llm_cache.stats()
+        }
+    
+    def stream_stats(self) -> Dict[str, Any]:
+        """Stream outcomes and time-to-first-token percentiles"""
+        return {
+            **self.streams,
+            "recent_streams": len(self.stream_latency),
+            "latency_ms": self.stream_latency.summary()
+        }
+    
     async def classify_intent(self, user_message: str, sector: str = "banking") -> Dict[str, Any]:
         """
         Classify user intent for BFSI queries
@@ -83,7 +227,8 @@ class GroqService:
         user_query: str,
         context: str,
         sector: str = "banking",
-        language: str = "en"
+        language: str = "en",
+        history: Optional[List[Dict[str, str]]] = None
     ) -> str:
         """
         Generate BFSI-safe response using RAG context
@@ -93,10 +238,90 @@ class GroqService:
             context: Retrieved context from RAG
             sector: BFSI sector
             language: Response language
+            history: Earlier turns of the conversation ({"role", "content"})
         
         Returns:
             Generated response
         """
+        cache_key = self._bfsi_cache_key(user_query, context, sector, language, history)
+        if cache_key:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"✅ LLM cache hit ({len(cached)} chars)")
+                return cached
+        
+        messages = self._bfsi_messages(user_query, context, sector, language, history)
+        
+        response = await self.generate_response(messages)
+        if cache_key:
+            llm_cache.put(cache_key, response)
+        return response
+    
+    async def stream_bfsi_response(
+        self,
+        user_query: str,
+        context: str,
+        sector: str = "banking",
+        language: str = "en",
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of generate_bfsi_response
+        
+        A cached answer is yielded whole; a fresh one is cached only once
+        the stream completes.
+        
+        Yields:
+            Response text pieces (see stream_response)
+        """
+        cache_key = self._bfsi_cache_key(user_query, context, sector, language, history)
+        if cache_key:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"✅ LLM cache hit ({len(cached)} chars)")
+                yield cached
+                return
+        
+        messages = self._bfsi_messages(user_query, context, sector, language, history)
+        parts = []
+        deltas = self.stream_response(messages)
+        try:
+            async for delta in deltas:
+                parts.append(delta)
+                yield delta
+        finally:
+            await deltas.aclose()
+        
+        if cache_key:
+            llm_cache.put(cache_key, "".join(parts))
+    
+    def _bfsi_cache_key(
+        self,
+        user_query: str,
+        context: str,
+        sector: str,
+        language: str,
+        history: Optional[List[Dict[str, str]]]
+    ) -> Optional[str]:
+        return llm_cache.key_for(
+            user_query,
+            sector=sector,
+            language=language,
+            prompt_version=BFSI_PROMPT_VERSION,
+            model=self.model,
+            context=context,
+            history=history
+        )
+    
+    def _bfsi_messages(
+        self,
+        user_query: str,
+        context: str,
+        sector: str,
+        language: str,
+        history: Optional[List[Dict[str, str]]]
+    ) -> List[Dict[str, str]]:
+        """System prompt, earlier turns, then the (context-grounded) user question"""
         system_prompt = self._get_bfsi_response_prompt(sector, language)
         
         if context:
@@ -117,13 +342,11 @@ Generate a helpful, accurate response based on your general knowledge of {sector
 Be professional and concise.
 """
         
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
-        
-        response = await self.generate_response(messages)
-        return response
+        messages = [{"role": "system", "content": system_prompt}]
+        for turn in history or []:
+            messages.append({"role": turn["role"], "content": turn["content"]})
+        messages.append({"role": "user", "content": user_prompt})
+        return messages
     
     def _get_intent_classification_prompt(self, sector: str) -> str:
         """Get system prompt for intent classification"""
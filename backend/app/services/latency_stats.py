@@ -0,0 +1,42 @@
+"""
+Latency Statistics
+Rolling per-stage latency percentiles for conversational turns
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List
+
+
+class LatencyStats:
+    """p50/p95/max of each stage over the most recent samples"""
+    
+    def __init__(self, stages: Iterable[str], history: int = 500):
+        self.stages = tuple(stages)
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+    
+    def record(self, sample: Dict[str, Any]):
+        """Add one sample; stages missing from it (e.g. skipped on a fallback) are ignored"""
+        self._recent.append(sample)
+    
+    def __len__(self) -> int:
+        return len(self._recent)
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        latency = {}
+        for stage in self.stages:
+            values = sorted(sample[stage] for sample in self._recent if sample.get(stage) is not None)
+            if values:
+                latency[stage] = {
+                    "p50": _percentile(values, 0.50),
+                    "p95": _percentile(values, 0.95),
+                    "max": values[-1]
+                }
+        return latency
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+# Export
+__all__ = ["LatencyStats"]
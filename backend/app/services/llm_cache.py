@@ -0,0 +1,152 @@
+"""
+LLM Response Cache
+In-memory LRU cache with TTL for answers to frequently repeated customer questions
+"""
+
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+# Zero-width characters Indic keyboards and STT insert inconsistently (ZWSP, ZWNJ, ZWJ, WJ, BOM)
+_INVISIBLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"))
+
+# Account, phone, card, PAN/Aadhaar-style numbers (digits may be spaced or hyphenated) and emails
+_PERSONAL_DATA = re.compile(r"\d(?:[\s-]?\d){3,}|\S+@\S+\.\S+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Canonical form of a question for cache lookups
+    
+    NFKC (full-width and compatibility forms, Indic nukta sequences),
+    zero-width joiners removed, case folded, punctuation (including the
+    danda) dropped and whitespace collapsed.
+    """
+    text = unicodedata.normalize("NFKC", text).translate(_INVISIBLE).casefold()
+    text = "".join(" " if unicodedata.category(char).startswith("P") else char for char in text)
+    return " ".join(text.split())
+
+
+class LLMResponseCache:
+    """
+    Answers keyed by normalized question, sector, language and prompt version
+    
+    Only context-free questions are cached: a query with RAG/customer
+    context, conversation history or personal data in it is answered
+    fresh, so one customer's answer is never served to another.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        
+        # key -> (expires_at, response), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.bypassed: Dict[str, int] = {}
+    
+    def key_for(
+        self,
+        user_query: str,
+        sector: str,
+        language: str,
+        prompt_version: str,
+        model: str,
+        context: str = "",
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Optional[str]:
+        """Cache key for a question, or None when it must not be cached"""
+        if not self.enabled:
+            return None
+        
+        reason = None
+        if context and context.strip():
+            reason = "context"
+        elif history:
+            reason = "history"
+        elif _PERSONAL_DATA.search(user_query):
+            reason = "personal_data"
+        
+        normalized = normalize_query(user_query)
+        if reason is None and not normalized:
+            reason = "empty"
+        
+        if reason is not None:
+            self.bypassed[reason] = self.bypassed.get(reason, 0) + 1
+            return None
+        
+        canonical = json.dumps(
+            [normalized, sector, language, prompt_version, model],
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return a live cached response or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+    
+    def put(self, key: str, response: str):
+        """Store a response, evicting least recently used entries over max_entries"""
+        if not response or not response.strip():
+            return
+        
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "bypassed": dict(self.bypassed),
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Create singleton instance
+llm_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    enabled=settings.LLM_CACHE_ENABLED
+)
+
+
+# Export
+__all__ = ["llm_cache", "LLMResponseCache", "normalize_query"]
@@ -0,0 +1,433 @@
+"""
+Media Streams
+Real-time conversational calls over Twilio Media Streams: μ-law in, STT -> Groq -> TTS, μ-law out
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging import logger, audit_log
+from app.services.audio_utils import decode_mulaw, telephony_mulaw, write_wav
+from app.services.call_session_store import call_session_store, CallSession
+from app.services.groq_service import groq_service
+from app.services.latency_stats import LatencyStats
+from app.services.sarvam_service import sarvam_service
+
+
+TELEPHONY_SAMPLE_RATE = 8000
+
+# 20 ms of 8 kHz μ-law, the frame size Twilio sends
+FRAME_BYTES = 160
+
+# Audio kept from before speech onset so the first syllable is not clipped
+_PRE_ROLL_FRAMES = 10
+
+# How far replies are sent ahead of real time; enough to ride out network
+# jitter, little enough that barge-in stops the reply almost at once
+_PLAYBACK_LEAD_SECONDS = 0.2
+
+# Per-turn latency stages reported by stats(), in pipeline order
+LATENCY_STAGES = ("endpoint_ms", "stt_ms", "llm_ms", "tts_ms", "first_audio_ms", "total_ms")
+
+
+@dataclass
+class Utterance:
+    """One caller utterance cut by the VAD"""
+    pcm: bytes  # 16-bit 8 kHz mono
+    speech_ms: int
+    last_voice_at: float  # monotonic time of the last voiced frame
+    ended_at: float  # monotonic time the VAD closed the utterance
+
+
+@dataclass
+class Reply:
+    """Synthesized answer to one utterance, with monotonic stage timestamps"""
+    transcript: str
+    text: str
+    frames: bytes  # 8 kHz mono μ-law
+    transcribed_at: float
+    answered_at: float
+    synthesized_at: float
+
+
+class VoiceActivityDetector:
+    """
+    Energy-based endpointing over 20 ms PCM frames
+    
+    An utterance opens on the first frame above the RMS threshold and closes
+    after `silence_ms` of frames below it (or at `max_utterance_ms`).
+    Utterances with less than `min_speech_ms` of voiced audio are dropped
+    as noise.
+    """
+    
+    def __init__(self, threshold: int, silence_ms: int, min_speech_ms: int, max_utterance_ms: int):
+        self.threshold = threshold
+        self.silence_ms = silence_ms
+        self.min_speech_ms = min_speech_ms
+        self.max_utterance_ms = max_utterance_ms
+        
+        self._pre_roll: Deque[bytes] = deque(maxlen=_PRE_ROLL_FRAMES)
+        self._buffer = bytearray()
+        self._in_speech = False
+        self._speech_ms = 0
+        self._silence_ms = 0
+        self._utterance_ms = 0
+        self._last_voice_at = 0.0
+    
+    def feed(self, pcm: bytes, now: float) -> Tuple[bool, Optional[Utterance]]:
+        """
+        Process one frame
+        
+        Returns:
+            (speech_started, utterance): speech_started is True on the frame
+            that opens an utterance; utterance is set when one closes
+        """
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+        rms = float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+        frame_ms = len(samples) * 1000 // TELEPHONY_SAMPLE_RATE
+        voiced = rms >= self.threshold
+        
+        if not self._in_speech:
+            if not voiced:
+                self._pre_roll.append(pcm)
+                return False, None
+            self._in_speech = True
+            self._buffer = bytearray(b"".join(self._pre_roll))
+            self._pre_roll.clear()
+            self._speech_ms = self._silence_ms = self._utterance_ms = 0
+            started = True
+        else:
+            started = False
+        
+        self._buffer += pcm
+        self._utterance_ms += frame_ms
+        if voiced:
+            self._speech_ms += frame_ms
+            self._silence_ms = 0
+            self._last_voice_at = now
+        else:
+            self._silence_ms += frame_ms
+        
+        if self._silence_ms < self.silence_ms and self._utterance_ms < self.max_utterance_ms:
+            return started, None
+        
+        self._in_speech = False
+        if self._speech_ms < self.min_speech_ms:
+            return started, None
+        
+        utterance = Utterance(
+            pcm=bytes(self._buffer),
+            speech_ms=self._speech_ms,
+            last_voice_at=self._last_voice_at,
+            ended_at=now
+        )
+        self._buffer = bytearray()
+        return started, utterance
+
+
+class MediaStreamConversation:
+    """
+    One Twilio Media Streams connection
+    
+    The reader decodes inbound frames as they arrive and feeds the VAD;
+    finished utterances queue for a single turn worker that runs
+    STT -> LLM -> TTS and streams the reply back as media frames followed
+    by a mark, paced at real time. Caller speech while a reply is still
+    playing stops the sends and clears Twilio's playback buffer (barge-in).
+    """
+    
+    def __init__(self, websocket, session: CallSession, manager: "MediaStreamManager"):
+        self.websocket = websocket
+        self.call_id = session.call_id
+        self.language = session.language
+        self.sector = session.sector
+        self.manager = manager
+        
+        lang_config = sarvam_service.get_language_config(session.language)
+        self.language_code = lang_config.get("code", "en-IN")
+        self.speaker = lang_config.get("speaker", "meera")
+        
+        self.vad = VoiceActivityDetector(
+            threshold=settings.MEDIA_STREAM_VAD_THRESHOLD,
+            silence_ms=settings.MEDIA_STREAM_SILENCE_MS,
+            min_speech_ms=settings.MEDIA_STREAM_MIN_SPEECH_MS,
+            max_utterance_ms=int(settings.MEDIA_STREAM_MAX_UTTERANCE_SECONDS * 1000)
+        )
+        
+        self.stream_sid: Optional[str] = None
+        self.turns = 0
+        self.barge_ins = 0
+        self._playing_mark: Optional[str] = None
+        self._utterances: "asyncio.Queue[Utterance]" = asyncio.Queue(maxsize=4)
+        self._send_lock = asyncio.Lock()
+        self._started_at = time.monotonic()
+    
+    async def run(self):
+        """Serve the stream until Twilio sends "stop" or disconnects"""
+        worker = asyncio.create_task(self._respond())
+        try:
+            await self._read()
+        finally:
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+            
+            session = await call_session_store.get(self.call_id)
+            audit_log(
+                event="media_stream_ended",
+                user_id=session.phone_number if session else self.call_id,
+                metadata={
+                    "call_id": self.call_id,
+                    "stream_sid": self.stream_sid,
+                    "turns": self.turns,
+                    "barge_ins": self.barge_ins,
+                    "duration_seconds": round(time.monotonic() - self._started_at, 1)
+                }
+            )
+    
+    async def _read(self):
+        while True:
+            message = json.loads(await self.websocket.receive_text())
+            event = message.get("event")
+            
+            if event == "media":
+                media = message.get("media", {})
+                if media.get("track", "inbound") != "inbound":
+                    continue
+                try:
+                    mulaw = base64.b64decode(media.get("payload", ""))
+                except (binascii.Error, ValueError):
+                    continue
+                await self._on_audio(decode_mulaw(mulaw))
+            
+            elif event == "start":
+                start = message.get("start", {})
+                self.stream_sid = message.get("streamSid") or start.get("streamSid")
+                logger.info(f"🎧 Media stream {self.stream_sid} started for call {self.call_id}")
+            
+            elif event == "mark":
+                if message.get("mark", {}).get("name") == self._playing_mark:
+                    self._playing_mark = None
+            
+            elif event == "stop":
+                logger.info(f"🎧 Media stream {self.stream_sid} stopped for call {self.call_id}")
+                return
+    
+    async def _on_audio(self, pcm: bytes):
+        started, utterance = self.vad.feed(pcm, time.monotonic())
+        
+        if started and self._playing_mark is not None:
+            self.barge_ins += 1
+            self._playing_mark = None
+            await self._send({"event": "clear", "streamSid": self.stream_sid})
+        
+        if utterance is not None:
+            try:
+                self._utterances.put_nowait(utterance)
+            except asyncio.QueueFull:
+                logger.warning(f"⚠️ Call {self.call_id}: dropping utterance, turns are backed up")
+    
+    async def _respond(self):
+        while True:
+            utterance = await self._utterances.get()
+            if self.turns >= settings.MEDIA_STREAM_MAX_TURNS:
+                continue
+            try:
+                await self._turn(utterance)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                self.manager.timed_out_turns += 1
+                logger.warning(
+                    f"⚠️ Call {self.call_id}: turn abandoned, no reply within "
+                    f"{settings.MEDIA_STREAM_TURN_TIMEOUT_SECONDS:g}s"
+                )
+            except Exception as e:
+                self.manager.failed_turns += 1
+                logger.error(f"❌ Conversation turn failed for call {self.call_id}: {str(e)}")
+    
+    async def _turn(self, utterance: Utterance):
+        """STT -> LLM -> TTS for one utterance within the turn timeout, then stream the reply"""
+        started = time.monotonic()
+        reply = await asyncio.wait_for(
+            self._prepare_reply(utterance),
+            timeout=settings.MEDIA_STREAM_TURN_TIMEOUT_SECONDS
+        )
+        if reply is None:
+            return
+        
+        first_audio_at = await self._play(reply.frames, f"turn-{self.turns}")
+        
+        metrics = {
+            "turn": self.turns,
+            "speech_ms": utterance.speech_ms,
+            "endpoint_ms": (utterance.ended_at - utterance.last_voice_at) * 1000,
+            "stt_ms": (reply.transcribed_at - started) * 1000,
+            "llm_ms": (reply.answered_at - reply.transcribed_at) * 1000,
+            "tts_ms": (reply.synthesized_at - reply.answered_at) * 1000,
+            "first_audio_ms": (first_audio_at - utterance.ended_at) * 1000,
+            "total_ms": (first_audio_at - utterance.last_voice_at) * 1000
+        }
+        metrics = {name: round(value) if name.endswith("_ms") else value for name, value in metrics.items()}
+        self.manager.record_turn(metrics)
+        
+        logger.info(
+            f"🗣️ Call {self.call_id} turn {self.turns}: total {metrics['total_ms']}ms "
+            f"(endpoint {metrics['endpoint_ms']}, stt {metrics['stt_ms']}, llm {metrics['llm_ms']}, "
+            f"tts {metrics['tts_ms']})"
+        )
+        
+        session = await call_session_store.get(self.call_id)
+        if session is not None:
+            await call_session_store.update(self.call_id, messages=session.messages + [
+                {"role": "user", "content": reply.transcript},
+                {"role": "assistant", "content": reply.text, "latency": metrics}
+            ])
+    
+    async def _prepare_reply(self, utterance: Utterance) -> Optional[Reply]:
+        """Transcribe, answer and synthesize; None when nothing was said"""
+        transcription = await sarvam_service.speech_to_text(
+            audio_bytes=write_wav((1, 2, TELEPHONY_SAMPLE_RATE), utterance.pcm),
+            language=self.language_code
+        )
+        transcript = (transcription.get("transcript") or "").strip()
+        transcribed = time.monotonic()
+        if not transcript:
+            return None
+        
+        self.turns += 1
+        session = await call_session_store.get(self.call_id)
+        text = await groq_service.generate_bfsi_response(
+            user_query=transcript,
+            context="",
+            sector=self.sector,
+            language=self.language,
+            history=session.conversation_history() if session else None
+        )
+        answered = time.monotonic()
+        
+        audio = await sarvam_service.text_to_speech(
+            text=text,
+            language=self.language,
+            speaker=self.speaker,
+            encoding="mulaw"
+        )
+        frames = await asyncio.to_thread(telephony_mulaw, audio)
+        
+        return Reply(transcript, text, frames, transcribed, answered, time.monotonic())
+    
+    async def _play(self, frames: bytes, mark: str) -> float:
+        """
+        Send μ-law audio as 20 ms media messages plus a closing mark
+        
+        Frames go out at real time plus _PLAYBACK_LEAD_SECONDS, so at most
+        that much audio is buffered at Twilio when the caller barges in.
+        
+        Returns:
+            Monotonic time the first frame went out
+        """
+        first_sent_at = time.monotonic()
+        self._playing_mark = mark
+        
+        for index, offset in enumerate(range(0, len(frames), FRAME_BYTES)):
+            due = first_sent_at + index * FRAME_BYTES / TELEPHONY_SAMPLE_RATE - _PLAYBACK_LEAD_SECONDS
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._playing_mark != mark:
+                break  # Cleared by barge-in
+            await self._send({
+                "event": "media",
+                "streamSid": self.stream_sid,
+                "media": {"payload": base64.b64encode(frames[offset:offset + FRAME_BYTES]).decode("ascii")}
+            })
+            if offset == 0:
+                first_sent_at = time.monotonic()
+        
+        if self._playing_mark == mark:
+            await self._send({"event": "mark", "streamSid": self.stream_sid, "mark": {"name": mark}})
+        
+        return first_sent_at
+    
+    async def _send(self, message: Dict[str, Any]):
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(message))
+
+
+class MediaStreamManager:
+    """Admission control and latency statistics for conversational calls"""
+    
+    def __init__(self, max_streams: int):
+        self.max_streams = max_streams
+        self.active: Dict[str, MediaStreamConversation] = {}
+        self.latency = LatencyStats(LATENCY_STAGES)
+        
+        self.streams = 0
+        self.rejected = 0
+        self.total_turns = 0
+        self.failed_turns = 0
+        self.timed_out_turns = 0
+    
+    def open(self, websocket, session: CallSession) -> MediaStreamConversation:
+        """
+        Register a conversation for a connected stream
+        
+        Raises:
+            RuntimeError: If the stream limit is reached
+        """
+        if len(self.active) >= self.max_streams:
+            self.rejected += 1
+            raise RuntimeError("Too many concurrent media streams")
+        
+        conversation = MediaStreamConversation(websocket, session, self)
+        self.active[session.call_id] = conversation
+        self.streams += 1
+        return conversation
+    
+    def close(self, conversation: MediaStreamConversation):
+        if self.active.get(conversation.call_id) is conversation:
+            del self.active[conversation.call_id]
+    
+    def record_turn(self, metrics: Dict[str, Any]):
+        self.total_turns += 1
+        self.latency.record(metrics)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Stream counters and p50/p95 per-turn latency over recent turns"""
+        return {
+            "active_streams": len(self.active),
+            "max_streams": self.max_streams,
+            "streams": self.streams,
+            "rejected": self.rejected,
+            "turns": self.total_turns,
+            "failed_turns": self.failed_turns,
+            "timed_out_turns": self.timed_out_turns,
+            "recent_turns": len(self.latency),
+            "latency_ms": self.latency.summary()
+        }
+
+
+# Create singleton instance
+media_stream_manager = MediaStreamManager(max_streams=settings.MEDIA_STREAM_MAX_STREAMS)
+
+
+# Export
+__all__ = [
+    "media_stream_manager",
+    "MediaStreamManager",
+    "MediaStreamConversation",
+    "VoiceActivityDetector",
+    "Utterance",
+    "Reply"
+]
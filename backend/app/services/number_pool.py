@@ -0,0 +1,279 @@
+"""
+Caller ID Number Pool
+Spreads outbound calls across several Twilio numbers
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.call_session_store import call_session_store
+
+
+SELECTION_STRATEGIES = ("least_loaded", "round_robin")
+
+
+@dataclass(slots=True)
+class PooledNumber:
+    """Load and health state of one caller ID"""
+    number: str
+    in_flight: int = 0
+    dialed: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    disabled: bool = False
+    cooldown_until: float = 0.0
+    last_used: float = 0.0
+    
+    def is_available(self, now: float) -> bool:
+        return not self.disabled and now >= self.cooldown_until
+    
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "number": self.number,
+            "in_flight": self.in_flight,
+            "dialed": self.dialed,
+            "failures": self.failures,
+            "disabled": self.disabled,
+            "cooling_down": now < self.cooldown_until,
+            "available": self.is_available(now)
+        }
+
+
+class NumberPool:
+    """
+    Caller ID pool with per-number in-flight limits
+    
+    A number is held from dial until the call reaches a terminal status.
+    Repeat calls to the same customer reuse the caller ID they saw before
+    while it stays healthy. Numbers that keep failing are benched for a
+    cooldown; operators can also disable them outright.
+    
+    Counters and in-flight limits are per API process. With a shared
+    session backend a call's terminal callback may land on another worker,
+    so a dial blocked on a full pool re-checks its holds against the shared
+    session store every reconcile_seconds and releases finished calls.
+    """
+    
+    def __init__(
+        self,
+        numbers: List[str],
+        strategy: str = "least_loaded",
+        max_in_flight: int = 0,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 300,
+        max_hold_seconds: float = 14400,
+        max_sticky_entries: int = 100000,
+        reconcile_seconds: float = 5.0
+    ):
+        if not numbers:
+            raise ValueError("Number pool needs at least one caller ID")
+        if strategy not in SELECTION_STRATEGIES:
+            raise ValueError(f"Unknown selection strategy '{strategy}' (expected {', '.join(SELECTION_STRATEGIES)})")
+        
+        self.strategy = strategy
+        self.max_in_flight = max_in_flight
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_hold_seconds = max_hold_seconds
+        self.max_sticky_entries = max_sticky_entries
+        self.reconcile_seconds = reconcile_seconds
+        
+        self._numbers: Dict[str, PooledNumber] = {number: PooledNumber(number) for number in numbers}
+        self._order = list(self._numbers)
+        self._next = 0
+        # call_id -> (number, acquired monotonic)
+        self._held: Dict[str, Tuple[str, float]] = {}
+        # customer phone -> caller ID last used for them
+        self._sticky: "OrderedDict[str, str]" = OrderedDict()
+        self._released = asyncio.Event()
+        self.waits = 0
+        self.reconciled = 0
+    
+    async def acquire(self, call_id: str, phone_number: str) -> str:
+        """
+        Reserve a caller ID for a call, waiting if every number is at its limit
+        
+        Args:
+            call_id: Call session ID (key for release)
+            phone_number: Customer number, for caller ID stickiness
+        
+        Returns:
+            Caller ID to dial from
+        
+        Raises:
+            RuntimeError: If every number is disabled or cooling down
+        """
+        held = self._held.get(call_id)
+        if held is not None:
+            return held[0]
+        
+        while True:
+            number = self._select(phone_number)
+            if number is not None:
+                break
+            self.waits += 1
+            self._released.clear()
+            if await self._reconcile():
+                continue
+            
+            # Also wake when a benched number's cooldown ends
+            try:
+                await asyncio.wait_for(self._released.wait(), timeout=self._wait_timeout())
+            except asyncio.TimeoutError:
+                pass
+        
+        state = self._numbers[number]
+        state.in_flight += 1
+        state.dialed += 1
+        state.last_used = time.monotonic()
+        self._held[call_id] = (number, state.last_used)
+        
+        self._sticky[phone_number] = number
+        self._sticky.move_to_end(phone_number)
+        while len(self._sticky) > self.max_sticky_entries:
+            self._sticky.popitem(last=False)
+        
+        return number
+    
+    def release(self, call_id: str):
+        """Return a call's caller ID to the pool (idempotent)"""
+        held = self._held.pop(call_id, None)
+        if held is None:
+            return
+        
+        state = self._numbers.get(held[0])
+        if state is not None:
+            state.in_flight = max(state.in_flight - 1, 0)
+        self._released.set()
+    
+    def record_success(self, number: str):
+        state = self._numbers.get(number)
+        if state is not None:
+            state.consecutive_failures = 0
+    
+    def record_failure(self, number: str):
+        """Count a failed dial; bench the number after repeated failures"""
+        state = self._numbers.get(number)
+        if state is None:
+            return
+        
+        state.failures += 1
+        state.consecutive_failures += 1
+        if state.consecutive_failures >= self.failure_threshold:
+            state.consecutive_failures = 0
+            state.cooldown_until = time.monotonic() + self.cooldown_seconds
+            logger.warning(f"⚠️ Caller ID {number} benched for {self.cooldown_seconds:.0f}s after repeated failures")
+    
+    def set_enabled(self, number: str, enabled: bool) -> bool:
+        """Enable or disable a number; returns False if it is not in the pool"""
+        state = self._numbers.get(number)
+        if state is None:
+            return False
+        
+        state.disabled = not enabled
+        if enabled:
+            state.cooldown_until = 0.0
+            state.consecutive_failures = 0
+            self._released.set()
+        
+        logger.info(f"📞 Caller ID {number} {'enabled' if enabled else 'disabled'}")
+        return True
+    
+    def number_for(self, call_id: str) -> Optional[str]:
+        held = self._held.get(call_id)
+        return held[0] if held is not None else None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per-number load and health"""
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": len(self._held),
+            "waits": self.waits,
+            "reconciled": self.reconciled,
+            "sticky_customers": len(self._sticky),
+            "numbers": [state.to_dict(now) for state in self._numbers.values()]
+        }
+    
+    def _select(self, phone_number: str) -> Optional[str]:
+        now = time.monotonic()
+        self._reap(now)
+        
+        available = [state for state in self._numbers.values() if state.is_available(now)]
+        if not available:
+            raise RuntimeError("No caller ID available: every pool number is disabled or cooling down")
+        
+        # Stick with the caller ID this customer saw before while it is healthy
+        sticky = self._numbers.get(self._sticky.get(phone_number, ""))
+        if sticky is not None and sticky.is_available(now):
+            return sticky.number if self._has_capacity(sticky) else None
+        
+        candidates = [state for state in available if self._has_capacity(state)]
+        if not candidates:
+            return None
+        
+        if self.strategy == "round_robin":
+            for _ in range(len(self._order)):
+                number = self._order[self._next % len(self._order)]
+                self._next += 1
+                if self._numbers[number] in candidates:
+                    return number
+        
+        return min(candidates, key=lambda state: (state.in_flight, state.last_used)).number
+    
+    def _has_capacity(self, state: PooledNumber) -> bool:
+        return not self.max_in_flight or state.in_flight < self.max_in_flight
+    
+    def _wait_timeout(self) -> Optional[float]:
+        """Seconds until a blocked dial should look again (None: only on release)"""
+        now = time.monotonic()
+        deadlines = [
+            state.cooldown_until - now for state in self._numbers.values()
+            if not state.disabled and state.cooldown_until > now
+        ]
+        if call_session_store.backend.shared and self._held:
+            deadlines.append(self.reconcile_seconds)
+        return max(min(deadlines), 0.0) if deadlines else None
+    
+    async def _reconcile(self) -> bool:
+        """Release holds on calls another worker saw finish; True if any were released"""
+        if not call_session_store.backend.shared or not self._held:
+            return False
+        
+        sessions = await call_session_store.get_many(list(self._held))
+        finished = [
+            call_id for call_id in list(self._held)
+            if call_id in sessions and sessions[call_id].is_finished
+        ]
+        for call_id in finished:
+            self.release(call_id)
+        self.reconciled += len(finished)
+        return bool(finished)
+    
+    def _reap(self, now: float):
+        """Release holds whose terminal status callback never reached this process"""
+        stale = [call_id for call_id, (_, acquired) in self._held.items() if now - acquired > self.max_hold_seconds]
+        for call_id in stale:
+            self.release(call_id)
+
+
+# Create singleton instance
+number_pool = NumberPool(
+    numbers=settings.twilio_phone_numbers_list,
+    strategy=settings.TWILIO_NUMBER_SELECTION,
+    max_in_flight=settings.TWILIO_NUMBER_MAX_IN_FLIGHT,
+    failure_threshold=settings.TWILIO_NUMBER_FAILURE_THRESHOLD,
+    cooldown_seconds=settings.TWILIO_NUMBER_COOLDOWN_SECONDS,
+    max_hold_seconds=settings.TWILIO_NUMBER_MAX_HOLD_SECONDS,
+    reconcile_seconds=settings.TWILIO_NUMBER_RECONCILE_SECONDS
+)
+
+
+# Export
+__all__ = ["number_pool", "NumberPool", "PooledNumber", "SELECTION_STRATEGIES"]
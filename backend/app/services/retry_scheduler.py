@@ -0,0 +1,320 @@
+"""
+Call Retry Scheduler
+Persistent, heap-ordered redials for unanswered calls within calling hours
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger, audit_log
+from app.core.session_backend import SessionBackend, session_backend
+from app.services.call_session_store import CallSession
+
+
+@dataclass(slots=True)
+class RetryJob:
+    """A pending redial of a call chain"""
+    chain_id: str  # call_id of the first attempt
+    attempt: int  # attempt number this job will dial
+    due_at: float  # epoch seconds
+    phone_number: str
+    purpose: str
+    sector: str
+    language: str
+    customer_data: dict = field(default_factory=dict)
+    public_url: Optional[str] = None
+    previous_call_id: Optional[str] = None
+    previous_status: Optional[str] = None
+    call_mode: str = "playback"
+    campaign_id: Optional[str] = None
+
+
+RetryDispatch = Callable[[RetryJob], Awaitable[Any]]
+
+
+class CallingWindow:
+    """Permitted calling hours in a fixed-offset timezone (IST has no DST)"""
+    
+    def __init__(self, start_hour: int, end_hour: int, utc_offset_minutes: int):
+        self.start_hour = start_hour
+        self.end_hour = end_hour
+        self.tz = timezone(timedelta(minutes=utc_offset_minutes))
+    
+    def contains(self, timestamp: float) -> bool:
+        local = datetime.fromtimestamp(timestamp, self.tz)
+        return self.start_hour <= local.hour < self.end_hour
+    
+    def next_open(self, timestamp: float) -> float:
+        """The timestamp itself if calls are allowed then, else the next window opening"""
+        local = datetime.fromtimestamp(timestamp, self.tz)
+        if self.start_hour <= local.hour < self.end_hour:
+            return timestamp
+        
+        opening = local.replace(hour=self.start_hour, minute=0, second=0, microsecond=0)
+        if local.hour >= self.end_hour:
+            opening += timedelta(days=1)
+        return opening.timestamp()
+
+
+class RetryScheduler:
+    """
+    Redial scheduler
+    
+    Pending retries live in a min-heap keyed by due time (O(log n) schedule
+    and pop) and are persisted to the session backend, so a restart reloads
+    them. Cancelled or superseded heap entries are skipped lazily. Before
+    dialing, a job is claimed with an atomic backend pop, so with a shared
+    backend only one worker redials it.
+    
+    Retry delays grow exponentially with jitter; due times that fall outside
+    calling hours move to the next window opening, spread over a short period
+    so a night's backlog does not all dial at once.
+    """
+    
+    NAMESPACE = "call_retry"
+    
+    def __init__(
+        self,
+        backend: SessionBackend,
+        window: CallingWindow,
+        retry_statuses: List[str],
+        max_attempts: int,
+        base_delay_seconds: float,
+        max_delay_seconds: float,
+        window_spread_seconds: float,
+        concurrency: int
+    ):
+        self.backend = backend
+        self.window = window
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.window_spread_seconds = window_spread_seconds
+        self.concurrency = max(1, concurrency)
+        
+        # (due_at, seq, chain_id); an entry is live only if it matches _jobs
+        self._heap: List[Tuple[float, int, str]] = []
+        self._jobs: Dict[str, Tuple[int, RetryJob]] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._dispatch: Optional[RetryDispatch] = None
+        self._inflight: Set[asyncio.Task] = set()
+        
+        self.scheduled = 0
+        self.dispatched = 0
+        self.exhausted = 0
+        self.deferred = 0
+        self.failed = 0
+    
+    def should_retry(self, session: CallSession) -> bool:
+        return session.status != "completed" and session.twilio_status in self.retry_statuses
+    
+    async def schedule_for(self, session: CallSession) -> Optional[RetryJob]:
+        """
+        Schedule the next attempt for a call that ended unanswered
+        
+        Args:
+            session: Finished call session
+        
+        Returns:
+            The scheduled job, or None if the retry policy is exhausted
+        """
+        chain_id = session.retry_of or session.call_id
+        if session.attempt >= self.max_attempts:
+            self.exhausted += 1
+            audit_log(
+                event="call_retries_exhausted",
+                user_id=session.phone_number,
+                metadata={"call_id": session.call_id, "chain_id": chain_id, "attempts": session.attempt}
+            )
+            return None
+        
+        job = RetryJob(
+            chain_id=chain_id,
+            attempt=session.attempt + 1,
+            due_at=self._due_time(session.attempt),
+            phone_number=session.phone_number,
+            purpose=session.purpose,
+            sector=session.sector,
+            language=session.language,
+            customer_data=session.customer_data,
+            public_url=session.public_url,
+            call_mode=session.call_mode,
+            campaign_id=session.campaign_id,
+            previous_call_id=session.call_id,
+            previous_status=session.twilio_status
+        )
+        await self.schedule(job)
+        self.scheduled += 1
+        
+        logger.info(
+            f"🔁 Retry {job.attempt}/{self.max_attempts} for {job.phone_number} "
+            f"({job.previous_status}) at {datetime.fromtimestamp(job.due_at, self.window.tz).isoformat()}"
+        )
+        return job
+    
+    async def schedule(self, job: RetryJob, persist: bool = True):
+        """Add or replace the pending job for a chain"""
+        seq = next(self._seq)
+        self._jobs[job.chain_id] = (seq, job)
+        heapq.heappush(self._heap, (job.due_at, seq, job.chain_id))
+        
+        if persist:
+            await self._persist(job)
+        # The job may be the new earliest; let the runner recompute its sleep
+        self._wakeup.set()
+    
+    async def cancel(self, chain_id: str) -> bool:
+        """Drop a chain's pending retry"""
+        entry = self._jobs.pop(chain_id, None)
+        await self.backend.delete(self.NAMESPACE, chain_id)
+        return entry is not None
+    
+    def pending(self) -> int:
+        return len(self._jobs)
+    
+    def stats(self) -> Dict[str, Any]:
+        next_due = self._peek()
+        return {
+            "pending": len(self._jobs),
+            "heap_entries": len(self._heap),
+            "dialing": len(self._inflight),
+            "next_due_at": datetime.fromtimestamp(next_due.due_at, self.window.tz).isoformat() if next_due else None,
+            "scheduled": self.scheduled,
+            "dispatched": self.dispatched,
+            "exhausted": self.exhausted,
+            "deferred_to_window": self.deferred,
+            "dispatch_failures": self.failed,
+            "max_attempts": self.max_attempts,
+            "calling_window": f"{self.window.start_hour:02d}:00-{self.window.end_hour:02d}:00"
+        }
+    
+    async def start(self, dispatch: RetryDispatch):
+        """
+        Reload persisted jobs and start dialing them when due
+        
+        Args:
+            dispatch: Coroutine that places the retry call
+        """
+        if self._runner is not None:
+            return
+        
+        self._dispatch = dispatch
+        records = await self.backend.values(self.NAMESPACE)
+        for record in records:
+            job = RetryJob(**record)
+            seq = next(self._seq)
+            self._jobs[job.chain_id] = (seq, job)
+            self._heap.append((job.due_at, seq, job.chain_id))
+        heapq.heapify(self._heap)
+        
+        if records:
+            logger.info(f"🔁 Restored {len(records)} pending call retries")
+        self._runner = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, *self._inflight, return_exceptions=True)
+            self._runner = None
+    
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        while True:
+            job = self._peek()
+            delay = job.due_at - time.time() if job else None
+            if job is None or delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(self._heap)
+            del self._jobs[job.chain_id]
+            
+            if not self.window.contains(time.time()):
+                # Came due outside calling hours (e.g. restored after downtime)
+                self.deferred += 1
+                job.due_at = self._spread(self.window.next_open(time.time()))
+                await self.schedule(job)
+                continue
+            
+            # Claim it; another worker sharing the backend may have dialed it already
+            claimed = await self.backend.pop(self.NAMESPACE, job.chain_id)
+            if claimed is None or claimed.get("attempt") != job.attempt:
+                continue
+            
+            await semaphore.acquire()
+            task = asyncio.create_task(self._dial(job, semaphore))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dial(self, job: RetryJob, semaphore: asyncio.Semaphore):
+        try:
+            await self._dispatch(job)
+            self.dispatched += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"❌ Retry {job.attempt} for {job.phone_number} failed to dial: {str(e)}")
+        finally:
+            semaphore.release()
+    
+    def _peek(self) -> Optional[RetryJob]:
+        """Earliest live job, discarding stale heap entries"""
+        while self._heap:
+            _, seq, chain_id = self._heap[0]
+            entry = self._jobs.get(chain_id)
+            if entry is not None and entry[0] == seq:
+                return entry[1]
+            heapq.heappop(self._heap)
+        return None
+    
+    def _due_time(self, attempts_made: int) -> float:
+        delay = min(self.base_delay_seconds * 2 ** (attempts_made - 1), self.max_delay_seconds)
+        # Equal jitter: half fixed, half random, to de-synchronize retries
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        
+        due_at = time.time() + delay
+        opening = self.window.next_open(due_at)
+        return due_at if opening == due_at else self._spread(opening)
+    
+    def _spread(self, opening: float) -> float:
+        return opening + random.uniform(0, self.window_spread_seconds)
+    
+    async def _persist(self, job: RetryJob):
+        # Keep the record a day past its due time in case the scheduler was down
+        ttl = max(job.due_at - time.time(), 0) + 86400
+        await self.backend.set(self.NAMESPACE, job.chain_id, asdict(job), ttl_seconds=ttl)
+
+
+# Create singleton instance
+retry_scheduler = RetryScheduler(
+    backend=session_backend,
+    window=CallingWindow(
+        start_hour=settings.CALL_WINDOW_START_HOUR,
+        end_hour=settings.CALL_WINDOW_END_HOUR,
+        utc_offset_minutes=settings.CALL_WINDOW_UTC_OFFSET_MINUTES
+    ),
+    retry_statuses=[status.strip() for status in settings.CALL_RETRY_STATUSES.split(",")],
+    max_attempts=settings.CALL_RETRY_MAX_ATTEMPTS,
+    base_delay_seconds=settings.CALL_RETRY_BASE_DELAY_SECONDS,
+    max_delay_seconds=settings.CALL_RETRY_MAX_DELAY_SECONDS,
+    window_spread_seconds=settings.CALL_RETRY_WINDOW_SPREAD_SECONDS,
+    concurrency=settings.CALL_RETRY_DIAL_CONCURRENCY
+)
+
+
+# Export
+__all__ = ["retry_scheduler", "RetryScheduler", "RetryJob", "CallingWindow"]
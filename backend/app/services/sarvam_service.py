@@ -3,16 +3,26 @@ Sarvam AI Voice Service
 Text-to-Speech and Speech-to-Text for multilingual voice calls
 """
 
+import asyncio
 import httpx
 import base64
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from app.core.config import settings
 from app.core.logging import logger
+from app.services.audio_utils import concat_wav, concat_mulaw_wav, pcm_wav_to_mulaw
+from app.services.tts_cache import tts_cache
+
+
+# Empty WAV returned when Sarvam is unavailable (demo mode)
+DEMO_AUDIO = b'RIFF$\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00D\xac\x00\x00\x88X\x01\x00\x02\x00\x10\x00data\x00\x00\x00\x00'
 
 
 class SarvamVoiceService:
     """Sarvam AI service for voice synthesis and recognition"""
     
+    # Silence between stitched segments, roughly a word boundary
+    SEGMENT_GAP_MS = 80
+    
     def __init__(self):
         self.api_key = settings.SARVAM_API_KEY
         self.api_url = settings.SARVAM_API_URL
@@ -24,13 +34,18 @@ class SarvamVoiceService:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        # cache key -> task for syntheses currently in progress
+        self._tts_inflight: Dict[str, asyncio.Task] = {}
     
     async def text_to_speech(
         self,
         text: str,
         language: str = "en",
         speaker: str = "meera",
-        speed: float = 1.0
+        speed: float = 1.0,
+        use_cache: bool = True,
+        encoding: str = "pcm"
     ) -> bytes:
         """
         Convert text to speech
@@ -40,28 +55,147 @@ class SarvamVoiceService:
             language: Language code (en, hi, ta, te, etc.)
             speaker: Voice speaker name
             speed: Speech speed (0.5-2.0)
+            use_cache: Read and write the TTS audio cache
+            encoding: "pcm" (16-bit, as Sarvam returns it) or "mulaw" (8-bit G.711 for telephony)
         
         Returns:
             Audio bytes (WAV format)
         """
+        # Get detailed language config to ensure correct code (en-IN)
+        config = self.get_language_config(language)
+        target_language = config.get("code", "en-IN")
+        
+        payload = {
+            "text": text,
+            "target_language_code": target_language,
+            "speaker": speaker,
+            "speech_sample_rate": 8000,
+            "enable_preprocessing": True,
+            "model": self.tts_model,
+            "pace": speed  # Map speed to pace
+        }
+        
+        if encoding == "mulaw":
+            return await self._mulaw_speech(payload, use_cache)
+        return await self._pcm_speech(payload, use_cache)
+    
+    async def _pcm_speech(self, payload: Dict[str, Any], use_cache: bool) -> bytes:
+        """Sarvam PCM audio through the TTS cache, sharing identical in-flight syntheses"""
+        text = payload["text"]
+        if not use_cache:
+            return await self._synthesize(payload, cache_key=None)
+        
+        cache_key = tts_cache.make_key(payload)
+        cached_audio = await tts_cache.get(cache_key)
+        if cached_audio is not None:
+            logger.info(f"✅ TTS cache hit: {len(text)} chars -> {len(cached_audio)} bytes")
+            return cached_audio
+        
+        # Identical concurrent requests (e.g. a campaign greeting) share one synthesis.
+        # It runs in its own task, so a cancelled caller only stops waiting for it.
+        task = self._tts_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._synthesize(payload, cache_key))
+            self._tts_inflight[cache_key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(cache_key, done))
+        return await asyncio.shield(task)
+    
+    def _finish_inflight(self, cache_key: str, task: asyncio.Task):
+        del self._tts_inflight[cache_key]
+        # Mark retrieved so a synthesis every caller abandoned does not log a warning
+        if not task.cancelled():
+            task.exception()
+    
+    async def _mulaw_speech(self, payload: Dict[str, Any], use_cache: bool) -> bytes:
+        """μ-law variant of a synthesis; cached next to the PCM original under its own key"""
+        # Keyed on the output rate so entries cached before resampling are not reused
+        cache_key = tts_cache.make_key({**payload, "encoding": "mulaw", "mulaw_rate": 8000}) if use_cache else None
+        if cache_key:
+            cached_audio = await tts_cache.get(cache_key)
+            if cached_audio is not None:
+                return cached_audio
+        
+        pcm_audio = await self._pcm_speech(payload, use_cache)
+        if pcm_audio == DEMO_AUDIO:
+            return pcm_audio
+        
+        try:
+            audio_bytes = pcm_wav_to_mulaw(pcm_audio)
+        except ValueError as e:
+            # Twilio still plays PCM; it just costs the extra bytes
+            logger.warning(f"⚠️ μ-law encoding skipped ({str(e)})")
+            return pcm_audio
+        
+        if cache_key:
+            await tts_cache.put(cache_key, audio_bytes)
+        return audio_bytes
+    
+    async def synthesize_segments(
+        self,
+        segments: List[Tuple[str, bool]],
+        language: str = "en",
+        speaker: str = "meera",
+        speed: float = 1.0,
+        encoding: str = "pcm"
+    ) -> bytes:
+        """
+        Synthesize a templated utterance piecewise and stitch the audio
+        
+        Static segments are shared across customers and go through the TTS
+        cache; variable segments (amounts, dates, names) are synthesized
+        per call without polluting the cache. μ-law segments are stitched
+        as-is, so cached static segments are never re-encoded.
+        
+        Args:
+            segments: Ordered (text, is_static) pairs
+            language: Language code
+            speaker: Voice speaker name
+            speed: Speech speed
+            encoding: "pcm" or "mulaw" (see text_to_speech)
+        
+        Returns:
+            Audio bytes (WAV format)
+        """
+        texts = [text for text, _ in segments]
+        full_text = " ".join(texts)
+        
+        parts = await asyncio.gather(*[
+            self.text_to_speech(
+                text, language=language, speaker=speaker, speed=speed, use_cache=is_static, encoding=encoding
+            )
+            for text, is_static in segments
+        ])
+        
+        # Any demo-mode segment means the API is failing; let the caller see that
+        if any(part == DEMO_AUDIO for part in parts):
+            return DEMO_AUDIO
+        
+        try:
+            stitch = concat_mulaw_wav if encoding == "mulaw" else concat_wav
+            audio_bytes = stitch(list(parts), gap_ms=self.SEGMENT_GAP_MS)
+        except ValueError as e:
+            logger.warning(f"⚠️ Audio stitching failed ({str(e)}), synthesizing full text")
+            return await self.text_to_speech(
+                full_text, language=language, speaker=speaker, speed=speed, encoding=encoding
+            )
+        
+        variable_chars = sum(len(text) for text, is_static in segments if not is_static)
+        logger.info(
+            f"✅ TTS stitched {len(segments)} segments -> {len(audio_bytes)} bytes "
+            f"({variable_chars}/{len(full_text)} chars per-call)"
+        )
+        
+        return audio_bytes
+    
+    async def _synthesize(self, payload: Dict[str, Any], cache_key: Optional[str]) -> bytes:
+        """Call the Sarvam TTS API, caching real audio and falling back to demo audio"""
+        text = payload["text"]
         try:
-            # Get detailed language config to ensure correct code (en-IN)
-            config = self.get_language_config(language)
-            target_language = config.get("code", "en-IN")
-
             async with httpx.AsyncClient() as client:
                 response = await client.post(
                     f"{self.api_url}/text-to-speech",
                     headers=self.headers,
-                    json={
-                        "text": text,
-                        "target_language_code": target_language,
-                        "speaker": speaker,
-                        "speech_sample_rate": 8000,
-                        "enable_preprocessing": True,
-                        "model": self.tts_model,
-                        "pace": speed  # Map speed to pace
-                    },
+                    json=payload,
                     timeout=30.0
                 )
                 
@@ -79,6 +213,9 @@ class SarvamVoiceService:
                 
                 logger.info(f"✅ TTS generated: {len(text)} chars -> {len(audio_bytes)} bytes")
                 
+                if cache_key:
+                    await tts_cache.put(cache_key, audio_bytes)
+                
                 return audio_bytes
                 
                 
@@ -87,9 +224,8 @@ class SarvamVoiceService:
             logger.error(f"   Response body: {e.response.text[:500]}")
             logger.warning(f"⚠️ TTS API failed, using demo mode")
             # Return mock audio data for demo purposes
-            mock_audio = b'RIFF$\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00D\xac\x00\x00\x88X\x01\x00\x02\x00\x10\x00data\x00\x00\x00\x00'
             logger.info(f"✅ TTS demo mode: {len(text)} chars -> mock audio")
-            return mock_audio
+            return DEMO_AUDIO
                 
         except Exception as e:
             logger.error(f"❌ Sarvam TTS Exception: {type(e).__name__}: {str(e)}")
@@ -98,9 +234,8 @@ class SarvamVoiceService:
                 logger.error(f"   Traceback: {traceback.format_exc()}")
             logger.warning(f"⚠️ TTS API failed, using demo mode")
             # Return mock audio data for demo purposes
-            mock_audio = b'RIFF$\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00D\xac\x00\x00\x88X\x01\x00\x02\x00\x10\x00data\x00\x00\x00\x00'
             logger.info(f"✅ TTS demo mode: {len(text)} chars -> mock audio")
-            return mock_audio
+            return DEMO_AUDIO
     
     async def speech_to_text(
         self,
@@ -244,6 +379,24 @@ class SarvamVoiceService:
                 "code": "ta-IN",
                 "speaker": "vidya",
                 "speed": 0.85
+            },
+            "te": {
+                "name": "Telugu",
+                "code": "te-IN",
+                "speaker": "anushka",
+                "speed": 0.85
+            },
+            "mr": {
+                "name": "Marathi",
+                "code": "mr-IN",
+                "speaker": "karun",
+                "speed": 0.85
+            },
+            "bn": {
+                "name": "Bengali",
+                "code": "bn-IN",
+                "speaker": "arya",
+                "speed": 0.85
             }
         }
         
@@ -255,4 +408,4 @@ sarvam_service = SarvamVoiceService()
 
 
 # Export
-__all__ = ["sarvam_service", "SarvamVoiceService"]
+__all__ = ["sarvam_service", "SarvamVoiceService", "DEMO_AUDIO"]
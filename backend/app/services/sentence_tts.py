@@ -0,0 +1,145 @@
+"""
+Sentence TTS
+Splits LLM output into sentences and synthesizes them concurrently, yielding the audio in order
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, List, Optional
+
+from app.core.config import settings
+from app.services.sarvam_service import sarvam_service
+
+
+# Sentence-final punctuation (including the Devanagari danda), confirmed by the whitespace after it
+_SENTENCE_END = re.compile(r"[.!?।॥]+[\"')\]]*(?=\s)|\n+")
+
+# Words whose trailing period does not end a sentence
+_ABBREVIATIONS = {"rs", "mr", "mrs", "ms", "dr", "no", "vs", "etc", "e.g", "i.e", "st", "ltd", "pvt", "approx"}
+
+
+def _ends_with_abbreviation(text: str) -> bool:
+    words = text.rsplit(None, 1)
+    return bool(words) and words[-1].rstrip(".").lower() in _ABBREVIATIONS and text.endswith(".")
+
+
+class SentenceSplitter:
+    """
+    Incremental sentence splitter for streamed text
+    
+    A boundary only counts once the whitespace after it has arrived, so a
+    delta ending in "Rs." or "5." is held until the next one. Fragments
+    shorter than min_chars are merged into the following sentence to keep
+    TTS requests (and the audible joins between them) few.
+    """
+    
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self._buffer = ""
+    
+    def feed(self, text: str) -> List[str]:
+        """Add text; returns the sentences it completed"""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if len(candidate) < self.min_chars or _ends_with_abbreviation(candidate):
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        
+        self._buffer = self._buffer[start:]
+        return sentences
+    
+    def flush(self) -> List[str]:
+        """The unterminated remainder, once the text is complete"""
+        remainder, self._buffer = self._buffer.strip(), ""
+        return [remainder] if remainder else []
+
+
+@dataclass
+class SpeechChunk:
+    """Audio of one sentence; index is its position in the answer"""
+    index: int
+    text: str
+    audio: bytes
+    tts_ms: int
+
+
+async def speak_sentences(
+    deltas: AsyncIterable[str],
+    language: str = "en",
+    speaker: Optional[str] = None,
+    encoding: str = "pcm",
+    max_concurrency: Optional[int] = None,
+    min_chars: Optional[int] = None
+) -> AsyncIterator[SpeechChunk]:
+    """
+    Synthesize text as it arrives, one TTS request per sentence
+    
+    Up to max_concurrency sentences are synthesized or waiting to be
+    consumed at once; chunks are yielded strictly in sentence order. Closing
+    the generator (e.g. on client disconnect) cancels outstanding syntheses.
+    
+    Args:
+        deltas: Text pieces in order (a full answer or streamed tokens)
+        language: Language code
+        speaker: Voice speaker name (default: the language's speaker)
+        encoding: "pcm" or "mulaw" (see SarvamVoiceService.text_to_speech)
+        max_concurrency: Sentences in flight (default QUERY_TTS_CONCURRENCY)
+        min_chars: Shortest sentence sent alone (default QUERY_SENTENCE_MIN_CHARS)
+    """
+    speaker = speaker or sarvam_service.get_language_config(language).get("speaker", "meera")
+    slots = asyncio.Semaphore(max_concurrency or settings.QUERY_TTS_CONCURRENCY)
+    pending: asyncio.Queue = asyncio.Queue()
+    
+    async def synthesize(index: int, text: str) -> SpeechChunk:
+        started = time.monotonic()
+        audio = await sarvam_service.text_to_speech(text, language=language, speaker=speaker, encoding=encoding)
+        return SpeechChunk(index, text, audio, round((time.monotonic() - started) * 1000))
+    
+    async def split():
+        splitter = SentenceSplitter(min_chars or settings.QUERY_SENTENCE_MIN_CHARS)
+        index = 0
+        
+        async def schedule(sentences: List[str]):
+            nonlocal index
+            for sentence in sentences:
+                await slots.acquire()
+                await pending.put(asyncio.create_task(synthesize(index, sentence)))
+                index += 1
+        
+        try:
+            async for delta in deltas:
+                await schedule(splitter.feed(delta))
+            await schedule(splitter.flush())
+        finally:
+            await pending.put(None)
+    
+    splitter_task = asyncio.create_task(split())
+    try:
+        while True:
+            task = await pending.get()
+            if task is None:
+                break
+            try:
+                chunk = await task
+            finally:
+                slots.release()
+            yield chunk
+        
+        # Surfaces errors from the text source
+        await splitter_task
+    finally:
+        splitter_task.cancel()
+        while not pending.empty():
+            task = pending.get_nowait()
+            if task is not None:
+                task.cancel()
+
+
+# Export
+__all__ = ["speak_sentences", "SentenceSplitter", "SpeechChunk"]
@@ -0,0 +1,161 @@
+"""
+Speech Turns
+One caller turn of a <Gather input="speech"> call: history-aware LLM reply and its audio, within a time budget
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.audio_store import audio_store
+from app.services.call_session_store import call_session_store, CallSession
+from app.services.groq_service import groq_service
+from app.services.latency_stats import LatencyStats
+from app.services.sarvam_service import sarvam_service
+
+
+LATENCY_STAGES = ("llm_ms", "tts_ms", "store_ms", "total_ms")
+
+# Spoken with <Say> when the LLM misses its share of the budget
+FALLBACK_REPLIES = {
+    "en": "I'm sorry, I could not get that information right now. Please try again later.",
+    "hi": "क्षमा करें, मैं अभी यह जानकारी प्राप्त नहीं कर सका। कृपया बाद में पुनः प्रयास करें।",
+    "ta": "மன்னிக்கவும், இப்போது அந்தத் தகவலைப் பெற முடியவில்லை. பின்னர் மீண்டும் முயற்சிக்கவும்.",
+    "te": "క్షమించండి, ప్రస్తుతం ఆ సమాచారాన్ని పొందలేకపోయాను. దయచేసి తర్వాత మళ్లీ ప్రయత్నించండి.",
+    "mr": "क्षमस्व, मला आत्ता ही माहिती मिळू शकली नाही. कृपया नंतर पुन्हा प्रयत्न करा.",
+    "bn": "দুঃখিত, এই মুহূর্তে আমি সেই তথ্য পেতে পারিনি। অনুগ্রহ করে পরে আবার চেষ্টা করুন।"
+}
+
+
+@dataclass
+class SpeechTurn:
+    """Result of one turn; audio_ref is None when the reply must be spoken with <Say>"""
+    turn: int
+    reply: str
+    audio_ref: Optional[str] = None
+    fallback: Optional[str] = None  # llm_timeout, llm_error, tts_timeout, tts_failed
+    timing: Dict[str, Any] = field(default_factory=dict)
+
+
+class SpeechTurnService:
+    """
+    Turns of interactive <Gather> calls
+    
+    Twilio gives up on a webhook after 15 seconds, so each turn runs under
+    `budget_seconds`: the LLM may use the budget minus `tts_reserve_seconds`,
+    synthesis gets what is left, and a stage that runs out falls back to a
+    <Say> of the reply (or of a canned apology if the LLM missed).
+    """
+    
+    def __init__(self, budget_seconds: float, tts_reserve_seconds: float):
+        self.budget_seconds = budget_seconds
+        self.tts_reserve_seconds = tts_reserve_seconds
+        self.latency = LatencyStats(LATENCY_STAGES)
+        
+        self.turns = 0
+        self.fallbacks: Dict[str, int] = {}
+    
+    async def respond(self, session: CallSession, speech: str, confidence: Optional[float] = None) -> SpeechTurn:
+        """Answer the caller's speech and record both sides in the session's messages"""
+        started = time.monotonic()
+        deadline = started + self.budget_seconds
+        turn = SpeechTurn(turn=sum(1 for m in session.messages if m["role"] == "user") + 1, reply="")
+        
+        try:
+            turn.reply = await asyncio.wait_for(
+                groq_service.generate_bfsi_response(
+                    user_query=speech,
+                    context="",
+                    sector=session.sector,
+                    language=session.language,
+                    history=session.conversation_history()
+                ),
+                timeout=max(0.1, deadline - time.monotonic() - self.tts_reserve_seconds)
+            )
+        except asyncio.TimeoutError:
+            turn.fallback = "llm_timeout"
+        except Exception as e:
+            logger.error(f"❌ Gather turn LLM failed for call {session.call_id}: {str(e)}")
+            turn.fallback = "llm_error"
+        answered = time.monotonic()
+        turn.timing["llm_ms"] = round((answered - started) * 1000)
+        
+        if turn.fallback is None:
+            await self._synthesize(session, turn, deadline)
+        else:
+            turn.reply = FALLBACK_REPLIES.get(session.language, FALLBACK_REPLIES["en"])
+        
+        turn.timing["total_ms"] = round((time.monotonic() - started) * 1000)
+        turn.timing["budget_ms"] = round(self.budget_seconds * 1000)
+        
+        self.turns += 1
+        self.latency.record(turn.timing)
+        if turn.fallback:
+            self.fallbacks[turn.fallback] = self.fallbacks.get(turn.fallback, 0) + 1
+        
+        logger.info(
+            f"🗣️ Call {session.call_id} gather turn {turn.turn}: total {turn.timing['total_ms']}ms "
+            f"(llm {turn.timing['llm_ms']}, tts {turn.timing.get('tts_ms')}, store {turn.timing.get('store_ms')})"
+            + (f" fallback={turn.fallback}" if turn.fallback else "")
+        )
+        
+        await call_session_store.update(session.call_id, messages=session.messages + [
+            {"role": "user", "content": speech, "confidence": confidence},
+            {"role": "assistant", "content": turn.reply, "timing": turn.timing, "fallback": turn.fallback}
+        ])
+        return turn
+    
+    async def _synthesize(self, session: CallSession, turn: SpeechTurn, deadline: float):
+        lang_config = sarvam_service.get_language_config(session.language)
+        started = time.monotonic()
+        try:
+            audio_bytes = await asyncio.wait_for(
+                sarvam_service.text_to_speech(
+                    text=turn.reply,
+                    language=session.language,
+                    speaker=lang_config.get("speaker", "meera"),
+                    encoding=settings.CALL_AUDIO_ENCODING
+                ),
+                timeout=max(0.1, deadline - started)
+            )
+        except asyncio.TimeoutError:
+            turn.fallback = "tts_timeout"
+            return
+        except Exception as e:
+            logger.error(f"❌ Gather turn TTS failed for call {session.call_id}: {str(e)}")
+            turn.fallback = "tts_failed"
+            return
+        finally:
+            turn.timing["tts_ms"] = round((time.monotonic() - started) * 1000)
+        
+        # Demo-mode audio (Sarvam unavailable) is an empty WAV header
+        if len(audio_bytes) < 100:
+            turn.fallback = "tts_failed"
+            return
+        
+        stored = time.monotonic()
+        turn.audio_ref = await audio_store.put(audio_bytes)
+        turn.timing["store_ms"] = round((time.monotonic() - stored) * 1000)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "fallbacks": dict(self.fallbacks),
+            "budget_seconds": self.budget_seconds,
+            "recent_turns": len(self.latency),
+            "latency_ms": self.latency.summary()
+        }
+
+
+# Create singleton instance
+speech_turn_service = SpeechTurnService(
+    budget_seconds=settings.GATHER_TURN_BUDGET_SECONDS,
+    tts_reserve_seconds=settings.GATHER_TTS_RESERVE_SECONDS
+)
+
+
+# Export
+__all__ = ["speech_turn_service", "SpeechTurnService", "SpeechTurn"]
@@ -0,0 +1,158 @@
+"""
+TTS Audio Cache
+Disk-backed, content-addressed cache for synthesized speech
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class TTSCache:
+    """Size-bounded LRU cache of TTS audio files keyed by synthesis parameters"""
+    
+    def __init__(self, cache_dir: str, max_bytes: int, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        
+        # key -> file size, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Hash synthesis parameters into a stable cache key"""
+        canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio or None"""
+        if not self.enabled:
+            return None
+        self._ensure_loaded()
+        
+        if key not in self._index:
+            self.misses += 1
+            return None
+        
+        try:
+            audio_bytes = await asyncio.to_thread(self._read, self._path(key))
+        except OSError:
+            # File vanished underneath us; treat as a miss
+            self._forget(key)
+            self.misses += 1
+            return None
+        
+        self._index.move_to_end(key)
+        self.hits += 1
+        return audio_bytes
+    
+    async def put(self, key: str, audio_bytes: bytes):
+        """Store audio and evict least recently used entries over the size bound"""
+        if not self.enabled or len(audio_bytes) > self.max_bytes:
+            return
+        self._ensure_loaded()
+        
+        try:
+            await asyncio.to_thread(self._write, self._path(key), audio_bytes)
+        except OSError as e:
+            logger.warning(f"⚠️ TTS cache write failed: {str(e)}")
+            return
+        
+        self._forget(key)
+        self._index[key] = len(audio_bytes)
+        self._total_bytes += len(audio_bytes)
+        self._evict()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.wav"
+    
+    def _ensure_loaded(self):
+        """Rebuild the LRU index from disk, oldest access time first"""
+        if self._loaded:
+            return
+        self._loaded = True
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.cache_dir.glob("*/*.wav"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        
+        self._evict()
+        logger.info(f"✅ TTS cache loaded: {len(self._index)} entries, {self._total_bytes} bytes")
+    
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+    
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _read(path: Path) -> bytes:
+        data = path.read_bytes()
+        # Persist recency so the LRU order survives restarts
+        os.utime(path)
+        return data
+    
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+# Create singleton instance
+tts_cache = TTSCache(
+    cache_dir=settings.TTS_CACHE_DIR,
+    max_bytes=settings.TTS_CACHE_MAX_MB * 1024 * 1024,
+    enabled=settings.TTS_CACHE_ENABLED
+)
+
+
+# Export
+__all__ = ["tts_cache", "TTSCache"]
@@ -0,0 +1,153 @@
+"""
+Async Twilio REST Transport
+Non-blocking Twilio API access over a shared keep-alive HTTP pool
+"""
+
+import httpx
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class TwilioAPIError(Exception):
+    """Error response from the Twilio REST API"""
+    
+    def __init__(self, status_code: int, message: str, code: Optional[int] = None):
+        super().__init__(f"Twilio API error {status_code}: {message}")
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+
+
+class TwilioResource:
+    """Attribute view over a Twilio JSON resource (call, message)"""
+    
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+    
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._data)
+
+
+class AsyncTwilioClient:
+    """Twilio REST client backed by one pooled httpx.AsyncClient"""
+    
+    API_VERSION = "2010-04-01"
+    
+    def __init__(self):
+        self.account_sid = settings.TWILIO_ACCOUNT_SID
+        self.auth_token = settings.TWILIO_AUTH_TOKEN
+        self.api_url = settings.TWILIO_API_URL.rstrip("/")
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def start(self):
+        """Open the shared connection pool (called from the app lifespan)"""
+        if self._client is not None:
+            return
+        
+        self._client = httpx.AsyncClient(
+            base_url=f"{self.api_url}/{self.API_VERSION}/Accounts/{self.account_sid}",
+            auth=(self.account_sid, self.auth_token),
+            limits=httpx.Limits(
+                max_connections=settings.TWILIO_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.TWILIO_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(settings.TWILIO_HTTP_TIMEOUT, connect=5.0)
+        )
+        logger.info(f"✅ Twilio HTTP pool opened ({settings.TWILIO_HTTP_MAX_CONNECTIONS} connections)")
+    
+    async def aclose(self):
+        """Close the shared connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("🛑 Twilio HTTP pool closed")
+    
+    async def create_call(
+        self,
+        to: str,
+        from_: str,
+        url: str,
+        method: str = "POST",
+        status_callback: Optional[str] = None,
+        status_callback_event: Optional[List[str]] = None
+    ) -> TwilioResource:
+        """
+        Create an outbound call
+        
+        Args:
+            to: Recipient phone number
+            from_: Twilio caller ID
+            url: TwiML URL Twilio fetches when the call connects
+            method: HTTP method for the TwiML URL
+            status_callback: Status callback URL
+            status_callback_event: Events that trigger the status callback
+        
+        Returns:
+            Created call resource (sid, status, ...)
+        """
+        data: Dict[str, Any] = {"To": to, "From": from_, "Url": url, "Method": method}
+        if status_callback:
+            data["StatusCallback"] = status_callback
+            data["StatusCallbackMethod"] = "POST"
+        if status_callback_event:
+            data["StatusCallbackEvent"] = status_callback_event
+        
+        return await self._post("/Calls.json", data)
+    
+    async def create_message(
+        self,
+        to: str,
+        from_: str,
+        body: str,
+        media_url: Optional[List[str]] = None
+    ) -> TwilioResource:
+        """
+        Send an SMS or WhatsApp message
+        
+        Args:
+            to: Recipient (prefix with whatsapp: for WhatsApp)
+            from_: Sender number
+            body: Message text
+            media_url: Optional media URLs
+        
+        Returns:
+            Created message resource (sid, status, ...)
+        """
+        data: Dict[str, Any] = {"To": to, "From": from_, "Body": body}
+        if media_url:
+            data["MediaUrl"] = media_url
+        
+        return await self._post("/Messages.json", data)
+    
+    async def _post(self, path: str, data: Dict[str, Any]) -> TwilioResource:
+        if self._client is None:
+            # Scripts and tests may use the client without the app lifespan
+            await self.start()
+        
+        response = await self._client.post(path, data=data)
+        
+        if response.status_code >= 400:
+            try:
+                error = response.json()
+            except ValueError:
+                error = {"message": response.text[:500]}
+            raise TwilioAPIError(response.status_code, error.get("message", ""), error.get("code"))
+        
+        return TwilioResource(response.json())
+
+
+# Create singleton instance
+twilio_rest_client = AsyncTwilioClient()
+
+
+# Export
+__all__ = ["twilio_rest_client", "AsyncTwilioClient", "TwilioAPIError", "TwilioResource"]
@@ -3,7 +3,6 @@ Twilio WhatsApp Service
 WhatsApp Business API integration for customer messaging
 """
 
-from twilio.rest import Client
 from twilio.twiml.messaging_response import MessagingResponse
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -12,21 +11,21 @@ import json
 from app.core.config import settings
 from app.core.logging import logger, audit_log
 from app.core.security import ConsentManager, PIIMasker
+from app.core.session_backend import session_backend
+from app.services.twilio_rest import twilio_rest_client
 
 
 class TwilioWhatsAppService:
     """Twilio WhatsApp Business API service"""
     
     def __init__(self):
-        self.client = Client(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN
-        )
+        self.client = twilio_rest_client
         self.whatsapp_number = settings.TWILIO_WHATSAPP_NUMBER
         self.sms_number = settings.TWILIO_PHONE_NUMBER
         
-        # Session storage (use Redis in production)
-        self.sessions = {}
+        # Session storage (memory, sqlite or redis backend)
+        self.sessions = session_backend
+        self.session_ttl_seconds = settings.WHATSAPP_SESSION_TTL_SECONDS
     
     async def send_sms(
         self,
@@ -49,7 +48,7 @@ class TwilioWhatsAppService:
             logger.info(f"   Message preview: {message[:100]}...")
             
             # Send SMS via Twilio
-            twilio_message = self.client.messages.create(
+            twilio_message = await self.client.create_message(
                 from_=self.sms_number,
                 to=to_number,
                 body=message
@@ -104,9 +103,9 @@ class TwilioWhatsAppService:
         
         # Check consent
         user_id = to_number.replace("whatsapp:", "")
-        if not ConsentManager.check_consent(user_id, "whatsapp"):
+        if not await ConsentManager.check_consent(user_id, "whatsapp"):
             logger.warning(f"No WhatsApp consent for {user_id}")
-            ConsentManager.record_consent(user_id, "whatsapp", False)
+            await ConsentManager.record_consent(user_id, "whatsapp", False)
         
         logger.info(f"📱 Sending WhatsApp message to {user_id}")
         logger.info(f"   From: {self.whatsapp_number}")
@@ -122,7 +121,7 @@ class TwilioWhatsAppService:
         if media_url:
             message_params["media_url"] = [media_url]
         
-        twilio_message = self.client.messages.create(**message_params)
+        twilio_message = await self.client.create_message(**message_params)
         
         # Audit log
         audit_log(
@@ -177,7 +176,7 @@ class TwilioWhatsAppService:
             )
             
             # Get or create session
-            session = self._get_session(user_id)
+            session = await self._get_session(user_id)
             
             # Update session
             session["messages"].append({
@@ -185,15 +184,16 @@ class TwilioWhatsAppService:
                 "content": message_body,
                 "timestamp": datetime.utcnow().isoformat()
             })
+            await self._save_session(user_id, session)
             
             # Check for opt-in keywords
             if self._is_opt_in_message(message_body):
-                ConsentManager.record_consent(user_id, "whatsapp", True)
+                await ConsentManager.record_consent(user_id, "whatsapp", True)
                 return "Thank you for opting in! How can I help you today?"
             
             # Check for opt-out keywords
             if self._is_opt_out_message(message_body):
-                ConsentManager.record_consent(user_id, "whatsapp", False)
+                await ConsentManager.record_consent(user_id, "whatsapp", False)
                 return "You have been opted out. Reply START to opt back in."
             
             logger.info(f"📥 WhatsApp message from {user_id}: {message_body[:50]}...")
@@ -219,10 +219,11 @@ class TwilioWhatsAppService:
         response.message(message)
         return str(response)
     
-    def _get_session(self, user_id: str) -> Dict[str, Any]:
+    async def _get_session(self, user_id: str) -> Dict[str, Any]:
         """Get or create user session"""
-        if user_id not in self.sessions:
-            self.sessions[user_id] = {
+        session = await self.sessions.get("whatsapp", user_id)
+        if session is None:
+            session = {
                 "user_id": user_id,
                 "messages": [],
                 "context": {},
@@ -230,9 +231,14 @@ class TwilioWhatsAppService:
                 "last_activity": datetime.utcnow().isoformat()
             }
         else:
-            self.sessions[user_id]["last_activity"] = datetime.utcnow().isoformat()
+            session["last_activity"] = datetime.utcnow().isoformat()
         
-        return self.sessions[user_id]
+        await self._save_session(user_id, session)
+        return session
+    
+    async def _save_session(self, user_id: str, session: Dict[str, Any]):
+        """Write a session back to the shared backend"""
+        await self.sessions.set("whatsapp", user_id, session, ttl_seconds=self.session_ttl_seconds)
     
     def _is_opt_in_message(self, message: str) -> bool:
         """Check if message is opt-in"""
@@ -0,0 +1,26 @@
+"""
+Pytest configuration
+Dummy provider credentials and throwaway storage so app modules import without a .env
+"""
+
+import os
+import tempfile
+
+_STORAGE_DIR = tempfile.mkdtemp(prefix="bfsi-tests-")
+
+for name, value in {
+    "GROQ_API_KEY": "test",
+    "SARVAM_API_KEY": "test",
+    "TWILIO_ACCOUNT_SID": "ACtest",
+    "TWILIO_AUTH_TOKEN": "test",
+    "TWILIO_WHATSAPP_NUMBER": "whatsapp:+10000000000",
+    "TWILIO_PHONE_NUMBER": "+10000000000",
+    "SESSION_BACKEND": "memory",
+    "TTS_CACHE_DIR": os.path.join(_STORAGE_DIR, "tts_cache"),
+    "AUDIO_STORE_DIR": os.path.join(_STORAGE_DIR, "audio"),
+    "SESSION_SQLITE_PATH": os.path.join(_STORAGE_DIR, "sessions.db")
+}.items():
+    os.environ.setdefault(name, value)
+
+# Manual diagnostic script that calls the real Sarvam API
+collect_ignore = ["test_sarvam.py"]
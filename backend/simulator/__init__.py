@@ -0,0 +1,4 @@
+"""
+Provider Simulator
+Local Twilio, Sarvam AI and Groq stand-ins (run with: python -m simulator)
+"""
@@ -0,0 +1,11 @@
+"""
+Run the provider simulator: python -m simulator
+"""
+
+import uvicorn
+
+from simulator.config import sim_settings
+
+
+if __name__ == "__main__":
+    uvicorn.run("simulator.app:app", host=sim_settings.HOST, port=sim_settings.PORT)
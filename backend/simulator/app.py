@@ -0,0 +1,438 @@
+"""
+Provider Simulator
+Local stand-in for the Twilio, Sarvam AI and Groq APIs for offline and load testing
+"""
+
+import asyncio
+import base64
+import io
+import json
+import math
+import random
+import struct
+import time
+import uuid
+import wave
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+
+from simulator.config import sim_settings, SimulatorSettings
+
+
+PROVIDERS = ("twilio", "sarvam", "groq")
+
+# Canned transcripts returned by the STT simulator
+STT_TRANSCRIPTS = {
+    "en": "When is my next SIP installment due?",
+    "hi": "मेरी अगली SIP किस्त कब कटेगी?",
+    "ta": "என் அடுத்த SIP தவணை எப்போது?",
+    "te": "నా తదుపరి SIP వాయిదా ఎప్పుడు?",
+    "mr": "माझा पुढचा SIP हप्ता कधी आहे?",
+    "bn": "আমার পরের SIP কিস্তি কবে?"
+}
+
+SIM_ANSWER = (
+    "Your next SIP installment will be debited on the scheduled date. "
+    "Please keep sufficient balance in your linked bank account. "
+    "You can also check the details in your mutual fund statement. "
+    "Is there anything else I can help you with?"
+)
+
+# Sarvam's default speech_sample_rate and the rates it accepts
+TTS_SAMPLE_RATE = 22050
+TTS_SAMPLE_RATES = (8000, 16000, 22050, 24000)
+
+
+class TokenBucket:
+    """Per-provider request rate limit"""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = max(rate, 1.0)
+        self.updated = time.monotonic()
+    
+    def allow(self) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class SimulatorState:
+    """Counters, rate limiters and the callback HTTP client"""
+    
+    def __init__(self):
+        self.counters: Dict[str, Dict[str, int]] = {
+            provider: {"requests": 0, "errors": 0, "throttled": 0} for provider in PROVIDERS
+        }
+        self.calls: Dict[str, int] = {"created": 0, "callbacks_sent": 0, "callbacks_failed": 0}
+        self.limiters: Dict[str, TokenBucket] = {}
+        self.client: Optional[httpx.AsyncClient] = None
+        self.tasks: Set[asyncio.Task] = set()
+        self.reset_limiters()
+    
+    def reset_limiters(self):
+        self.limiters = {
+            "twilio": TokenBucket(sim_settings.TWILIO_CPS),
+            "sarvam": TokenBucket(sim_settings.SARVAM_RPS),
+            "groq": TokenBucket(sim_settings.GROQ_RPS)
+        }
+
+
+state = SimulatorState()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    state.client = httpx.AsyncClient(timeout=10.0)
+    yield
+    for task in list(state.tasks):
+        task.cancel()
+    await asyncio.gather(*state.tasks, return_exceptions=True)
+    await state.client.aclose()
+
+
+app = FastAPI(title="BFSI Provider Simulator", lifespan=lifespan)
+
+
+# ==================== FAULT INJECTION ====================
+
+async def _simulate(provider: str, latency_setting: str, error_rate: float) -> Optional[JSONResponse]:
+    """Apply latency, rate limiting and error injection; returns an error response or None"""
+    counters = state.counters[provider]
+    counters["requests"] += 1
+    
+    if not state.limiters[provider].allow():
+        counters["throttled"] += 1
+        return _error_response(provider, 429, "Too Many Requests")
+    
+    median_ms, p99_ms = sim_settings.latency(latency_setting)
+    await asyncio.sleep(_sample_latency(median_ms, p99_ms) / 1000)
+    
+    if random.random() < error_rate:
+        counters["errors"] += 1
+        return _error_response(provider, 500, "Simulated upstream failure")
+    
+    return None
+
+
+def _sample_latency(median_ms: float, p99_ms: float) -> float:
+    """Log-normal sample with the given median and 99th percentile"""
+    if median_ms <= 0:
+        return 0.0
+    sigma = math.log(p99_ms / median_ms) / 2.326 if p99_ms > median_ms else 0.0
+    return random.lognormvariate(math.log(median_ms), sigma)
+
+
+def _error_response(provider: str, status_code: int, message: str) -> JSONResponse:
+    if provider == "twilio":
+        code = 20429 if status_code == 429 else 20500
+        body = {"code": code, "message": message, "status": status_code}
+    elif provider == "groq":
+        body = {"error": {"message": message, "type": "rate_limit_exceeded" if status_code == 429 else "server_error"}}
+    else:
+        body = {"error": {"message": message, "code": status_code}}
+    return JSONResponse(status_code=status_code, content=body)
+
+
+# ==================== TWILIO ====================
+
+@app.post("/2010-04-01/Accounts/{account_sid}/Calls.json")
+async def twilio_create_call(account_sid: str, request: Request):
+    """Create a call and play out its lifecycle through status callbacks"""
+    error = await _simulate("twilio", "TWILIO_LATENCY", sim_settings.TWILIO_ERROR_RATE)
+    if error:
+        return error
+    
+    form = await request.form()
+    call = {
+        "sid": f"CA{uuid.uuid4().hex}",
+        "account_sid": account_sid,
+        "to": form.get("To"),
+        "from": form.get("From"),
+        "status": "queued",
+        "direction": "outbound-api",
+        "api_version": "2010-04-01",
+        "date_created": time.strftime("%a, %d %b %Y %H:%M:%S +0000", time.gmtime())
+    }
+    state.calls["created"] += 1
+    
+    task = asyncio.create_task(_play_call(
+        call,
+        twiml_url=form.get("Url"),
+        callback_url=form.get("StatusCallback"),
+        events=set(form.getlist("StatusCallbackEvent")) or {"completed"}
+    ))
+    state.tasks.add(task)
+    task.add_done_callback(state.tasks.discard)
+    
+    return JSONResponse(status_code=201, content=call)
+
+
+@app.post("/2010-04-01/Accounts/{account_sid}/Messages.json")
+async def twilio_create_message(account_sid: str, request: Request):
+    """Accept an SMS/WhatsApp message"""
+    error = await _simulate("twilio", "TWILIO_LATENCY", sim_settings.TWILIO_ERROR_RATE)
+    if error:
+        return error
+    
+    form = await request.form()
+    return JSONResponse(status_code=201, content={
+        "sid": f"SM{uuid.uuid4().hex}",
+        "account_sid": account_sid,
+        "to": form.get("To"),
+        "from": form.get("From"),
+        "body": form.get("Body"),
+        "status": "queued",
+        "num_media": str(len(form.getlist("MediaUrl")))
+    })
+
+
+async def _play_call(call: Dict[str, Any], twiml_url: Optional[str], callback_url: Optional[str], events: set):
+    """Walk a call through initiated -> ringing -> outcome, firing callbacks like Twilio"""
+    await asyncio.sleep(0.2)
+    if "initiated" in events:
+        await _send_status(call, callback_url, "initiated")
+    
+    if "ringing" in events:
+        await _send_status(call, callback_url, "ringing")
+    
+    outcomes = sim_settings.call_outcomes()
+    outcome = random.choices(list(outcomes), weights=list(outcomes.values()))[0]
+    await asyncio.sleep(sim_settings.CALL_RING_SECONDS * random.uniform(0.5, 1.5))
+    
+    if outcome != "completed":
+        # no-answer / busy / failed are delivered with the 'completed' event
+        if "completed" in events:
+            await _send_status(call, callback_url, outcome)
+        return
+    
+    if "answered" in events:
+        await _send_status(call, callback_url, "in-progress")
+    if sim_settings.FETCH_TWIML and twiml_url:
+        await _post_form(twiml_url, _call_params(call, "in-progress"))
+    
+    talk_seconds = sim_settings.CALL_TALK_SECONDS * random.uniform(0.5, 1.5)
+    await asyncio.sleep(talk_seconds)
+    if "completed" in events:
+        await _send_status(call, callback_url, "completed", CallDuration=str(int(talk_seconds)))
+
+
+async def _send_status(call: Dict[str, Any], callback_url: Optional[str], status: str, **extra: str):
+    call["status"] = status
+    if callback_url:
+        await _post_form(callback_url, {**_call_params(call, status), **extra})
+
+
+def _call_params(call: Dict[str, Any], status: str) -> Dict[str, str]:
+    return {
+        "AccountSid": call["account_sid"],
+        "CallSid": call["sid"],
+        "CallStatus": status,
+        "From": call["from"] or "",
+        "To": call["to"] or "",
+        "Direction": call["direction"],
+        "ApiVersion": call["api_version"],
+        "Timestamp": time.strftime("%a, %d %b %Y %H:%M:%S +0000", time.gmtime())
+    }
+
+
+async def _post_form(url: str, data: Dict[str, str]):
+    try:
+        response = await state.client.post(url, data=data)
+        response.raise_for_status()
+        state.calls["callbacks_sent"] += 1
+    except httpx.HTTPError:
+        state.calls["callbacks_failed"] += 1
+
+
+# ==================== SARVAM AI ====================
+
+@app.post("/text-to-speech")
+@app.post("/v1/text-to-speech")
+async def sarvam_text_to_speech(request: Request):
+    """Return a WAV at the requested speech_sample_rate whose duration scales with the text length"""
+    error = await _simulate("sarvam", "SARVAM_TTS_LATENCY", sim_settings.SARVAM_ERROR_RATE)
+    if error:
+        return error
+    
+    payload = await request.json()
+    text = payload.get("text") or (payload.get("inputs") or [""])[0]
+    seconds = max(0.5, len(text) * 0.06 / float(payload.get("speed") or payload.get("pace") or 1.0))
+    
+    sample_rate = int(payload.get("speech_sample_rate") or TTS_SAMPLE_RATE)
+    if sample_rate not in TTS_SAMPLE_RATES:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"speech_sample_rate must be one of {', '.join(map(str, TTS_SAMPLE_RATES))}"}
+        )
+    
+    return {
+        "request_id": uuid.uuid4().hex,
+        "audios": [base64.b64encode(_tone_wav(seconds, sample_rate)).decode("ascii")]
+    }
+
+
+@app.post("/speech-to-text")
+@app.post("/v1/speech-to-text")
+async def sarvam_speech_to_text(request: Request):
+    """Return a canned transcript in the requested language"""
+    error = await _simulate("sarvam", "SARVAM_STT_LATENCY", sim_settings.SARVAM_ERROR_RATE)
+    if error:
+        return error
+    
+    if request.headers.get("content-type", "").startswith("application/json"):
+        language = (await request.json()).get("language_code", "en")
+    else:
+        language = (await request.form()).get("language_code", "en")
+    language = language.split("-")[0]
+    
+    return {
+        "request_id": uuid.uuid4().hex,
+        "transcript": STT_TRANSCRIPTS.get(language, STT_TRANSCRIPTS["en"]),
+        "language_code": language,
+        "confidence": 0.92
+    }
+
+
+def _tone_wav(seconds: float, sample_rate: int = TTS_SAMPLE_RATE) -> bytes:
+    """Quiet tone of about 225 Hz (rounded to a whole number of samples per cycle)"""
+    period = sample_rate // 225
+    cycle = b"".join(
+        struct.pack("<h", int(1500 * math.sin(2 * math.pi * i / period))) for i in range(period)
+    )
+    frames = cycle * int(seconds * sample_rate / period)
+    
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+# ==================== GROQ ====================
+
+@app.post("/openai/v1/chat/completions")
+async def groq_chat_completions(request: Request):
+    """OpenAI-compatible chat completion, with optional SSE streaming"""
+    error = await _simulate("groq", "GROQ_LATENCY", sim_settings.GROQ_ERROR_RATE)
+    if error:
+        return error
+    
+    payload = await request.json()
+    model = payload.get("model", "simulated")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    
+    if (payload.get("response_format") or {}).get("type") == "json_object":
+        content = json.dumps({
+            "intent": "general_inquiry",
+            "confidence": 0.9,
+            "entities": {},
+            "requires_human": False
+        })
+    else:
+        content = SIM_ANSWER
+    
+    prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in payload.get("messages", []))
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": len(content.split()),
+        "total_tokens": prompt_tokens + len(content.split())
+    }
+    
+    if payload.get("stream"):
+        return StreamingResponse(
+            _stream_completion(completion_id, model, content, usage),
+            media_type="text/event-stream"
+        )
+    
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": usage
+    }
+
+
+async def _stream_completion(completion_id: str, model: str, content: str, usage: Dict[str, int]):
+    words = content.split(" ")
+    for index, word in enumerate(words):
+        delta = {"content": word if index == len(words) - 1 else f"{word} "}
+        if index == 0:
+            delta["role"] = "assistant"
+        yield _sse(_chunk(completion_id, model, delta, None))
+        await asyncio.sleep(sim_settings.GROQ_TOKEN_LATENCY_MS / 1000)
+    
+    final = _chunk(completion_id, model, {}, "stop")
+    final["x_groq"] = {"usage": usage}
+    yield _sse(final)
+    yield "data: [DONE]\n\n"
+
+
+def _chunk(completion_id: str, model: str, delta: Dict[str, Any], finish_reason: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    }
+
+
+def _sse(data: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# ==================== SIMULATOR CONTROL ====================
+
+@app.get("/_sim/stats")
+async def simulator_stats():
+    """Request, error and throttle counters per provider"""
+    return {
+        "providers": state.counters,
+        "calls": {**state.calls, "active": len(state.tasks)}
+    }
+
+
+@app.post("/_sim/config")
+async def update_simulator_config(changes: Dict[str, Any]):
+    """Change simulator settings at runtime, e.g. {"TWILIO_ERROR_RATE": 0.1}"""
+    unknown: List[str] = [name for name in changes if name not in type(sim_settings).model_fields]
+    if unknown:
+        return JSONResponse(status_code=400, content={"error": f"Unknown settings: {', '.join(unknown)}"})
+    
+    # Validate against the settings model before touching the live instance
+    try:
+        validated = SimulatorSettings.model_validate({**sim_settings.model_dump(), **changes})
+    except ValidationError as e:
+        errors = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+        return JSONResponse(status_code=400, content={"error": f"Invalid settings: {errors}"})
+    
+    for name in changes:
+        setattr(sim_settings, name, getattr(validated, name))
+    state.reset_limiters()
+    
+    return sim_settings.model_dump()
+
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy", "service": "BFSI Provider Simulator"}
@@ -0,0 +1,88 @@
+"""
+Simulator Configuration
+Latency, error and rate-limit knobs for the provider simulator (SIM_* env vars)
+"""
+
+from typing import Dict, Tuple
+
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings
+
+
+class SimulatorSettings(BaseSettings):
+    """Simulator settings; all can also be changed at runtime via POST /_sim/config"""
+    
+    HOST: str = "0.0.0.0"
+    PORT: int = Field(default=8100, ge=1, le=65535)
+    
+    # Latency distributions as "median_ms,p99_ms" (log-normal)
+    TWILIO_LATENCY: str = "80,400"
+    SARVAM_TTS_LATENCY: str = "600,2500"
+    SARVAM_STT_LATENCY: str = "400,1500"
+    GROQ_LATENCY: str = "300,1500"
+    GROQ_TOKEN_LATENCY_MS: float = Field(default=15, ge=0)  # Per streamed chunk
+    
+    # Fraction of requests answered with a 500
+    TWILIO_ERROR_RATE: float = Field(default=0.0, ge=0, le=1)
+    SARVAM_ERROR_RATE: float = Field(default=0.0, ge=0, le=1)
+    GROQ_ERROR_RATE: float = Field(default=0.0, ge=0, le=1)
+    
+    # Requests per second before answering 429 (0 = unlimited)
+    TWILIO_CPS: float = Field(default=1.0, ge=0)
+    SARVAM_RPS: float = Field(default=0.0, ge=0)
+    GROQ_RPS: float = Field(default=0.0, ge=0)
+    
+    # Simulated call lifecycle
+    CALL_OUTCOMES: str = "completed:0.7,no-answer:0.15,busy:0.1,failed:0.05"
+    CALL_RING_SECONDS: float = Field(default=3.0, ge=0)
+    CALL_TALK_SECONDS: float = Field(default=20.0, ge=0)
+    FETCH_TWIML: bool = True
+    
+    model_config = {
+        "env_prefix": "SIM_",
+        "env_file": ".env.simulator",
+        "case_sensitive": True,
+        "extra": "ignore",
+        "validate_assignment": True
+    }
+    
+    @field_validator("TWILIO_LATENCY", "SARVAM_TTS_LATENCY", "SARVAM_STT_LATENCY", "GROQ_LATENCY")
+    @classmethod
+    def _check_latency(cls, value: str) -> str:
+        parts = value.split(",")
+        if len(parts) != 2 or any(float(part) < 0 for part in parts):
+            raise ValueError("expected 'median_ms,p99_ms' with non-negative numbers")
+        return value
+    
+    @field_validator("CALL_OUTCOMES")
+    @classmethod
+    def _check_outcomes(cls, value: str) -> str:
+        weights = []
+        for item in value.split(","):
+            status, weight = item.split(":")
+            if not status.strip() or float(weight) < 0:
+                raise ValueError("expected 'status:weight,...' with non-negative weights")
+            weights.append(float(weight))
+        if not sum(weights):
+            raise ValueError("at least one outcome needs a positive weight")
+        return value
+    
+    def latency(self, name: str) -> Tuple[float, float]:
+        """(median_ms, p99_ms) for a latency setting"""
+        median, p99 = (float(part) for part in getattr(self, name).split(","))
+        return median, max(p99, median)
+    
+    def call_outcomes(self) -> Dict[str, float]:
+        outcomes = {}
+        for item in self.CALL_OUTCOMES.split(","):
+            status, weight = item.split(":")
+            outcomes[status.strip()] = float(weight)
+        return outcomes
+
+
+# Create global settings instance
+sim_settings = SimulatorSettings()
+
+
+# Export
+__all__ = ["sim_settings", "SimulatorSettings"]
@@ -0,0 +1,205 @@
+"""
+Media Stream Replay Client
+Plays recorded caller audio into /api/voice/stream/{call_id} the way Twilio Media Streams does
+
+    python -m simulator.replay_stream --call-id <id> question1.wav question2.wav
+    python -m simulator.replay_stream --create-call +919876543210 --language hi
+
+Each WAV (any rate, 16-bit PCM or μ-law) is one caller turn, followed by
+silence so the server's VAD closes the utterance. Reports per-turn latency
+from the end of caller audio to the first reply frame, and can save the
+reply audio with --out.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import time
+import uuid
+from typing import List, Optional
+
+import httpx
+import numpy as np
+import websockets
+
+from app.services.audio_utils import decode_mulaw, encode_mulaw, telephony_mulaw, write_wav
+
+
+FRAME_BYTES = 160  # 20 ms of 8 kHz μ-law
+FRAME_SECONDS = 0.02
+MULAW_SILENCE_FRAME = b"\xff" * FRAME_BYTES
+
+
+def synthetic_utterance(seconds: float = 1.2) -> bytes:
+    """Voiced-enough tone bursts for runs without recorded audio"""
+    t = np.arange(int(seconds * 8000)) / 8000
+    envelope = 0.5 + 0.5 * np.sign(np.sin(2 * math.pi * 3 * t))
+    samples = (6000 * envelope * np.sin(2 * math.pi * 300 * t)).astype("<i2")
+    return encode_mulaw(samples.tobytes())
+
+
+class ReplayClient:
+    """Speaks the Twilio side of the Media Streams protocol"""
+
+    def __init__(self, url: str, realtime: bool, trailing_silence_ms: int, turn_timeout: float):
+        self.url = url
+        self.realtime = realtime
+        self.trailing_silence_frames = max(1, trailing_silence_ms // 20)
+        self.turn_timeout = turn_timeout
+
+        self.stream_sid = "MZ" + uuid.uuid4().hex
+        self.call_sid = "CA" + uuid.uuid4().hex
+        self.sequence = 0
+        self.chunk = 0
+        self.received = bytearray()
+
+    async def run(self, utterances: List[bytes]) -> List[dict]:
+        results = []
+        async with websockets.connect(self.url, max_size=None) as ws:
+            await self._send(ws, {"event": "connected", "protocol": "Call", "version": "1.0.0"})
+            await self._send(ws, {
+                "event": "start",
+                "streamSid": self.stream_sid,
+                "start": {
+                    "streamSid": self.stream_sid,
+                    "callSid": self.call_sid,
+                    "tracks": ["inbound"],
+                    "customParameters": {},
+                    "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": 8000, "channels": 1}
+                }
+            })
+
+            for index, utterance in enumerate(utterances, start=1):
+                speech_end = await self._speak(ws, utterance)
+                result = await self._await_reply(ws, speech_end)
+                result["turn"] = index
+                results.append(result)
+                print(
+                    f"turn {index}: first reply audio after {result['first_audio_ms']} ms, "
+                    f"{result['reply_seconds']} s of audio"
+                    + ("" if result["completed"] else " (timed out)")
+                )
+
+            await self._send(ws, {"event": "stop", "streamSid": self.stream_sid, "stop": {"callSid": self.call_sid}})
+        return results
+
+    async def _speak(self, ws, mulaw: bytes) -> float:
+        """Send caller audio then trailing silence; returns when the last voiced frame went out"""
+        frames = [mulaw[i:i + FRAME_BYTES] for i in range(0, len(mulaw), FRAME_BYTES)]
+        speech_end = time.monotonic()
+        for index, frame in enumerate(frames + [MULAW_SILENCE_FRAME] * self.trailing_silence_frames):
+            await self._media(ws, frame)
+            if index == len(frames) - 1:
+                speech_end = time.monotonic()
+        return speech_end
+
+    async def _await_reply(self, ws, speech_end: float) -> dict:
+        first_audio: Optional[float] = None
+        reply = bytearray()
+        deadline = time.monotonic() + self.turn_timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                message = json.loads(await asyncio.wait_for(ws.recv(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+            if message.get("event") == "media":
+                if first_audio is None:
+                    first_audio = time.monotonic()
+                reply += base64.b64decode(message["media"]["payload"])
+            elif message.get("event") == "mark":
+                # Twilio echoes a mark once the audio before it has played
+                if self.realtime:
+                    await asyncio.sleep(len(reply) / 8000)
+                await self._send(ws, message)
+                self.received += reply
+                return self._result(speech_end, first_audio, reply, completed=True)
+
+        self.received += reply
+        return self._result(speech_end, first_audio, reply, completed=False)
+
+    @staticmethod
+    def _result(speech_end: float, first_audio: Optional[float], reply: bytes, completed: bool) -> dict:
+        return {
+            "first_audio_ms": round((first_audio - speech_end) * 1000) if first_audio else None,
+            "reply_seconds": round(len(reply) / 8000, 2),
+            "completed": completed
+        }
+
+    async def _media(self, ws, frame: bytes):
+        self.chunk += 1
+        await self._send(ws, {
+            "event": "media",
+            "streamSid": self.stream_sid,
+            "media": {
+                "track": "inbound",
+                "chunk": str(self.chunk),
+                "timestamp": str(int(self.chunk * FRAME_SECONDS * 1000)),
+                "payload": base64.b64encode(frame).decode("ascii")
+            }
+        })
+        if self.realtime:
+            await asyncio.sleep(FRAME_SECONDS)
+
+    async def _send(self, ws, message: dict):
+        self.sequence += 1
+        await ws.send(json.dumps({**message, "sequenceNumber": str(self.sequence)}))
+
+
+def _create_call(api_url: str, phone_number: str, language: str, purpose: str) -> str:
+    response = httpx.post(
+        f"{api_url}/api/voice/outbound",
+        json={"phone_number": phone_number, "purpose": purpose, "language": language, "call_mode": "conversation"},
+        timeout=60.0
+    )
+    response.raise_for_status()
+    return response.json()["call_id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay caller audio into a conversational call's media stream")
+    parser.add_argument("audio", nargs="*", help="WAV file per caller turn (default: one synthetic utterance)")
+    parser.add_argument("--api", default="http://localhost:8000", help="Backend base URL")
+    parser.add_argument("--call-id", help="Existing call with call_mode=conversation")
+    parser.add_argument("--create-call", metavar="PHONE", help="Place a conversation call first (use with the provider simulator)")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--purpose", default="sip_debit_reminder")
+    parser.add_argument("--turns", type=int, default=1, help="Repeat the utterances this many times")
+    parser.add_argument("--fast", action="store_true", help="Send audio as fast as possible instead of in real time")
+    parser.add_argument("--silence-ms", type=int, default=1000, help="Silence after each utterance")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each reply")
+    parser.add_argument("--out", help="Write the received reply audio to this WAV file")
+    args = parser.parse_args()
+
+    if not args.call_id and not args.create_call:
+        parser.error("pass --call-id or --create-call")
+    call_id = args.call_id or _create_call(args.api, args.create_call, args.language, args.purpose)
+
+    utterances = []
+    for path in args.audio:
+        with open(path, "rb") as f:
+            utterances.append(telephony_mulaw(f.read()))
+    utterances = (utterances or [synthetic_utterance()]) * args.turns
+
+    url = args.api.replace("http://", "ws://").replace("https://", "wss://") + f"/api/voice/stream/{call_id}"
+    client = ReplayClient(url, realtime=not args.fast, trailing_silence_ms=args.silence_ms, turn_timeout=args.timeout)
+    results = asyncio.run(client.run(utterances))
+
+    latencies = sorted(r["first_audio_ms"] for r in results if r["first_audio_ms"] is not None)
+    if latencies:
+        print(f"call {call_id}: {len(latencies)}/{len(results)} turns answered, "
+              f"median first audio {latencies[len(latencies) // 2]} ms, max {latencies[-1]} ms")
+
+    if args.out:
+        with open(args.out, "wb") as f:
+            f.write(write_wav((1, 2, 8000), decode_mulaw(bytes(client.received))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Audio Store Tests
+Periodic pruning of unused audio and Range handling when it is served
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import voice
+from app.services.audio_store import AudioStore, audio_store
+
+
+AUDIO = b"RIFF" + bytes(range(96))
+
+
+def test_prune_keeps_reused_audio(tmp_path):
+    store = AudioStore(str(tmp_path), max_age_seconds=3600, prune_interval_seconds=60)
+    
+    async def scenario():
+        old = await store.put(b"old greeting")
+        reused = await store.put(b"shared greeting")
+        for digest in (old, reused):
+            stale = time.time() - 7200
+            os.utime(store.path_for(digest), (stale, stale))
+        
+        # Storing identical audio again counts as a use
+        await store.put(b"shared greeting")
+        assert store.prune() == 1
+        assert store.size_of(old) is None
+        assert store.size_of(reused) == len(b"shared greeting")
+    
+    asyncio.run(scenario())
+
+
+def test_pruner_runs_until_stopped(tmp_path):
+    store = AudioStore(str(tmp_path), max_age_seconds=0.05, prune_interval_seconds=0.02)
+    
+    async def scenario():
+        store.start_pruner()
+        digest = await store.put(b"call audio")
+        await asyncio.sleep(0.2)
+        assert store.size_of(digest) is None
+        
+        await store.stop_pruner()
+        digest = await store.put(b"call audio")
+        await asyncio.sleep(0.1)
+        assert store.size_of(digest) is not None
+    
+    asyncio.run(scenario())
+
+
+@pytest.fixture(scope="module")
+def clip_url():
+    app = FastAPI()
+    app.include_router(voice.router, prefix="/api/voice")
+    digest = asyncio.run(audio_store.put(AUDIO))
+    with TestClient(app) as client:
+        yield client, f"/api/voice/audio/clips/{digest}.wav"
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=0-9", 0, 9),
+    ("bytes=90-", 90, 99),
+    ("bytes=-10", 90, 99),
+    ("bytes=95-500", 95, 99),
+    ("BYTES = 3 - 4", 3, 4)
+])
+def test_satisfiable_range_is_partial(clip_url, header, start, end):
+    client, url = clip_url
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(AUDIO)}"
+    assert response.content == AUDIO[start:end + 1]
+
+
+@pytest.mark.parametrize("header", ["bytes=abc", "bytes=9-3", "bytes=0-1,5-6", "items=0-9", "bytes=-", "bytes"])
+def test_unusable_range_is_ignored(clip_url, header):
+    client, url = clip_url
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 200
+    assert "content-range" not in response.headers
+    assert response.content == AUDIO
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=500-600", "bytes=-0"])
+def test_range_past_the_end_is_unsatisfiable(clip_url, header):
+    client, url = clip_url
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(AUDIO)}"
@@ -0,0 +1,98 @@
+"""
+Audio Utils Tests
+PCM stitching, μ-law codec, μ-law WAV framing and resampling to the telephony rate
+"""
+
+import numpy as np
+import pytest
+
+from app.services.audio_utils import (
+    concat_mulaw_wav,
+    concat_wav,
+    decode_mulaw,
+    encode_mulaw,
+    pcm_wav_to_mulaw,
+    read_mulaw_wav,
+    read_wav,
+    telephony_mulaw,
+    write_mulaw_wav,
+    write_wav
+)
+
+
+def _pcm(values) -> bytes:
+    return np.asarray(values, dtype="<i2").tobytes()
+
+
+def _samples(pcm: bytes) -> np.ndarray:
+    return np.frombuffer(pcm, dtype="<i2").astype(np.int32)
+
+
+def test_pcm_concat_joins_frames_with_silence():
+    first, second = _pcm([100, -100]), _pcm([7, 8, 9])
+    joined = concat_wav([write_wav((1, 2, 8000), first), write_wav((1, 2, 8000), second)], gap_ms=5)
+    assert read_wav(joined) == ((1, 2, 8000), first + b"\x00" * 80 + second)
+    
+    with pytest.raises(ValueError):
+        concat_wav([write_wav((1, 2, 8000), first), write_wav((1, 2, 22050), second)])
+    with pytest.raises(ValueError):
+        concat_wav([b"not a wav"])
+    with pytest.raises(ValueError):
+        concat_wav([])
+
+
+def test_known_g711_values():
+    assert encode_mulaw(_pcm([0])) == b"\xff"
+    assert decode_mulaw(b"\xff") == _pcm([0])
+    assert _samples(decode_mulaw(b"\x00\x80")).tolist() == [-32124, 32124]
+
+
+def test_every_code_round_trips():
+    # Decoding then re-encoding is lossless for every code except negative zero (0x7f)
+    codes = bytes(code for code in range(256) if code != 0x7F)
+    assert encode_mulaw(decode_mulaw(codes)) == codes
+
+
+def test_encoding_error_is_logarithmic():
+    values = np.linspace(-32768, 32767, 4001).astype("<i2")
+    decoded = _samples(decode_mulaw(encode_mulaw(values.tobytes())))
+    error = np.abs(decoded - values.astype(np.int32))
+    
+    # Quantization steps grow with amplitude: about 3% of the sample plus a small floor
+    assert np.all(error <= np.abs(values.astype(np.int32)) * 0.035 + 8)
+    assert np.all(np.sign(decoded[np.abs(values) > 8]) == np.sign(values[np.abs(values) > 8]))
+
+
+def test_mulaw_wav_round_trip_and_concat():
+    frames = encode_mulaw(_pcm([0, 1000, -1000, 30000]))
+    wav = write_mulaw_wav(1, 8000, frames)
+    assert read_mulaw_wav(wav) == ((1, 8000), frames)
+    
+    joined = concat_mulaw_wav([wav, wav], gap_ms=10)
+    assert read_mulaw_wav(joined) == ((1, 8000), frames + b"\xff" * 80 + frames)
+    
+    with pytest.raises(ValueError):
+        concat_mulaw_wav([wav, write_mulaw_wav(1, 16000, frames)])
+    with pytest.raises(ValueError):
+        read_mulaw_wav(write_wav((1, 2, 8000), _pcm([0, 1])))
+
+
+def test_pcm_wav_to_mulaw_resamples_to_8khz():
+    one_second = _pcm((8000 * np.sin(np.arange(22050) * 2 * np.pi * 440 / 22050)).astype(int))
+    (channels, rate), frames = read_mulaw_wav(pcm_wav_to_mulaw(write_wav((1, 2, 22050), one_second)))
+    assert (channels, rate) == (1, 8000)
+    assert len(frames) == 8000
+    
+    with pytest.raises(ValueError):
+        pcm_wav_to_mulaw(write_wav((1, 1, 8000), b"\x00\x01"))
+
+
+def test_telephony_mulaw_downmixes_and_passes_8khz_through():
+    frames = encode_mulaw(_pcm([0, 500, -500, 0]))
+    assert telephony_mulaw(write_mulaw_wav(1, 8000, frames)) == frames
+    
+    stereo = _pcm([1000, 3000] * 160)
+    mono = telephony_mulaw(write_wav((2, 2, 16000), stereo))
+    assert len(mono) == 80
+    # Both channels average to 2000 on every frame
+    assert set(mono) == set(encode_mulaw(_pcm([2000])))
@@ -0,0 +1,91 @@
+"""
+Call Audio Overlap Tests
+Greeting synthesis running alongside the dial without clobbering or cancelling either
+"""
+
+import asyncio
+
+import pytest
+
+from app.api import voice
+from app.services.call_session_store import call_session_store
+from app.services.twilio_rest import TwilioAPIError, TwilioResource
+
+
+@pytest.fixture
+def outbound(monkeypatch):
+    synthesis = {"started": 0, "finished": 0, "gate": None}
+    
+    async def fake_segments(segments, language="en", speaker="meera", speed=1.0, encoding="pcm"):
+        synthesis["started"] += 1
+        if synthesis["gate"] is not None:
+            await synthesis["gate"].wait()
+        await asyncio.sleep(0.05)
+        synthesis["finished"] += 1
+        return b"RIFF" + b"\x00" * 400
+    
+    monkeypatch.setattr(voice.sarvam_service, "synthesize_segments", fake_segments)
+    request = voice.OutboundCallRequest(
+        phone_number="+919876543210",
+        purpose="payment_reminder",
+        customer_data={"name": "Anita", "amount": "5000", "due_date": "5 March"}
+    )
+    return request, synthesis
+
+
+def test_synthesis_and_dial_both_land_on_the_session(outbound, monkeypatch):
+    request, synthesis = outbound
+    
+    async def fake_create_call(**kwargs):
+        call_id = kwargs["url"].rsplit("/", 1)[-1]
+        # The ringing callback beats create() back
+        await call_session_store.update(call_id, twilio_status="ringing")
+        return TwilioResource({"sid": "CA100", "status": "queued"})
+    
+    monkeypatch.setattr(voice.twilio_rest_client, "create_call", fake_create_call)
+    
+    async def scenario():
+        call_id = await voice._create_call_session(request)
+        greeting, segments = voice._generate_call_greeting(request)
+        audio_task = await voice._start_call_audio(call_id, request, greeting, segments)
+        await voice._place_twilio_call(call_id, request)
+        await audio_task
+        
+        session = await call_session_store.get(call_id)
+        assert session.audio_ref is not None and session.audio_size == 404
+        assert session.twiml is not None and "<Play>" in session.twiml
+        assert (session.twilio_call_sid, session.twilio_status) == ("CA100", "ringing")
+        assert session.from_number is not None
+        voice.number_pool.release(call_id)
+    
+    asyncio.run(scenario())
+
+
+def test_failed_dial_lets_the_synthesis_finish_without_storing_audio(outbound, monkeypatch):
+    request, synthesis = outbound
+    
+    async def rejected(**kwargs):
+        raise TwilioAPIError(400, "Invalid 'To' number", code=21211)
+    
+    monkeypatch.setattr(voice.twilio_rest_client, "create_call", rejected)
+    
+    async def scenario():
+        # Hold the synthesis until the dial has failed
+        synthesis["gate"] = asyncio.Event()
+        call_id = await voice._create_call_session(request)
+        greeting, segments = voice._generate_call_greeting(request)
+        audio_task = await voice._start_call_audio(call_id, request, greeting, segments)
+        with pytest.raises(TwilioAPIError):
+            await voice._place_twilio_call(call_id, request)
+        await voice._fail_call_session(call_id)
+        
+        synthesis["gate"].set()
+        await audio_task
+        assert not audio_task.cancelled()
+        assert (synthesis["started"], synthesis["finished"]) == (1, 1)
+        
+        session = await call_session_store.get(call_id)
+        assert session.current_status == "failed"
+        assert session.audio_ref is None
+    
+    asyncio.run(scenario())
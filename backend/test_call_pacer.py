@@ -0,0 +1,72 @@
+"""
+Call Pacer Tests
+Token-bucket refill, burst and 429 back-off, and the per-number plus account-wide pacing
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.call_pacer import CallPacer, TokenBucket
+
+
+def test_bucket_starts_full_and_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, burst=3)
+    now = bucket.updated
+    
+    for _ in range(3):
+        assert bucket.wait_time(now) == 0.0
+        bucket.take()
+    assert bucket.wait_time(now) == pytest.approx(0.5)
+    
+    # Half a second buys one token; the bucket never holds more than burst
+    assert bucket.wait_time(now + 0.5) == 0.0
+    assert bucket.wait_time(now + 100) == 0.0
+    assert bucket.tokens == 3
+
+
+def test_burst_is_at_least_one_token():
+    bucket = TokenBucket(rate=1.0, burst=0)
+    assert bucket.burst == 1.0
+    assert bucket.wait_time(bucket.updated) == 0.0
+
+
+def test_drain_blocks_for_the_backoff():
+    bucket = TokenBucket(rate=5.0, burst=10)
+    bucket.drain(2.0)
+    assert bucket.wait_time(bucket.updated) == pytest.approx(2.0)
+    assert bucket.wait_time(bucket.updated + 2.0) == 0.0
+
+
+def test_acquire_paces_each_number_and_the_account():
+    async def scenario():
+        pacer = CallPacer(per_number_rate=20, per_number_burst=1, global_rate=1000, global_burst=10)
+        started = time.monotonic()
+        waits = [await pacer.acquire("+911") for _ in range(3)]
+        assert time.monotonic() - started >= 0.09
+        assert waits[0] < 0.01
+        
+        # Another caller ID has its own bucket
+        assert await pacer.acquire("+912") < 0.01
+        
+        # The account bucket caps every number together
+        pacer = CallPacer(per_number_rate=1000, per_number_burst=10, global_rate=20, global_burst=1)
+        started = time.monotonic()
+        await pacer.acquire("+911")
+        await pacer.acquire("+912")
+        assert time.monotonic() - started >= 0.04
+        
+        assert pacer.stats()["acquired"] == 2
+    
+    asyncio.run(scenario())
+
+
+def test_throttle_pauses_dials():
+    async def scenario():
+        pacer = CallPacer(per_number_rate=100, per_number_burst=5, global_rate=100, global_burst=5)
+        pacer.throttle("+911", 0.1)
+        assert await pacer.acquire("+911") >= 0.09
+        assert pacer.stats()["throttled"] == 1
+    
+    asyncio.run(scenario())
@@ -0,0 +1,247 @@
+"""
+Call Session Store Tests
+Keyset pagination, filters, the secondary indexes behind them and the memory budget
+"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from app.core.session_backend import InMemorySessionBackend, RedisSessionBackend, SQLiteSessionBackend
+from app.services.call_session_store import CallSession, CallSessionStore, _deep_sizeof
+
+
+def _store(backend=None) -> CallSessionStore:
+    return CallSessionStore(
+        max_entries=1000,
+        max_bytes=64 * 1024 * 1024,
+        finished_ttl_seconds=600,
+        active_ttl_seconds=3600,
+        sweep_interval_seconds=60,
+        backend=backend or InMemorySessionBackend()
+    )
+
+
+def _session(index: int, created_at: float, **fields) -> CallSession:
+    args = {
+        "call_id": f"c{index:03d}",
+        "phone_number": f"+9198765{index % 5:05d}",
+        "purpose": "payment_reminder",
+        "sector": "banking",
+        "language": "en",
+        "created_at": created_at,
+        **fields
+    }
+    return CallSession(**args)
+
+
+@pytest.fixture
+def store():
+    store = _store()
+    
+    async def populate():
+        # Three sessions per timestamp, so pages must break ties on call_id
+        for index in range(30):
+            await store.add(_session(index, 1000.0 + index // 3, language="hi" if index % 2 else "en"))
+        for index in range(0, 30, 3):
+            await store.update(f"c{index:03d}", twilio_status="completed")
+    
+    asyncio.run(populate())
+    return store
+
+
+def _all_pages(store: CallSessionStore, limit: int, **filters):
+    async def collect():
+        pages, cursor = [], None
+        while True:
+            page, cursor = await store.list_sessions(cursor=cursor, limit=limit, **filters)
+            pages.append([session.call_id for session in page])
+            if cursor is None:
+                return pages
+    
+    return asyncio.run(collect())
+
+
+def _newest_first(sessions):
+    return [s.call_id for s in sorted(sessions, key=lambda s: (s.created_at, s.call_id), reverse=True)]
+
+
+def test_pages_cover_every_session_once_newest_first(store):
+    pages = _all_pages(store, limit=7)
+    assert [len(page) for page in pages] == [7, 7, 7, 7, 2]
+    assert sum(pages, []) == _newest_first(store._sessions.values())
+
+
+def test_exact_multiple_of_limit_has_no_extra_page(store):
+    pages = _all_pages(store, limit=10)
+    assert [len(page) for page in pages] == [10, 10, 10]
+
+
+@pytest.mark.parametrize("status", ["completed", "initiated"])
+def test_status_filter_pages_from_the_status_index(store, status):
+    expected = _newest_first(s for s in store._sessions.values() if s.current_status == status)
+    assert sum(_all_pages(store, limit=3, status=status), []) == expected
+    assert sum(_all_pages(store, limit=3, status=status, language="hi"), []) == [
+        call_id for call_id in expected if store._sessions[call_id].language == "hi"
+    ]
+
+
+def test_created_bounds(store):
+    async def scenario():
+        page, cursor = await store.list_sessions(created_after=1003.0, created_before=1006.0, limit=100)
+        assert cursor is None
+        assert {session.created_at for session in page} == {1003.0, 1004.0, 1005.0}
+        
+        page, _ = await store.list_sessions(status="completed", created_after=1003.0, created_before=1006.0, limit=100)
+        assert [session.call_id for session in page] == ["c015", "c012", "c009"]
+    
+    asyncio.run(scenario())
+
+
+def test_status_change_keeps_the_timeline(store):
+    async def scenario():
+        timeline = list(store._timeline)
+        await store.update("c001", twilio_status="ringing")
+        await store.update("c001", twilio_status="no-answer")
+        assert store._timeline == timeline
+        assert [session.call_id for session in await store.find_by_status("no-answer")] == ["c001"]
+        assert all(call_id != "c001" for _, call_id in store._by_status.get("ringing", []))
+        
+        await store.update("c001", created_at=2000.0)
+        page, _ = await store.list_sessions(limit=1)
+        assert page[0].call_id == "c001"
+        page, _ = await store.list_sessions(status="no-answer", limit=1)
+        assert page[0].created_at == 2000.0
+    
+    asyncio.run(scenario())
+
+
+def test_failed_before_dialing_is_finished():
+    session = _session(1, 1000.0, status="failed")
+    assert session.twilio_status is None
+    assert session.is_finished
+    assert session.current_status == "failed"
+
+
+def _worker_backends(kind, tmp_path):
+    """Two handles on one shared store, as two API workers would hold"""
+    if kind == "sqlite":
+        return [SQLiteSessionBackend(str(tmp_path / "sessions.db")) for _ in range(2)]
+    server = fakeredis.FakeServer()
+    return [
+        RedisSessionBackend("redis://test", client=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+        for _ in range(2)
+    ]
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+def test_concurrent_updates_from_two_workers_keep_every_field(kind, tmp_path):
+    backends = _worker_backends(kind, tmp_path)
+    first, second = (_store(backend) for backend in backends)
+    
+    async def scenario():
+        for index in range(10):
+            await first.add(_session(index, 1000.0))
+            await second.get(f"c{index:03d}")
+        
+        # Greeting synthesis, the dial and a status callback race on every call
+        await asyncio.gather(*[
+            update for index in range(10) for update in (
+                first.update(f"c{index:03d}", audio_ref=f"c{index:03d}.wav", audio_size=800),
+                second.update(f"c{index:03d}", from_number="+10000000001", twilio_call_sid=f"CA{index}"),
+                second.update_many({f"c{index:03d}": {"twilio_status": "ringing"}})
+            )
+        ])
+        
+        for store in (first, second):
+            for index in range(10):
+                session = await store.get(f"c{index:03d}")
+                assert (session.audio_ref, session.audio_size) == (f"c{index:03d}.wav", 800)
+                assert (session.from_number, session.twilio_call_sid) == ("+10000000001", f"CA{index}")
+                assert session.twilio_status == "ringing"
+            assert (await store.get_by_sid("CA3")).call_id == "c003"
+        
+        for backend in backends:
+            await backend.aclose()
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+def test_phone_and_status_lookups_see_other_workers_calls(kind, tmp_path):
+    backends = _worker_backends(kind, tmp_path)
+    first, second = (_store(backend) for backend in backends)
+    
+    async def scenario():
+        for index in range(10):
+            await first.add(_session(index, 1000.0 + index))
+        await first.update_many({f"c{index:03d}": {"twilio_status": "ringing"} for index in range(0, 10, 2)})
+        await first.update("c004", twilio_status="completed")
+        
+        # The second worker has never loaded these calls
+        assert len(second) == 0
+        assert [s.call_id for s in await second.find_by_phone("+919876500002")] == ["c007", "c002"]
+        assert (await second.latest_for_phone("+919876500002")).call_id == "c007"
+        assert [s.call_id for s in await second.find_by_status("ringing")] == ["c008", "c006", "c002", "c000"]
+        assert [s.call_id for s in await second.find_by_status("ringing", limit=2)] == ["c008", "c006"]
+        assert await second.status_counts() == {"initiated": 5, "ringing": 4, "completed": 1}
+        
+        await second.update("c006", status="failed")
+        assert await first.status_counts() == {"initiated": 5, "ringing": 3, "completed": 1, "failed": 1}
+        
+        for backend in backends:
+            await backend.aclose()
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+def test_shared_listings_page_from_the_backend(kind, tmp_path):
+    backends = _worker_backends(kind, tmp_path)
+    first, second = (_store(backend) for backend in backends)
+    local = _store()
+    
+    async def scenario():
+        for store in (first, local):
+            for index in range(30):
+                await store.add(_session(index, 1000.0 + index // 3, language="hi" if index % 2 else "en"))
+            for index in range(0, 30, 3):
+                await store.update(f"c{index:03d}", twilio_status="completed")
+    
+    asyncio.run(scenario())
+    
+    # Any worker serves the same pages as a single in-memory store
+    assert len(second) == 0
+    for filters in ({}, {"status": "completed"}, {"language": "hi"}, {"status": "initiated", "language": "en"}):
+        for limit in (1, 4, 7, 100):
+            assert _all_pages(second, limit, **filters) == _all_pages(local, limit, **filters)
+    assert _all_pages(second, 5, created_after=1003.0, created_before=1006.0) == \
+        _all_pages(local, 5, created_after=1003.0, created_before=1006.0)
+    
+    for backend in backends:
+        asyncio.run(backend.aclose())
+
+
+def test_byte_budget_evicts_oldest_finished_first():
+    store = _store()
+    
+    async def scenario():
+        for index in range(10):
+            await store.add(_session(index, 1000.0 + index))
+        await store.update("c004", twilio_status="completed")
+        await store.update("c001", messages=[{"role": "user", "content": "x" * 500}])
+        
+        # The running total follows in-place updates without re-measuring
+        assert store.stats()["estimated_bytes"] == sum(_deep_sizeof(s) for s in store._sessions.values())
+        
+        # Full: each new session pushes out the oldest finished one, then the oldest
+        store.max_bytes = store.stats()["estimated_bytes"]
+        await store.add(_session(10, 1010.0))
+        assert "c004" not in store and "c000" in store
+        await store.add(_session(11, 1011.0))
+        assert "c000" not in store and "c011" in store
+        assert store.stats()["estimated_bytes"] <= store.max_bytes
+        assert store.evictions == 2
+    
+    asyncio.run(scenario())
@@ -0,0 +1,127 @@
+"""
+Call Status Ingestor Tests
+Batched application of status callbacks, duplicate and late callbacks, and the inline fallback
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.session_backend import InMemorySessionBackend
+from app.services import call_status_ingestor as ingestor_module
+from app.services.call_session_store import CallSession, CallSessionStore
+from app.services.call_status_ingestor import CallStatusEvent, CallStatusIngestor
+from app.services.event_hub import EventHub
+from app.services.number_pool import NumberPool
+
+
+class FakeRetryScheduler:
+    def __init__(self):
+        self.scheduled = []
+    
+    def should_retry(self, session: CallSession) -> bool:
+        return session.twilio_status in ("no-answer", "busy")
+    
+    async def schedule_for(self, session: CallSession):
+        self.scheduled.append(session.call_id)
+
+
+@pytest.fixture
+def services(monkeypatch):
+    store = CallSessionStore(
+        max_entries=1000,
+        max_bytes=64 * 1024 * 1024,
+        finished_ttl_seconds=600,
+        active_ttl_seconds=3600,
+        sweep_interval_seconds=60,
+        backend=InMemorySessionBackend()
+    )
+    pool = NumberPool(["+10000000001"])
+    hub = EventHub(max_subscribers=10, coalesce_ms=0, keepalive_seconds=1)
+    retries = FakeRetryScheduler()
+    for name, service in (("call_session_store", store), ("number_pool", pool), ("event_hub", hub), ("retry_scheduler", retries)):
+        monkeypatch.setattr(ingestor_module, name, service)
+    
+    async def add_calls(count: int):
+        for index in range(count):
+            call_id = f"c{index}"
+            await store.add(CallSession(
+                call_id=call_id, phone_number=f"+9190000000{index}", purpose="payment_reminder",
+                sector="banking", language="en"
+            ))
+            await pool.acquire(call_id, f"+9190000000{index}")
+    
+    return store, pool, hub, retries, add_calls
+
+
+def _event(call_id: str, status: str) -> CallStatusEvent:
+    return CallStatusEvent(call_id=call_id, call_sid=f"CA{call_id}", status=status)
+
+
+def test_queued_events_apply_in_batches_and_in_order(services):
+    store, pool, hub, retries, add_calls = services
+    
+    async def scenario():
+        await add_calls(3)
+        subscriber = hub.subscribe()
+        ingestor = CallStatusIngestor(queue_size=100, batch_size=50)
+        for status in ("initiated", "ringing", "in-progress"):
+            for index in range(3):
+                await ingestor.submit(_event(f"c{index}", status))
+        await ingestor.submit(_event("c0", "completed"))
+        await ingestor.submit(_event("c1", "no-answer"))
+        
+        ingestor.start()
+        await ingestor.stop()
+        
+        stats = ingestor.stats()
+        assert (stats["enqueued"], stats["applied"], stats["batches"]) == (11, 11, 1)
+        assert [(await store.get(f"c{i}")).twilio_status for i in range(3)] == ["completed", "no-answer", "in-progress"]
+        assert pool.stats()["in_flight"] == 1
+        assert retries.scheduled == ["c1"]
+        
+        # Subscribers get each call's latest state once
+        batch = await subscriber.next_batch(0, timeout=1)
+        assert sorted((event["call_id"], event["twilio_status"]) for event in batch) == [
+            ("c0", "completed"), ("c1", "no-answer"), ("c2", "in-progress")
+        ]
+    
+    asyncio.run(scenario())
+
+
+def test_duplicate_and_late_callbacks_are_ignored(services):
+    store, pool, hub, retries, add_calls = services
+    
+    async def scenario():
+        await add_calls(1)
+        ingestor = CallStatusIngestor(queue_size=100, batch_size=50)
+        await ingestor.apply_batch([_event("c0", "ringing"), _event("c0", "busy"), _event("c0", "busy")])
+        await ingestor.apply_batch([_event("c0", "in-progress"), _event("c0", "completed"), _event("missing", "ringing")])
+        
+        assert (await store.get("c0")).twilio_status == "busy"
+        assert retries.scheduled == ["c0"]
+        assert pool.stats()["numbers"][0]["in_flight"] == 0
+        assert (ingestor.applied, ingestor.ignored) == (2, 4)
+    
+    asyncio.run(scenario())
+
+
+def test_full_queue_applies_inline(services):
+    store, pool, hub, retries, add_calls = services
+    
+    async def scenario():
+        await add_calls(2)
+        ingestor = CallStatusIngestor(queue_size=1, batch_size=10)
+        await ingestor.submit(_event("c0", "ringing"))
+        await ingestor.submit(_event("c1", "ringing"))
+        
+        # The second event did not fit; it is already on the session
+        assert (await store.get("c1")).twilio_status == "ringing"
+        assert (await store.get("c0")).twilio_status is None
+        assert (ingestor.enqueued, ingestor.inline) == (1, 1)
+        
+        ingestor.start()
+        await ingestor.stop()
+        assert (await store.get("c0")).twilio_status == "ringing"
+    
+    asyncio.run(scenario())
@@ -0,0 +1,113 @@
+"""
+Campaign Service Tests
+Pipeline stages that survive failing items, per-stage timing and progress shared across workers
+"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from app.core.session_backend import RedisSessionBackend, SQLiteSessionBackend
+from app.services.campaign_service import CampaignService
+
+
+def test_stray_cancellation_fails_the_item_not_the_worker():
+    async def scenario():
+        service = CampaignService()
+        shared = asyncio.get_running_loop().create_future()
+        shared.cancel()
+        
+        async def flaky(item):
+            if item % 3 == 0:
+                # e.g. awaiting a shared future another caller cancelled
+                await shared
+            return item
+        
+        async def dial(item):
+            return item
+        
+        campaign = service.start_campaign(list(range(9)), [("tts", flaky, 1), ("dial", dial, 1)])
+        await asyncio.wait_for(campaign.task, timeout=2)
+        
+        progress = campaign.to_dict()
+        assert progress["status"] == "completed"
+        assert (progress["completed"], progress["failed"]) == (6, 3)
+        assert progress["recent_errors"][0] == {"stage": "tts", "error": "cancelled"}
+    
+    asyncio.run(scenario())
+
+
+def test_shutdown_cancels_running_campaigns():
+    async def scenario():
+        service = CampaignService()
+        
+        async def slow(item):
+            await asyncio.sleep(10)
+        
+        campaign = service.start_campaign(list(range(3)), [("tts", slow, 2)])
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(service.shutdown(), timeout=2)
+        assert campaign.status == "cancelled"
+    
+    asyncio.run(scenario())
+
+
+def test_busy_time_excludes_waiting_on_the_next_stage():
+    async def scenario():
+        service = CampaignService()
+        service.queue_size = 1
+        
+        async def fast(item):
+            return item
+        
+        async def slow(item):
+            await asyncio.sleep(0.05)
+            return item
+        
+        campaign = service.start_campaign(list(range(6)), [("session", fast, 1), ("dial", slow, 1)])
+        await asyncio.wait_for(campaign.task, timeout=2)
+        
+        # The session stage spends most of the run blocked on the dial queue
+        stages = campaign.to_dict()["stages"]
+        assert stages["session"]["avg_latency_ms"] < 5
+        assert stages["dial"]["avg_latency_ms"] >= 50
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+def test_progress_is_visible_from_other_workers(kind, tmp_path):
+    if kind == "sqlite":
+        backends = [SQLiteSessionBackend(str(tmp_path / "sessions.db")) for _ in range(2)]
+    else:
+        server = fakeredis.FakeServer()
+        backends = [
+            RedisSessionBackend("redis://test", client=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+            for _ in range(2)
+        ]
+    running, other = (CampaignService(backend=backend) for backend in backends)
+    
+    async def scenario():
+        gate = asyncio.Event()
+        
+        async def dial(item):
+            await gate.wait()
+            return item
+        
+        campaign = running.start_campaign(list(range(4)), [("dial", dial, 2)], metadata={"purpose": "kyc"})
+        await asyncio.sleep(0.05)
+        progress = await other.get_progress(campaign.campaign_id)
+        assert (progress["status"], progress["total"], progress["completed"]) == ("running", 4, 0)
+        
+        gate.set()
+        await asyncio.wait_for(campaign.task, timeout=2)
+        progress = await other.get_progress(campaign.campaign_id)
+        assert progress == campaign.to_dict() | {"elapsed_seconds": progress["elapsed_seconds"]}
+        assert (progress["status"], progress["completed"], progress["metadata"]) == ("completed", 4, {"purpose": "kyc"})
+        
+        assert await other.get_progress("missing") is None
+        for backend in backends:
+            await backend.aclose()
+    
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+"""
+Event Hub Tests
+Cross-worker relay over Redis pub/sub, the single-worker limit without it and subscriber filters
+"""
+
+import asyncio
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from app.services.call_session_store import CallSession
+from app.services.event_hub import EventHub
+
+
+def _hub(redis=None, workers: int = 1) -> EventHub:
+    return EventHub(max_subscribers=10, coalesce_ms=0, keepalive_seconds=1, redis=redis, workers=workers)
+
+
+def test_events_reach_subscribers_on_other_workers():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        worker_a = _hub(fakeredis.aioredis.FakeRedis(server=server, decode_responses=True), workers=2)
+        worker_b = _hub(fakeredis.aioredis.FakeRedis(server=server, decode_responses=True), workers=2)
+        worker_a.start()
+        worker_b.start()
+        try:
+            # Let both listeners subscribe before publishing
+            await asyncio.sleep(0.2)
+            local = worker_a.subscribe(call_ids=["c1"])
+            remote = worker_b.subscribe(call_ids=["c1"])
+            
+            worker_a.publish({"type": "call_status", "call_id": "c1", "status": "ringing"})
+            worker_a.publish({"type": "call_status", "call_id": "c2", "status": "ringing"})
+            
+            assert [event["status"] for event in await remote.next_batch(0, timeout=2)] == ["ringing"]
+            assert [event["status"] for event in await local.next_batch(0, timeout=2)] == ["ringing"]
+            
+            # A worker never receives its own events twice
+            await asyncio.sleep(0.2)
+            assert await local.next_batch(0, timeout=0.1) == []
+            assert worker_a.relayed == 0
+            assert worker_b.relayed == 2
+        finally:
+            await worker_a.stop()
+            await worker_b.stop()
+    
+    asyncio.run(scenario())
+
+
+def test_local_hub_refuses_subscribers_with_several_workers():
+    with pytest.raises(RuntimeError):
+        _hub(workers=4).subscribe()
+    
+    subscriber = _hub(workers=1).subscribe()
+    assert subscriber is not None
+
+
+def test_campaign_subscribers_get_only_their_campaigns_calls():
+    async def scenario():
+        hub = _hub()
+        campaign = hub.subscribe(campaign_ids=["k1"])
+        mixed = hub.subscribe(call_ids=["c3"], campaign_ids=["k1"])
+        everything = hub.subscribe()
+        
+        for call_id, campaign_id in (("c1", "k1"), ("c2", "k2"), ("c3", None)):
+            hub.publish_call_status(CallSession(
+                call_id=call_id, phone_number="+919876543210", purpose="payment_reminder",
+                sector="banking", language="en", campaign_id=campaign_id
+            ))
+        hub.publish({"type": "campaign_progress", "campaign_id": "k2", "completed": 1})
+        
+        def subjects(batch):
+            return sorted(event.get("call_id") or event["campaign_id"] for event in batch)
+        
+        assert subjects(await campaign.next_batch(0, timeout=1)) == ["c1"]
+        assert subjects(await mixed.next_batch(0, timeout=1)) == ["c1", "c3"]
+        assert subjects(await everything.next_batch(0, timeout=1)) == ["c1", "c2", "c3", "k2"]
+    
+    asyncio.run(scenario())
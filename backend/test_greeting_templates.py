@@ -0,0 +1,93 @@
+"""
+Greeting Template Tests
+Slot formatting, static/variable segmentation and the purpose and language fallbacks
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.services.greeting_templates import GreetingTemplateRegistry, format_indian_number, greeting_templates
+
+
+def _registry(tmp_path, greetings, slots=None, language="en") -> GreetingTemplateRegistry:
+    data = {
+        "language": language,
+        "slots": slots or {
+            "name": {"type": "name", "format": " {}", "default": ""},
+            "amount": {"type": "amount", "currency": "₹", "default": "₹5,000"},
+            "due_date": {
+                "type": "date",
+                "format": "{day_ordinal} {month}",
+                "months": ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+                "default": "soon"
+            }
+        },
+        "greetings": greetings
+    }
+    (tmp_path / f"{language}.json").write_text(json.dumps(data), encoding="utf-8")
+    return GreetingTemplateRegistry.load(tmp_path)
+
+
+@pytest.mark.parametrize("amount, expected", [
+    ("5", "5"),
+    ("123456", "1,23,456"),
+    ("1234567.5", "12,34,567.50"),
+    ("-100000", "-1,00,000")
+])
+def test_indian_digit_grouping(amount, expected):
+    assert format_indian_number(Decimal(amount)) == expected
+
+
+def test_slots_are_formatted_and_spoken_as_variable_segments(tmp_path):
+    registry = _registry(tmp_path, {
+        "default": "Hello{name}.",
+        "emi": "Hello{name}, your EMI of {amount} is due on {due_date}. Thank you."
+    })
+    text, segments = registry.render("emi", "en", {"name": "Anita", "amount": "Rs. 1,23,456", "due_date": "2026-03-05"})
+    
+    disclosure = segments[-1][0]
+    assert text == f"Hello Anita, your EMI of ₹1,23,456 is due on 5th Mar. Thank you. {disclosure}"
+    assert segments[:-1] == [
+        ("Hello", True), ("Anita,", False), ("your EMI of", True), ("₹1,23,456", False),
+        ("is due on", True), ("5th Mar.", False), ("Thank you.", True)
+    ]
+
+
+def test_unusable_values_fall_back_or_pass_through(tmp_path):
+    registry = _registry(tmp_path, {"default": "Hello{name}, pay {amount} by {due_date}."})
+    
+    text, segments = registry.render("default", "en", {"name": "  ", "amount": "five thousand", "due_date": "31/02/2026"})
+    assert text.startswith("Hello, pay five thousand by 31/02/2026.")
+    # No name: the literals around the empty slot become one static segment
+    assert segments[0] == ("Hello, pay", True)
+    
+    text, _ = registry.render("default", "en", {"name": "{Anita} <b>" + "x" * 60, "due_date": "21-11-2026"})
+    # Markup characters dropped, capped at 40 characters
+    assert text.startswith("Hello Anita b" + "x" * 33 + ", pay ₹5,000 by 21st Nov.")
+
+
+def test_unknown_purpose_and_language_fall_back(tmp_path):
+    registry = _registry(tmp_path, {"default": "Hello{name}.", "kyc": "KYC reminder{name}."})
+    assert registry.resolve("kyc", "en").purpose == "kyc"
+    assert registry.resolve("sip", "en").purpose == "default"
+    assert registry.resolve("kyc", "ta").language == "en"
+    
+    batch = registry.render_batch("kyc", "en", [{"name": "Anita"}, None])
+    assert [text.split(".")[0] for text, _ in batch] == ["KYC reminder Anita", "KYC reminder"]
+
+
+def test_invalid_template_files_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        _registry(tmp_path, {"default": "Hello {customer}."})
+    with pytest.raises(ValueError):
+        _registry(tmp_path, {"kyc": "KYC reminder."})
+
+
+def test_shipped_templates_cover_every_supported_language():
+    for language in ("en", "hi", "ta", "te", "mr", "bn"):
+        compiled = greeting_templates.resolve("payment_reminder", language)
+        assert compiled.language == language
+        text, segments = compiled.render({"name": "Anita", "amount": "5000", "due_date": "2026-03-05"})
+        assert "Anita" in text and all(segment.strip() for segment, _ in segments)
@@ -0,0 +1,228 @@
+"""
+Groq Service Tests
+Completions over a fake async client: bounded concurrency, streamed deltas, upstream close and the SSE endpoint
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import voice
+from app.services import groq_service as groq_module
+from app.services.groq_service import GroqService
+from app.services.llm_cache import LLMResponseCache
+
+
+def _chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+class FakeStream:
+    def __init__(self, pieces, delay: float = 0.0, error: Exception = None):
+        self.pieces = pieces
+        self.delay = delay
+        self.error = error
+        self.closed = False
+    
+    async def __aiter__(self):
+        for piece in self.pieces:
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(choices=[]) if piece is None else _chunk(piece)
+        if self.error:
+            raise self.error
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeGroqClient:
+    """Stands in for AsyncGroq: `chat.completions.create` returns the next scripted reply"""
+    
+    def __init__(self, pieces=("Hello", "", " there", None, "."), delay: float = 0.0, error: Exception = None):
+        self.pieces = pieces
+        self.delay = delay
+        self.error = error
+        self.created = []
+        self.streams = []
+        self.in_flight = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+    
+    async def create(self, **kwargs):
+        self.created.append(kwargs)
+        if not kwargs.get("stream"):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                await asyncio.sleep(self.delay)
+                if self.error:
+                    raise self.error
+            finally:
+                self.in_flight -= 1
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="".join(filter(None, self.pieces))))])
+        
+        stream = FakeStream(self.pieces, self.delay, self.error)
+        self.streams.append(stream)
+        return stream
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(groq_module, "llm_cache", cache)
+    return cache
+
+
+async def _collect(deltas):
+    return [delta async for delta in deltas]
+
+
+def _service(monkeypatch, max_in_flight: int, **client) -> GroqService:
+    monkeypatch.setattr(groq_module.settings, "GROQ_MAX_IN_FLIGHT", max_in_flight)
+    service = GroqService()
+    service.client = FakeGroqClient(**client)
+    return service
+
+
+def test_requests_beyond_the_limit_queue(monkeypatch):
+    service = _service(monkeypatch, 2, delay=0.05)
+    
+    async def scenario():
+        messages = [{"role": "user", "content": "Hi"}]
+        replies = await asyncio.gather(*(service.generate_response(messages) for _ in range(5)))
+        assert replies == ["Hello there."] * 5
+    
+    asyncio.run(scenario())
+    assert service.client.peak == 2
+    
+    stats = service.stats()
+    assert (stats["requests"], stats["in_flight"], stats["waiting"]) == (5, 0, 0)
+    # The last pair waited for two rounds ahead of them
+    assert stats["queue_wait_ms"]["max"] >= 90
+
+
+def test_open_streams_hold_a_slot_and_failures_release_it(monkeypatch):
+    service = _service(monkeypatch, 1, pieces=["word "] * 10)
+    
+    async def scenario():
+        deltas = service.stream_response([{"role": "user", "content": "Hi"}])
+        await deltas.__anext__()
+        request = asyncio.create_task(service.generate_response([{"role": "user", "content": "Hi"}]))
+        await asyncio.sleep(0.05)
+        assert not request.done() and service.stats()["waiting"] == 1
+        
+        await deltas.aclose()
+        assert await asyncio.wait_for(request, timeout=1) == "word " * 10
+        
+        service.client.error = RuntimeError("rate limited")
+        with pytest.raises(RuntimeError):
+            await service.generate_response([{"role": "user", "content": "Hi"}])
+        assert service.in_flight == 0
+        
+        service.client.error = None
+        assert await asyncio.wait_for(service.generate_response([{"role": "user", "content": "Hi"}]), timeout=1)
+    
+    asyncio.run(scenario())
+
+
+def test_stream_yields_text_deltas_and_records_first_token():
+    service = GroqService()
+    service.client = FakeGroqClient(delay=0.01)
+    
+    deltas = asyncio.run(_collect(service.stream_response([{"role": "user", "content": "Hi"}])))
+    assert deltas == ["Hello", " there", "."]
+    assert service.client.created[0]["stream"] is True
+    assert service.client.streams[0].closed
+    
+    stats = service.stream_stats()
+    assert (stats["completed"], stats["cancelled"], stats["failed"]) == (1, 0, 0)
+    assert 0 < stats["latency_ms"]["ttft_ms"]["p50"] <= stats["latency_ms"]["total_ms"]["p50"]
+
+
+def test_closing_the_stream_closes_it_upstream():
+    service = GroqService()
+    service.client = FakeGroqClient(pieces=["word "] * 100)
+    
+    async def scenario():
+        deltas = service.stream_response([{"role": "user", "content": "Hi"}])
+        assert await deltas.__anext__() == "word "
+        await deltas.aclose()
+    
+    asyncio.run(scenario())
+    assert service.client.streams[0].closed
+    assert service.stream_stats()["cancelled"] == 1
+    assert service.in_flight == 0
+
+
+def test_stream_errors_are_counted_and_raised():
+    service = GroqService()
+    service.client = FakeGroqClient(pieces=["Partial"], error=RuntimeError("connection reset"))
+    
+    async def scenario():
+        received = []
+        with pytest.raises(RuntimeError):
+            async for delta in service.stream_response([{"role": "user", "content": "Hi"}]):
+                received.append(delta)
+        assert received == ["Partial"]
+    
+    asyncio.run(scenario())
+    assert service.client.streams[0].closed
+    assert service.stream_stats()["failed"] == 1
+
+
+def test_only_completed_streams_are_cached(cache):
+    service = GroqService()
+    service.client = FakeGroqClient()
+    
+    async def scenario():
+        interrupted = service.stream_bfsi_response("What is KYC?", context="")
+        await interrupted.__anext__()
+        await interrupted.aclose()
+        assert cache.stats()["entries"] == 0
+        
+        assert "".join(await _collect(service.stream_bfsi_response("What is KYC?", context=""))) == "Hello there."
+        # Served whole from the cache, without another completion
+        assert await _collect(service.stream_bfsi_response("what is kyc", context="")) == ["Hello there."]
+        assert len(service.client.created) == 2
+    
+    asyncio.run(scenario())
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        name, data = block.split("\n", 1)
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+@pytest.fixture
+def query_client(monkeypatch, cache):
+    monkeypatch.setattr(groq_module.groq_service, "client", FakeGroqClient())
+    app = FastAPI()
+    app.include_router(voice.router, prefix="/api/voice")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_query_stream_sends_token_events_then_done(query_client):
+    response = query_client.post("/api/voice/query/stream", json={"text": "What is an EMI?", "session_id": "s1"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    
+    events = _events(response.text)
+    assert [name for name, _ in events] == ["token"] * 3 + ["done"]
+    assert "".join(data["delta"] for _, data in events[:-1]) == "Hello there."
+    done = events[-1][1]
+    assert (done["session_id"], done["text_response"]) == ("s1", "Hello there.")
+    assert done["timing"]["ttft_ms"] is not None
+
+
+def test_query_stream_reports_failures_as_an_event(query_client, monkeypatch):
+    monkeypatch.setattr(groq_module.groq_service, "client", FakeGroqClient(pieces=["Par"], error=RuntimeError("boom")))
+    events = _events(query_client.post("/api/voice/query/stream", json={"text": "What is an EMI?"}).text)
+    assert [name for name, _ in events] == ["token", "error"]
+    assert events[-1][1]["detail"] == "boom"
@@ -0,0 +1,92 @@
+"""
+LLM Response Cache Tests
+Query normalization, TTL and LRU eviction, and the rules that bypass the cache
+"""
+
+import pytest
+
+from app.services import llm_cache as llm_cache_module
+from app.services.llm_cache import LLMResponseCache, normalize_query
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _key(cache: LLMResponseCache, query: str, **overrides):
+    args = {"sector": "banking", "language": "en", "prompt_version": "1", "model": "llama", **overrides}
+    return cache.key_for(query, **args)
+
+
+def test_normalize_query():
+    assert normalize_query("  What is   my EMI?  ") == "what is my emi"
+    # Full-width forms fold to ASCII
+    assert normalize_query("ＥＭＩ？") == "emi"
+    # Zero-width joiners and the danda do not change the key
+    assert normalize_query("मेरा\u200d बैलेंस\u200b क्या है।") == normalize_query("मेरा बैलेंस क्या है")
+    assert normalize_query("?!.") == ""
+
+
+def test_equivalent_questions_share_a_key():
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60)
+    assert _key(cache, "What is KYC?") == _key(cache, "what is kyc")
+    assert _key(cache, "What is KYC?") != _key(cache, "What is KYC?", language="hi")
+    assert _key(cache, "What is KYC?") != _key(cache, "What is KYC?", sector="insurance")
+    assert _key(cache, "What is KYC?") != _key(cache, "What is KYC?", prompt_version="2")
+    assert _key(cache, "What is KYC?") != _key(cache, "What is KYC?", model="other")
+
+
+def test_bypass_rules():
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60)
+    assert _key(cache, "What is KYC?", context="Customer: Anita, balance 5000") is None
+    assert _key(cache, "And the charges?", history=[{"role": "user", "content": "Hi"}]) is None
+    assert _key(cache, "Block card 4111 1111 1111 1111") is None
+    assert _key(cache, "Status of loan 98765-43210?") is None
+    assert _key(cache, "Mail me at anita@example.com") is None
+    assert _key(cache, "...") is None
+    assert cache.bypassed == {"context": 1, "history": 1, "personal_data": 3, "empty": 1}
+    
+    # Short numbers are not personal data; whitespace-only context is no context
+    assert _key(cache, "What is a 5 year FD rate?", context="   ") is not None
+    
+    disabled = LLMResponseCache(max_entries=10, ttl_seconds=60, enabled=False)
+    assert _key(disabled, "What is KYC?") is None
+
+
+def test_ttl_expiry(clock):
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60)
+    cache.put("k", "KYC is Know Your Customer.")
+    
+    clock[0] += 59
+    assert cache.get("k") == "KYC is Know Your Customer."
+    
+    clock[0] += 1
+    assert cache.get("k") is None
+    assert cache.expired == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction(clock):
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # a is now the most recently used
+    
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.evictions == 1
+
+
+def test_blank_responses_are_not_cached():
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60)
+    cache.put("k", "   ")
+    assert cache.get("k") is None
+    
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.0
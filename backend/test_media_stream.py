@@ -0,0 +1,190 @@
+"""
+Media Stream Tests
+VAD endpointing, a full conversational turn over a fake Twilio socket, barge-in and turn timeouts
+"""
+
+import asyncio
+import base64
+import json
+import uuid
+
+import numpy as np
+import pytest
+
+from app.services import media_stream as media_module
+from app.services.audio_utils import encode_mulaw, write_mulaw_wav
+from app.services.call_session_store import CallSession, call_session_store
+from app.services.media_stream import FRAME_BYTES, MediaStreamManager, VoiceActivityDetector
+
+
+LOUD = np.full(FRAME_BYTES, 3000, dtype="<i2").tobytes()
+QUIET = np.zeros(FRAME_BYTES, dtype="<i2").tobytes()
+
+
+def _vad() -> VoiceActivityDetector:
+    return VoiceActivityDetector(threshold=400, silence_ms=100, min_speech_ms=60, max_utterance_ms=1000)
+
+
+def _feed(vad: VoiceActivityDetector, frames):
+    return [vad.feed(frame, now=index * 0.02) for index, frame in enumerate(frames)]
+
+
+def test_vad_cuts_utterances_on_trailing_silence():
+    results = _feed(_vad(), [QUIET] * 3 + [LOUD] * 5 + [QUIET] * 5)
+    assert [started for started, _ in results].count(True) == 1
+    assert results[3][0]
+    
+    utterances = [utterance for _, utterance in results if utterance is not None]
+    assert len(utterances) == 1
+    assert utterances[0].speech_ms == 100
+    # Pre-roll, speech and the closing silence
+    assert len(utterances[0].pcm) == len(QUIET) * 3 + len(LOUD) * 5 + len(QUIET) * 5
+    assert utterances[0].last_voice_at == pytest.approx(7 * 0.02)
+
+
+def test_vad_drops_blips_and_caps_long_speech():
+    assert all(utterance is None for _, utterance in _feed(_vad(), [LOUD] * 2 + [QUIET] * 5))
+    
+    utterances = [utterance for _, utterance in _feed(_vad(), [LOUD] * 60) if utterance is not None]
+    assert [utterance.speech_ms for utterance in utterances] == [1000]
+
+
+class FakeTwilioSocket:
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.sent = []
+    
+    async def receive_text(self) -> str:
+        return await self.incoming.get()
+    
+    async def send_text(self, text: str):
+        self.sent.append(json.loads(text))
+    
+    def push(self, event: str, **fields):
+        self.incoming.put_nowait(json.dumps({"event": event, "streamSid": "MZ1", **fields}))
+    
+    def speak(self, frames):
+        for frame in frames:
+            self.push("media", media={"track": "inbound", "payload": base64.b64encode(encode_mulaw(frame)).decode()})
+    
+    def events(self, kind: str):
+        return [message for message in self.sent if message["event"] == kind]
+
+
+@pytest.fixture
+def conversation(monkeypatch):
+    timings = {"stt": 0.0, "reply_seconds": 0.1}
+    monkeypatch.setattr(media_module.settings, "MEDIA_STREAM_SILENCE_MS", 100)
+    monkeypatch.setattr(media_module.settings, "MEDIA_STREAM_MIN_SPEECH_MS", 60)
+    monkeypatch.setattr(media_module.settings, "MEDIA_STREAM_TURN_TIMEOUT_SECONDS", 0.5)
+    
+    async def fake_stt(audio_bytes, language="en"):
+        await asyncio.sleep(timings["stt"])
+        return {"transcript": "What is my balance?"}
+    
+    async def fake_llm(user_query, context, sector="banking", language="en", history=None):
+        return "Your balance is five thousand rupees."
+    
+    async def fake_tts(text, language="en", speaker="meera", encoding="pcm", **kwargs):
+        return write_mulaw_wav(1, 8000, b"\x7f" * int(8000 * timings["reply_seconds"]))
+    
+    monkeypatch.setattr(media_module.sarvam_service, "speech_to_text", fake_stt)
+    monkeypatch.setattr(media_module.sarvam_service, "text_to_speech", fake_tts)
+    monkeypatch.setattr(media_module.groq_service, "generate_bfsi_response", fake_llm)
+    
+    async def open_stream(manager: MediaStreamManager):
+        session = await call_session_store.add(CallSession(
+            call_id=f"stream-{uuid.uuid4().hex[:8]}", phone_number="+919876543210", purpose="payment_reminder",
+            sector="banking", language="en", call_mode="conversation"
+        ))
+        socket = FakeTwilioSocket()
+        socket.push("start", start={"streamSid": "MZ1"})
+        return socket, manager.open(socket, session), session.call_id
+    
+    return open_stream, timings
+
+
+def test_turn_streams_the_reply_and_records_the_exchange(conversation):
+    open_stream, _ = conversation
+    
+    async def scenario():
+        manager = MediaStreamManager(max_streams=5)
+        socket, stream, call_id = await open_stream(manager)
+        running = asyncio.create_task(stream.run())
+        socket.speak([LOUD] * 10 + [QUIET] * 6)
+        await asyncio.sleep(0.4)
+        socket.push("stop")
+        await asyncio.wait_for(running, timeout=2)
+        
+        media = socket.events("media")
+        assert len(media) == 800 // FRAME_BYTES
+        assert all(message["streamSid"] == "MZ1" for message in media)
+        assert [mark["mark"]["name"] for mark in socket.events("mark")] == ["turn-1"]
+        
+        session = await call_session_store.get(call_id)
+        assert [message["role"] for message in session.messages] == ["user", "assistant"]
+        assert session.messages[1]["latency"]["turn"] == 1
+        assert manager.stats()["turns"] == 1
+    
+    asyncio.run(scenario())
+
+
+def test_caller_speech_interrupts_the_reply(conversation):
+    open_stream, timings = conversation
+    timings["reply_seconds"] = 3.0
+    
+    async def scenario():
+        manager = MediaStreamManager(max_streams=5)
+        socket, stream, _ = await open_stream(manager)
+        running = asyncio.create_task(stream.run())
+        socket.speak([LOUD] * 10 + [QUIET] * 6)
+        await asyncio.sleep(0.5)
+        
+        socket.speak([LOUD])
+        await asyncio.sleep(0.2)
+        socket.push("stop")
+        await asyncio.wait_for(running, timeout=2)
+        
+        assert stream.barge_ins == 1
+        assert len(socket.events("clear")) == 1
+        # Sending stopped well short of the three-second reply, and no mark followed
+        assert len(socket.events("media")) < 3 * 8000 // FRAME_BYTES // 2
+        assert socket.events("mark") == []
+    
+    asyncio.run(scenario())
+
+
+def test_slow_turns_are_abandoned(conversation):
+    open_stream, timings = conversation
+    timings["stt"] = 1.0
+    
+    async def scenario():
+        manager = MediaStreamManager(max_streams=5)
+        socket, stream, _ = await open_stream(manager)
+        running = asyncio.create_task(stream.run())
+        socket.speak([LOUD] * 10 + [QUIET] * 6)
+        await asyncio.sleep(0.7)
+        socket.push("stop")
+        await asyncio.wait_for(running, timeout=2)
+        
+        assert manager.stats()["timed_out_turns"] == 1
+        assert socket.events("media") == []
+    
+    asyncio.run(scenario())
+
+
+def test_stream_limit(conversation):
+    open_stream, _ = conversation
+    
+    async def scenario():
+        manager = MediaStreamManager(max_streams=1)
+        _, stream, _ = await open_stream(manager)
+        with pytest.raises(RuntimeError):
+            await open_stream(manager)
+        assert manager.rejected == 1
+        
+        manager.close(stream)
+        await open_stream(manager)
+        assert manager.stats()["active_streams"] == 1
+    
+    asyncio.run(scenario())
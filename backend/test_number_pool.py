@@ -0,0 +1,135 @@
+"""
+Number Pool Tests
+Caller ID selection, per-number limits, benching and releasing holds finished on other workers
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.session_backend import SQLiteSessionBackend
+from app.services import number_pool as number_pool_module
+from app.services.call_session_store import CallSession, CallSessionStore
+from app.services.number_pool import NumberPool
+
+
+NUMBERS = ["+10000000001", "+10000000002", "+10000000003"]
+
+
+def test_least_loaded_spreads_and_round_robin_rotates():
+    async def scenario():
+        pool = NumberPool(NUMBERS)
+        assert [await pool.acquire(f"c{i}", f"+9190000000{i}") for i in range(3)] == NUMBERS
+        pool.release("c1")
+        assert await pool.acquire("c3", "+919000000003") == NUMBERS[1]
+        
+        pool = NumberPool(NUMBERS, strategy="round_robin")
+        assert [await pool.acquire(f"c{i}", f"+9190000000{i}") for i in range(4)] == NUMBERS + NUMBERS[:1]
+    
+    asyncio.run(scenario())
+
+
+def test_repeat_customers_keep_their_caller_id_while_it_is_healthy():
+    async def scenario():
+        pool = NumberPool(NUMBERS, failure_threshold=1)
+        first = await pool.acquire("c1", "+919876543210")
+        await pool.acquire("c2", "+919000000000")
+        pool.release("c1")
+        pool.release("c2")
+        assert await pool.acquire("c3", "+919876543210") == first
+        # Acquiring again for the same call returns its existing hold
+        assert await pool.acquire("c3", "+919876543210") == first
+        assert pool.stats()["in_flight"] == 1
+        
+        pool.release("c3")
+        pool.record_failure(first)
+        assert await pool.acquire("c4", "+919876543210") != first
+    
+    asyncio.run(scenario())
+
+
+def test_full_numbers_block_until_a_release():
+    async def scenario():
+        pool = NumberPool(NUMBERS[:1], max_in_flight=1)
+        await pool.acquire("c1", "+919000000001")
+        waiting = asyncio.create_task(pool.acquire("c2", "+919000000002"))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        
+        pool.release("c1")
+        assert await asyncio.wait_for(waiting, timeout=1) == NUMBERS[0]
+        assert pool.waits == 1
+    
+    asyncio.run(scenario())
+
+
+def test_benched_numbers_return_after_their_cooldown():
+    async def scenario():
+        pool = NumberPool(NUMBERS[:2], max_in_flight=1, failure_threshold=2, cooldown_seconds=0.1)
+        pool.record_failure(NUMBERS[1])
+        pool.record_success(NUMBERS[1])
+        pool.record_failure(NUMBERS[1])
+        assert pool.stats()["numbers"][1]["available"]
+        
+        pool.record_failure(NUMBERS[1])
+        assert not pool.stats()["numbers"][1]["available"]
+        await pool.acquire("c1", "+919000000001")
+        
+        # The only other number is benched: the dial wakes when its cooldown ends
+        assert await asyncio.wait_for(pool.acquire("c2", "+919000000002"), timeout=1) == NUMBERS[1]
+    
+    asyncio.run(scenario())
+
+
+def test_no_usable_number_is_an_error():
+    async def scenario():
+        pool = NumberPool(NUMBERS[:1])
+        assert pool.set_enabled(NUMBERS[0], False)
+        assert not pool.set_enabled("+19999999999", False)
+        with pytest.raises(RuntimeError):
+            await pool.acquire("c1", "+919000000001")
+        
+        pool.set_enabled(NUMBERS[0], True)
+        assert await pool.acquire("c1", "+919000000001") == NUMBERS[0]
+    
+    asyncio.run(scenario())
+    
+    with pytest.raises(ValueError):
+        NumberPool([])
+    with pytest.raises(ValueError):
+        NumberPool(NUMBERS, strategy="random")
+
+
+def test_calls_finished_on_another_worker_free_their_number(monkeypatch, tmp_path):
+    def worker_store():
+        return CallSessionStore(
+            max_entries=100,
+            max_bytes=1024 * 1024,
+            finished_ttl_seconds=600,
+            active_ttl_seconds=3600,
+            sweep_interval_seconds=60,
+            backend=SQLiteSessionBackend(str(tmp_path / "sessions.db"))
+        )
+    
+    dialing, other = worker_store(), worker_store()
+    monkeypatch.setattr(number_pool_module, "call_session_store", dialing)
+    
+    async def scenario():
+        pool = NumberPool(NUMBERS[:1], max_in_flight=1, reconcile_seconds=0.05)
+        await dialing.add(CallSession(
+            call_id="c1", phone_number="+919000000001", purpose="payment_reminder", sector="banking", language="en"
+        ))
+        await pool.acquire("c1", "+919000000001")
+        waiting = asyncio.create_task(pool.acquire("c2", "+919000000002"))
+        await asyncio.sleep(0.1)
+        assert not waiting.done()
+        
+        # The completed callback lands on the other worker
+        await other.update("c1", twilio_status="completed")
+        assert await asyncio.wait_for(waiting, timeout=1) == NUMBERS[0]
+        assert pool.reconciled == 1
+        
+        for store in (dialing, other):
+            await store.backend.aclose()
+    
+    asyncio.run(scenario())
@@ -0,0 +1,103 @@
+"""
+Retry Scheduler Tests
+Calling window arithmetic and retry due times that respect it
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.session_backend import InMemorySessionBackend
+from app.services import retry_scheduler as retry_module
+from app.services.call_session_store import CallSession
+from app.services.retry_scheduler import CallingWindow, RetryScheduler
+
+
+IST = timezone(timedelta(minutes=330))
+
+
+def _ist(day: int, hour: int, minute: int = 0) -> float:
+    return datetime(2026, 3, day, hour, minute, tzinfo=IST).timestamp()
+
+
+@pytest.fixture
+def window():
+    return CallingWindow(start_hour=9, end_hour=21, utc_offset_minutes=330)
+
+
+def _scheduler(window: CallingWindow, **overrides) -> RetryScheduler:
+    args = {
+        "backend": InMemorySessionBackend(),
+        "window": window,
+        "retry_statuses": ["no-answer", "busy"],
+        "max_attempts": 3,
+        "base_delay_seconds": 600,
+        "max_delay_seconds": 3600,
+        "window_spread_seconds": 900,
+        "concurrency": 1,
+        **overrides
+    }
+    return RetryScheduler(**args)
+
+
+def test_window_contains(window):
+    assert not window.contains(_ist(10, 8, 59))
+    assert window.contains(_ist(10, 9))
+    assert window.contains(_ist(10, 20, 59))
+    assert not window.contains(_ist(10, 21))
+
+
+def test_next_open(window):
+    assert window.next_open(_ist(10, 12)) == _ist(10, 12)
+    assert window.next_open(_ist(10, 7, 30)) == _ist(10, 9)
+    assert window.next_open(_ist(10, 22)) == _ist(11, 9)
+    # Midnight IST is the previous evening in UTC
+    assert window.next_open(_ist(11, 0, 15)) == _ist(11, 9)
+
+
+def test_due_time_inside_window_uses_jittered_backoff(window, monkeypatch):
+    now = _ist(10, 12)
+    monkeypatch.setattr(retry_module.time, "time", lambda: now)
+    scheduler = _scheduler(window)
+    
+    for attempts_made, delay in ((1, 600), (2, 1200), (3, 2400), (5, 3600)):
+        for _ in range(20):
+            due = scheduler._due_time(attempts_made)
+            assert now + delay / 2 <= due <= now + delay
+
+
+def test_due_time_outside_window_moves_to_next_opening(window, monkeypatch):
+    now = _ist(10, 20, 55)
+    monkeypatch.setattr(retry_module.time, "time", lambda: now)
+    scheduler = _scheduler(window)
+    
+    for _ in range(20):
+        due = scheduler._due_time(1)
+        assert _ist(11, 9) <= due <= _ist(11, 9) + 900
+        assert window.contains(due)
+
+
+def test_schedule_for_respects_max_attempts(window):
+    async def scenario():
+        scheduler = _scheduler(window)
+        session = CallSession(
+            call_id="c2", phone_number="+919876543210", purpose="payment_reminder",
+            sector="banking", language="en", twilio_status="no-answer", attempt=2, retry_of="c1"
+        )
+        assert scheduler.should_retry(session)
+        
+        job = await scheduler.schedule_for(session)
+        assert (job.chain_id, job.attempt, job.previous_call_id) == ("c1", 3, "c2")
+        assert scheduler.pending() == 1
+        assert await scheduler.backend.get(RetryScheduler.NAMESPACE, "c1") is not None
+        
+        session.attempt = 3
+        assert await scheduler.schedule_for(session) is None
+        assert scheduler.exhausted == 1
+        
+        assert await scheduler.cancel("c1")
+        assert scheduler.pending() == 0
+        assert await scheduler.backend.get(RetryScheduler.NAMESPACE, "c1") is None
+    
+    asyncio.run(scenario())
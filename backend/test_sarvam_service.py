@@ -0,0 +1,110 @@
+"""
+Sarvam Service Tests
+Sharing identical in-flight TTS syntheses between callers, and stitching templated segments
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import sarvam_service as sarvam_module
+from app.services.audio_utils import read_wav, write_wav
+from app.services.sarvam_service import DEMO_AUDIO, SarvamVoiceService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = SarvamVoiceService()
+    calls = []
+    
+    async def fake_synthesize(payload, cache_key):
+        calls.append(payload["text"])
+        await asyncio.sleep(0.05)
+        return b"audio:" + payload["text"].encode()
+    
+    async def cache_miss(cache_key):
+        return None
+    
+    monkeypatch.setattr(service, "_synthesize", fake_synthesize)
+    monkeypatch.setattr(sarvam_module.tts_cache, "get", cache_miss)
+    service.calls = calls
+    return service
+
+
+def test_identical_requests_share_one_synthesis(service):
+    async def scenario():
+        results = await asyncio.gather(*[service.text_to_speech("Hello Anita") for _ in range(5)])
+        assert results == [b"audio:Hello Anita"] * 5
+        assert service.calls == ["Hello Anita"]
+        assert service._tts_inflight == {}
+    
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_others(service):
+    async def scenario():
+        first = asyncio.create_task(service.text_to_speech("Hello Anita"))
+        await asyncio.sleep(0)
+        others = [asyncio.create_task(service.text_to_speech("Hello Anita")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        
+        first.cancel()
+        assert await asyncio.gather(*others) == [b"audio:Hello Anita"] * 3
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert service.calls == ["Hello Anita"]
+    
+    asyncio.run(scenario())
+
+
+def test_abandoned_synthesis_still_finishes(service):
+    async def scenario():
+        caller = asyncio.create_task(service.text_to_speech("Namaste"))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+        
+        assert service._tts_inflight == {}
+        # A later caller starts afresh rather than inheriting a cancellation
+        assert await service.text_to_speech("Namaste") == b"audio:Namaste"
+    
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def spoken(monkeypatch):
+    service = SarvamVoiceService()
+    requests = []
+    
+    async def fake_tts(text, language="en", speaker="meera", speed=1.0, use_cache=True, encoding="pcm"):
+        requests.append((text, use_cache))
+        if text == "down":
+            return DEMO_AUDIO
+        # The text itself as 16-bit frames, padded to an even length
+        frames = text.encode() + b" " * (len(text) % 2)
+        return write_wav((1, 2, 22050 if text == "mismatched" else 8000), frames)
+    
+    monkeypatch.setattr(service, "text_to_speech", fake_tts)
+    service.requests = requests
+    return service
+
+
+def test_segments_cache_only_static_text(spoken):
+    segments = [("Hello", True), ("Anita", False), ("your EMI is due", True)]
+    audio = asyncio.run(spoken.synthesize_segments(segments))
+    
+    assert spoken.requests == [("Hello", True), ("Anita", False), ("your EMI is due", True)]
+    fmt, frames = read_wav(audio)
+    gap = b"\x00" * (8000 * SarvamVoiceService.SEGMENT_GAP_MS // 1000) * 2
+    assert fmt == (1, 2, 8000)
+    assert frames == gap.join([b"Hello ", b"Anita ", b"your EMI is due "])
+
+
+def test_unstitchable_segments_fall_back_to_the_full_text(spoken):
+    audio = asyncio.run(spoken.synthesize_segments([("Hello", True), ("mismatched", False)]))
+    assert spoken.requests[-1] == ("Hello mismatched", True)
+    assert read_wav(audio)[1] == b"Hello mismatched"
+
+
+def test_demo_audio_from_any_segment_is_returned_as_is(spoken):
+    assert asyncio.run(spoken.synthesize_segments([("Hello", True), ("down", False)])) == DEMO_AUDIO
@@ -0,0 +1,113 @@
+"""
+Sentence TTS Tests
+Incremental sentence splitting and ordered, bounded per-sentence synthesis
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import sentence_tts as sentence_tts_module
+from app.services.sentence_tts import SentenceSplitter, speak_sentences
+
+
+def _split(deltas, min_chars: int = 10):
+    splitter = SentenceSplitter(min_chars)
+    sentences = [sentence for delta in deltas for sentence in splitter.feed(delta)]
+    return sentences, splitter.flush()
+
+
+def test_boundaries_wait_for_the_following_whitespace():
+    sentences, rest = _split(["Your EMI is due on the 5", ". Please pay Rs", ". 5,000 today.", " Thank you"])
+    assert sentences == ["Your EMI is due on the 5.", "Please pay Rs. 5,000 today."]
+    assert rest == ["Thank you"]
+
+
+def test_short_fragments_merge_and_danda_ends_sentences():
+    sentences, rest = _split(["Yes. Your account is active. ", "आपका खाता सक्रिय है। धन्यवाद।\n"])
+    assert sentences == ["Yes. Your account is active.", "आपका खाता सक्रिय है।"]
+    # Too short to send alone, so it waits for more text or the flush
+    assert rest == ["धन्यवाद।"]
+    
+    assert _split(["Hi there."], min_chars=20) == ([], ["Hi there."])
+
+
+@pytest.fixture
+def fake_tts(monkeypatch):
+    state = {"delays": {}, "in_flight": 0, "peak": 0, "cancelled": 0}
+    
+    async def text_to_speech(text, language="en", speaker="meera", encoding="pcm", **kwargs):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(state["delays"].get(text, 0.01))
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+        finally:
+            state["in_flight"] -= 1
+        return text.encode()
+    
+    monkeypatch.setattr(sentence_tts_module.sarvam_service, "text_to_speech", text_to_speech)
+    return state
+
+
+async def _stream(*deltas, error: Exception = None):
+    for delta in deltas:
+        await asyncio.sleep(0)
+        yield delta
+    if error:
+        raise error
+
+
+ANSWER = ["First sentence here. ", "Second sentence here. ", "Third sentence here. ", "Fourth sentence here."]
+
+
+def test_chunks_arrive_in_order_despite_uneven_synthesis(fake_tts):
+    fake_tts["delays"] = {"First sentence here.": 0.1, "Third sentence here.": 0.05}
+    
+    async def scenario():
+        chunks = [chunk async for chunk in speak_sentences(_stream(*ANSWER), max_concurrency=4, min_chars=5)]
+        assert [chunk.index for chunk in chunks] == [0, 1, 2, 3]
+        assert [chunk.audio for chunk in chunks] == [sentence.strip().encode() for sentence in ANSWER]
+        # All four were synthesized together behind the slow first sentence
+        assert fake_tts["peak"] == 4
+    
+    asyncio.run(scenario())
+
+
+def test_concurrency_is_bounded(fake_tts):
+    async def scenario():
+        chunks = [chunk async for chunk in speak_sentences(_stream(*ANSWER), max_concurrency=2, min_chars=5)]
+        assert len(chunks) == 4
+        assert fake_tts["peak"] == 2
+    
+    asyncio.run(scenario())
+
+
+def test_source_errors_surface_after_the_spoken_part(fake_tts):
+    async def scenario():
+        spoken = []
+        with pytest.raises(RuntimeError):
+            async for chunk in speak_sentences(_stream(*ANSWER[:2], error=RuntimeError("LLM stream dropped")), min_chars=5):
+                spoken.append(chunk.text)
+        assert spoken == ["First sentence here.", "Second sentence here."]
+    
+    asyncio.run(scenario())
+
+
+def test_closing_early_cancels_outstanding_synthesis(fake_tts):
+    fake_tts["delays"] = {sentence.strip(): 0.5 for sentence in ANSWER[1:]}
+    
+    async def scenario():
+        stream = speak_sentences(_stream(*ANSWER), max_concurrency=4, min_chars=5)
+        first = await stream.__anext__()
+        assert first.index == 0
+        await asyncio.sleep(0.05)
+        
+        await stream.aclose()
+        await asyncio.sleep(0)
+        assert fake_tts["cancelled"] == 3
+        assert fake_tts["in_flight"] == 0
+    
+    asyncio.run(scenario())
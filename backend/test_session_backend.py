@@ -0,0 +1,274 @@
+"""
+Session Backend Tests
+TTL, pop, atomic updates, secondary indexes and namespace isolation for the memory, SQLite and Redis backends
+"""
+
+import asyncio
+import time
+
+import fakeredis.aioredis
+import pytest
+
+from app.core.session_backend import InMemorySessionBackend, RedisSessionBackend, SQLiteSessionBackend
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = InMemorySessionBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteSessionBackend(str(tmp_path / "sessions.db"))
+    else:
+        backend = RedisSessionBackend("redis://test", client=fakeredis.aioredis.FakeRedis(decode_responses=True))
+    yield backend
+    asyncio.run(backend.aclose())
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def worker_backends(request, tmp_path):
+    """Two handles on one shared store, as two API workers would hold"""
+    if request.param == "sqlite":
+        backends = [SQLiteSessionBackend(str(tmp_path / "sessions.db")) for _ in range(2)]
+    else:
+        server = fakeredis.FakeServer()
+        backends = [
+            RedisSessionBackend("redis://test", client=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+            for _ in range(2)
+        ]
+    yield backends
+    for backend in backends:
+        asyncio.run(backend.aclose())
+
+
+def _setter(name, value, ttl_seconds=None):
+    def apply(record):
+        record[name] = value
+        return ttl_seconds
+    return apply
+
+
+def _increment(record):
+    record["n"] += 1
+
+
+def _indexer(record):
+    return {f"status:{record['status']}": record["created"], f"phone:{record['phone']}": record["created"]}
+
+
+def _call(status, created, phone="+911"):
+    return {"status": status, "created": created, "phone": phone}
+
+
+async def _sleep_past_expiry(backend):
+    await asyncio.sleep(1.1)
+    # fakeredis expires keys against the wall clock
+    if isinstance(backend, RedisSessionBackend):
+        time.sleep(0.1)
+
+
+def test_set_get_delete(backend):
+    async def scenario():
+        await backend.set("call", "a", {"status": "ringing", "name": "अनिता"})
+        assert await backend.get("call", "a") == {"status": "ringing", "name": "अनिता"}
+        
+        await backend.set("call", "a", {"status": "completed"})
+        assert await backend.get("call", "a") == {"status": "completed"}
+        
+        await backend.delete("call", "a")
+        assert await backend.get("call", "a") is None
+        assert await backend.get("call", "missing") is None
+    
+    asyncio.run(scenario())
+
+
+def test_ttl_expiry(backend):
+    async def scenario():
+        await backend.set("consent", "short", {"granted": True}, ttl_seconds=1)
+        await backend.set("consent", "long", {"granted": True}, ttl_seconds=60)
+        await backend.set("consent", "forever", {"granted": False})
+        assert await backend.get("consent", "short") == {"granted": True}
+        
+        await asyncio.sleep(1.1)
+        # fakeredis expires keys against the wall clock
+        if isinstance(backend, RedisSessionBackend):
+            time.sleep(0.1)
+        
+        assert await backend.get("consent", "short") is None
+        assert await backend.pop("consent", "short") is None
+        assert await backend.get("consent", "long") == {"granted": True}
+        assert await backend.get("consent", "forever") == {"granted": False}
+        assert len(await backend.values("consent")) == 2
+    
+    asyncio.run(scenario())
+
+
+def test_pop_is_single_winner(backend):
+    async def scenario():
+        await backend.set("call_retry", "chain", {"attempt": 2})
+        results = await asyncio.gather(*[backend.pop("call_retry", "chain") for _ in range(5)])
+        assert [result for result in results if result is not None] == [{"attempt": 2}]
+        assert await backend.get("call_retry", "chain") is None
+    
+    asyncio.run(scenario())
+
+
+def test_get_many_set_many(backend):
+    async def scenario():
+        await backend.set_many("call", [("a", {"n": 1}, None), ("b", {"n": 2}, 60)])
+        await backend.set("consent", "c", {"n": 3})
+        
+        records = await backend.get_many("call", ["a", "b", "c", "missing"])
+        assert records == {"a": {"n": 1}, "b": {"n": 2}}
+        assert await backend.get_many("call", []) == {}
+        
+        await backend.set_many("call", [("a", {"n": 10}, None)])
+        assert await backend.get("call", "a") == {"n": 10}
+    
+    asyncio.run(scenario())
+
+
+def test_modify(backend):
+    async def scenario():
+        await backend.set("call", "a", {"n": 1, "status": "ringing"})
+        assert await backend.modify("call", "a", _setter("status", "completed")) == {"n": 1, "status": "completed"}
+        assert await backend.get("call", "a") == {"n": 1, "status": "completed"}
+        assert await backend.modify("call", "missing", _setter("status", "completed")) is None
+        assert await backend.get("call", "missing") is None
+        
+        await backend.set("call", "b", {"n": 2})
+        records = await backend.modify_many("call", [("a", _increment), ("b", _increment), ("missing", _increment)])
+        assert records == {"a": {"n": 2, "status": "completed"}, "b": {"n": 3}}
+        
+        # The returned TTL replaces the old one
+        await backend.modify("call", "b", _setter("n", 4, ttl_seconds=1))
+        await asyncio.sleep(1.1)
+        if isinstance(backend, RedisSessionBackend):
+            time.sleep(0.1)
+        assert await backend.get("call", "b") is None
+    
+    asyncio.run(scenario())
+
+
+def test_concurrent_modify_keeps_every_change(worker_backends):
+    async def scenario():
+        first, second = worker_backends
+        await first.set("call", "c", {"n": 0})
+        
+        await asyncio.gather(*[
+            (first, second)[index % 2].modify("call", "c", _setter(f"field_{index}", index))
+            for index in range(20)
+        ] + [
+            (first, second)[index % 2].modify("call", "c", _increment)
+            for index in range(20)
+        ])
+        
+        assert await second.get("call", "c") == {"n": 20, **{f"field_{index}": index for index in range(20)}}
+    
+    asyncio.run(scenario())
+
+
+def test_indexes_follow_writes(backend):
+    backend.register_indexer("call", _indexer)
+    
+    async def scenario():
+        await backend.set("call", "a", _call("ringing", 1.0))
+        await backend.set_many("call", [
+            ("b", _call("ringing", 2.0), 60),
+            ("c", _call("completed", 2.0, phone="+912"), None),
+            ("d", _call("ringing", 2.0), 60)
+        ])
+        
+        assert await backend.index_range("call", "status:ringing") == [(2.0, "d"), (2.0, "b"), (1.0, "a")]
+        # Keyset paging breaks score ties on the key
+        assert await backend.index_range("call", "status:ringing", below=(2.0, "d"), limit=1) == [(2.0, "b")]
+        assert await backend.index_range("call", "status:ringing", below=(2.0, "b")) == [(1.0, "a")]
+        assert await backend.index_range("call", "status:ringing", min_score=1.5) == [(2.0, "d"), (2.0, "b")]
+        assert await backend.index_range("call", "phone:+912") == [(2.0, "c")]
+        assert await backend.index_counts("call", "status:") == {"status:ringing": 3, "status:completed": 1}
+        
+        # An update moves the record between indexes
+        await backend.modify("call", "b", _setter("status", "completed"))
+        assert await backend.index_range("call", "status:ringing") == [(2.0, "d"), (1.0, "a")]
+        assert await backend.index_range("call", "status:completed") == [(2.0, "c"), (2.0, "b")]
+        
+        await backend.delete("call", "a")
+        assert (await backend.pop("call", "d"))["status"] == "ringing"
+        assert await backend.index_range("call", "status:ringing") == []
+        assert await backend.index_counts("call", "status:") == {"status:completed": 2}
+        assert await backend.index_counts("call") == {"status:completed": 2, "phone:+911": 1, "phone:+912": 1}
+        
+        # Other namespaces are not indexed
+        await backend.set("consent", "x", _call("ringing", 3.0))
+        assert await backend.index_range("consent", "status:ringing") == []
+    
+    asyncio.run(scenario())
+
+
+def test_index_entries_expire_with_their_record(backend):
+    backend.register_indexer("call", _indexer)
+    
+    async def scenario():
+        await backend.set("call", "short", _call("ringing", 1.0), ttl_seconds=1)
+        await backend.set("call", "long", _call("ringing", 2.0), ttl_seconds=60)
+        assert len(await backend.index_range("call", "status:ringing")) == 2
+        
+        await _sleep_past_expiry(backend)
+        assert await backend.index_range("call", "status:ringing") == [(2.0, "long")]
+        assert await backend.index_counts("call", "status:") == {"status:ringing": 1}
+        
+        await backend.purge_expired()
+        assert await backend.index_range("call", "phone:+911") == [(2.0, "long")]
+    
+    asyncio.run(scenario())
+
+
+def test_concurrent_status_moves_leave_one_index_entry(worker_backends):
+    for backend in worker_backends:
+        backend.register_indexer("call", _indexer)
+    
+    async def scenario():
+        first, second = worker_backends
+        await first.set_many("call", [(f"k{index}", _call("queued", float(index)), 60) for index in range(10)])
+        
+        await asyncio.gather(*[
+            (first, second)[turn % 2].modify("call", f"k{index}", _setter("status", status))
+            for index in range(10)
+            for turn, status in enumerate(("ringing", "in-progress", "completed", "busy"))
+        ])
+        
+        counts = await second.index_counts("call", "status:")
+        assert sum(counts.values()) == 10
+        for index in range(10):
+            status = (await first.get("call", f"k{index}"))["status"]
+            assert (float(index), f"k{index}") in await second.index_range("call", f"status:{status}")
+    
+    asyncio.run(scenario())
+
+
+def test_namespace_isolation(backend):
+    async def scenario():
+        await backend.set("call", "x", {"kind": "call"})
+        await backend.set("consent", "x", {"kind": "consent"})
+        await backend.set("call_sid", "x", {"kind": "sid"})
+        
+        assert await backend.get("call", "x") == {"kind": "call"}
+        assert await backend.values("consent") == [{"kind": "consent"}]
+        
+        await backend.delete("call", "x")
+        assert await backend.get("consent", "x") == {"kind": "consent"}
+        assert await backend.pop("call_sid", "x") == {"kind": "sid"}
+        assert await backend.values("call") == []
+        assert await backend.values("consent") == [{"kind": "consent"}]
+    
+    asyncio.run(scenario())
+
+
+def test_purge_expired(backend):
+    async def scenario():
+        await backend.set("call", "old", {"n": 1}, ttl_seconds=1)
+        await backend.set("call", "new", {"n": 2}, ttl_seconds=60)
+        await asyncio.sleep(1.1)
+        await backend.purge_expired()
+        assert await backend.values("call") == [{"n": 2}]
+    
+    asyncio.run(scenario())
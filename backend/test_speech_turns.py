@@ -0,0 +1,130 @@
+"""
+Speech Turn Tests
+History-aware gather turns, the per-stage fallbacks within the turn budget, and the gather webhook
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import voice
+from app.services import speech_turns as speech_turns_module
+from app.services.audio_store import audio_store
+from app.services.call_session_store import CallSession, call_session_store
+from app.services.speech_turns import FALLBACK_REPLIES, SpeechTurnService
+
+
+REPLY_AUDIO = b"RIFF" + bytes(200)
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    calls = {"llm_delay": 0.0, "tts_delay": 0.0, "tts_audio": REPLY_AUDIO, "histories": []}
+    
+    async def fake_llm(user_query, context, sector="banking", language="en", history=None):
+        calls["histories"].append(history)
+        await asyncio.sleep(calls["llm_delay"])
+        return f"You asked: {user_query}"
+    
+    async def fake_tts(text, language="en", speaker="meera", encoding="pcm", **kwargs):
+        await asyncio.sleep(calls["tts_delay"])
+        return calls["tts_audio"]
+    
+    monkeypatch.setattr(speech_turns_module.groq_service, "generate_bfsi_response", fake_llm)
+    monkeypatch.setattr(speech_turns_module.sarvam_service, "text_to_speech", fake_tts)
+    return calls
+
+
+async def _gather_session(language: str = "en") -> CallSession:
+    return await call_session_store.add(CallSession(
+        call_id=f"gather-{uuid.uuid4().hex[:8]}", phone_number="+919876543210", purpose="payment_reminder",
+        sector="banking", language=language, call_mode="gather", public_url="https://calls.example.com/"
+    ))
+
+
+def test_turns_carry_history_and_store_reply_audio(providers):
+    async def scenario():
+        service = SpeechTurnService(budget_seconds=2.0, tts_reserve_seconds=0.5)
+        session = await _gather_session()
+        
+        first = await service.respond(session, "When is my EMI due?", 0.92)
+        assert (first.turn, first.fallback) == (1, None)
+        assert audio_store.size_of(first.audio_ref) == len(REPLY_AUDIO)
+        
+        session = await call_session_store.get(session.call_id)
+        second = await service.respond(session, "And the amount?")
+        assert second.turn == 2
+        assert [m["content"] for m in providers["histories"][1]] == ["When is my EMI due?", "You asked: When is my EMI due?"]
+        
+        session = await call_session_store.get(session.call_id)
+        assert [m["role"] for m in session.messages] == ["user", "assistant"] * 2
+        assert session.messages[0]["confidence"] == 0.92
+        assert service.stats()["turns"] == 2 and service.stats()["fallbacks"] == {}
+    
+    asyncio.run(scenario())
+
+
+def test_slow_llm_falls_back_to_an_apology(providers):
+    providers["llm_delay"] = 1.0
+    
+    async def scenario():
+        service = SpeechTurnService(budget_seconds=0.6, tts_reserve_seconds=0.3)
+        session = await _gather_session("hi")
+        turn = await service.respond(session, "Mera balance kya hai?")
+        
+        assert (turn.fallback, turn.audio_ref) == ("llm_timeout", None)
+        assert turn.reply == FALLBACK_REPLIES["hi"]
+        # The LLM only got the budget minus the TTS reserve
+        assert turn.timing["llm_ms"] < 500
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("tts_delay, tts_audio, fallback", [
+    (1.0, REPLY_AUDIO, "tts_timeout"),
+    (0.0, b"RIFF", "tts_failed")
+])
+def test_synthesis_misses_say_the_reply(providers, tts_delay, tts_audio, fallback):
+    providers.update(tts_delay=tts_delay, tts_audio=tts_audio)
+    
+    async def scenario():
+        service = SpeechTurnService(budget_seconds=0.5, tts_reserve_seconds=0.2)
+        turn = await service.respond(await _gather_session(), "What is my balance?")
+        assert (turn.fallback, turn.audio_ref, turn.reply) == (fallback, None, "You asked: What is my balance?")
+        assert service.stats()["fallbacks"] == {fallback: 1}
+    
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def gather_client(providers):
+    app = FastAPI()
+    app.include_router(voice.router, prefix="/api/voice")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_gather_webhook_plays_the_reply_and_listens_again(gather_client):
+    session = asyncio.run(_gather_session())
+    url = f"/api/voice/gather/{session.call_id}"
+    
+    twiml = gather_client.post(url, data={"SpeechResult": "When is my EMI due?", "Confidence": "0.9"}).text
+    assert "<Play>https://calls.example.com/api/voice/audio/clips/" in twiml
+    assert f'action="https://calls.example.com/api/voice/gather/{session.call_id}"' in twiml
+    assert "<Hangup/>" not in twiml
+    
+    # Silence ends the call
+    assert "<Hangup/>" in gather_client.post(url, data={"SpeechResult": ""}).text
+
+
+def test_gather_webhook_hangs_up_after_the_last_turn(gather_client, monkeypatch):
+    monkeypatch.setattr(voice.settings, "GATHER_MAX_TURNS", 2)
+    session = asyncio.run(_gather_session())
+    url = f"/api/voice/gather/{session.call_id}"
+    
+    assert "<Hangup/>" not in gather_client.post(url, data={"SpeechResult": "Hello"}).text
+    assert "<Hangup/>" in gather_client.post(url, data={"SpeechResult": "Goodbye"}).text
+    assert gather_client.post("/api/voice/gather/no-such-call", data={"SpeechResult": "Hello"}).text == voice._TWIML_NOT_FOUND.decode()
@@ -0,0 +1,94 @@
+"""
+Twilio REST Transport Tests
+Form-encoded requests over the shared pool and Twilio error responses
+"""
+
+import asyncio
+import base64
+from functools import partial
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import twilio_rest
+from app.services.twilio_rest import AsyncTwilioClient, TwilioAPIError, TwilioResource
+
+
+@pytest.fixture
+def twilio(monkeypatch):
+    requests = []
+    responses = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses.pop(0) if responses else httpx.Response(201, json={"sid": "CA1", "status": "queued"})
+    
+    monkeypatch.setattr(
+        twilio_rest.httpx, "AsyncClient", partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    )
+    return AsyncTwilioClient(), requests, responses
+
+
+def test_create_call_posts_form_data_with_basic_auth(twilio):
+    client, requests, _ = twilio
+    
+    async def scenario():
+        call = await client.create_call(
+            to="+919876543210",
+            from_="+10000000000",
+            url="https://example.com/twiml/c1",
+            status_callback="https://example.com/status/c1",
+            status_callback_event=["initiated", "ringing", "answered", "completed"]
+        )
+        pool = client._client
+        await client.create_message(to="whatsapp:+919876543210", from_="whatsapp:+10000000000", body="Hi")
+        assert client._client is pool
+        await client.aclose()
+        return call
+    
+    call = asyncio.run(scenario())
+    assert (call.sid, call.status) == ("CA1", "queued")
+    
+    request = requests[0]
+    assert request.method == "POST"
+    assert request.url.path == f"/2010-04-01/Accounts/{settings.TWILIO_ACCOUNT_SID}/Calls.json"
+    credentials = f"{settings.TWILIO_ACCOUNT_SID}:{settings.TWILIO_AUTH_TOKEN}".encode()
+    assert request.headers["authorization"] == "Basic " + base64.b64encode(credentials).decode()
+    
+    form = parse_qs(request.content.decode())
+    assert form["To"] == ["+919876543210"]
+    assert form["Url"] == ["https://example.com/twiml/c1"]
+    assert form["StatusCallbackMethod"] == ["POST"]
+    assert form["StatusCallbackEvent"] == ["initiated", "ringing", "answered", "completed"]
+    
+    assert requests[1].url.path.endswith("/Messages.json")
+    assert "MediaUrl" not in parse_qs(requests[1].content.decode())
+
+
+def test_error_responses_raise_twilio_api_error(twilio):
+    client, _, responses = twilio
+    responses.append(httpx.Response(429, json={"code": 20429, "message": "Too Many Requests"}))
+    responses.append(httpx.Response(502, text="<html>Bad Gateway</html>"))
+    
+    async def scenario():
+        with pytest.raises(TwilioAPIError) as rate_limited:
+            await client.create_call(to="+919876543210", from_="+10000000000", url="https://example.com/t")
+        with pytest.raises(TwilioAPIError) as bad_gateway:
+            await client.create_call(to="+919876543210", from_="+10000000000", url="https://example.com/t")
+        await client.aclose()
+        return rate_limited.value, bad_gateway.value
+    
+    rate_limited, bad_gateway = asyncio.run(scenario())
+    assert (rate_limited.status_code, rate_limited.code, rate_limited.message) == (429, 20429, "Too Many Requests")
+    assert (bad_gateway.status_code, bad_gateway.code) == (502, None)
+    assert "Bad Gateway" in bad_gateway.message
+
+
+def test_resource_attributes():
+    resource = TwilioResource({"sid": "SM1", "status": "sent"})
+    assert resource.sid == "SM1"
+    assert resource.to_dict() == {"sid": "SM1", "status": "sent"}
+    with pytest.raises(AttributeError):
+        resource.price
@@ -0,0 +1,84 @@
+"""
+TwiML Tests
+Prebuilt TwiML served by lookup, and the holds and fallbacks while greeting audio is pending
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.api import voice
+from app.services.call_session_store import CallSession, call_session_store
+
+
+def _session(**fields) -> CallSession:
+    args = {
+        "call_id": f"twiml-{uuid.uuid4().hex[:8]}",
+        "phone_number": "+919876543210",
+        "purpose": "payment_reminder",
+        "sector": "banking",
+        "language": "en",
+        "greeting": "Hello Anita, your EMI of 5000 is due on 5 March & payable online.",
+        "public_url": "https://calls.example.com/",
+        **fields
+    }
+    return CallSession(**args)
+
+
+def _twiml(call_id: str, waited: float = 0.0) -> str:
+    response = asyncio.run(voice.get_twiml_for_call(call_id, waited=waited))
+    assert response.media_type == "application/xml"
+    return response.body.decode()
+
+
+def test_prebuilt_twiml_is_served_as_stored():
+    session = _session(audio_ref="a" * 64, audio_size=4000, twiml="<Response><Play>prebuilt</Play></Response>")
+    asyncio.run(call_session_store.add(session))
+    assert _twiml(session.call_id) == "<Response><Play>prebuilt</Play></Response>"
+
+
+def test_missing_twiml_is_rendered_once_and_kept():
+    session = _session(audio_ref="a" * 64, audio_size=4000)
+    asyncio.run(call_session_store.add(session))
+    
+    twiml = _twiml(session.call_id)
+    assert f"<Play>https://calls.example.com/api/voice/audio/{session.call_id}.wav</Play>" in twiml
+    assert asyncio.run(call_session_store.get(session.call_id)).twiml == twiml
+
+
+def test_unknown_call_gets_the_not_found_document():
+    assert _twiml("no-such-call") == voice._TWIML_NOT_FOUND.decode()
+
+
+def test_pending_audio_redirects_then_falls_back_to_say(monkeypatch):
+    monkeypatch.setattr(voice.settings, "TWIML_AUDIO_HOLD_SECONDS", 0.0)
+    monkeypatch.setattr(voice.settings, "TWIML_AUDIO_WAIT_SECONDS", 3.0)
+    session = _session()
+    asyncio.run(call_session_store.add(session))
+    
+    assert f"/api/voice/twiml/{session.call_id}?waited=1</Redirect>" in _twiml(session.call_id)
+    assert "?waited=3</Redirect>" in _twiml(session.call_id, waited=2)
+    
+    # Out of time: speak the greeting rather than keep the caller waiting
+    twiml = _twiml(session.call_id, waited=3)
+    assert "<Say" in twiml and "due on 5 March &amp; payable online." in twiml
+    assert asyncio.run(call_session_store.get(session.call_id)).twiml is None
+
+
+def test_failed_synthesis_says_the_greeting_at_once(monkeypatch):
+    monkeypatch.setattr(voice.settings, "TWIML_AUDIO_HOLD_SECONDS", 5.0)
+    session = _session(audio_failed=True)
+    asyncio.run(call_session_store.add(session))
+    assert "<Say" in _twiml(session.call_id)
+
+
+@pytest.mark.parametrize("call_mode, expected", [
+    ("playback", "<Pause length=\"1\"/>"),
+    ("conversation", "<Stream url=\"wss://calls.example.com/api/voice/stream/"),
+    ("gather", "<Gather input=\"speech\" action=\"https://calls.example.com/api/voice/gather/")
+])
+def test_render_by_call_mode(call_mode, expected):
+    twiml = voice._render_call_twiml(_session(audio_ref="a" * 64, audio_size=4000, call_mode=call_mode))
+    assert expected in twiml
+    assert "<Play>https://calls.example.com/api/voice/audio/" in twiml
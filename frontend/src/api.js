@@ -27,12 +27,22 @@ export const smsAPI = {
 // Voice API
 export const voiceAPI = {
     initiateCall: (data) => api.post('/api/voice/outbound', data),
+    startCampaign: (data) => api.post('/api/voice/campaigns', data),
+    getCampaign: (campaignId) => api.get(`/api/voice/campaigns/${campaignId}`),
     textToSpeech: (data) => api.post('/api/voice/tts', data),
     speechToText: (formData) => api.post('/api/voice/stt', formData, {
         headers: { 'Content-Type': 'multipart/form-data' }
     }),
     processQuery: (data) => api.post('/api/voice/query', data),
     getCallDetails: (callId) => api.get(`/api/voice/call/${callId}`),
+    listCalls: (params) => api.get('/api/voice/calls', { params }),
+    // Live call status / campaign progress; listen for 'call_status' and 'campaign_progress'
+    subscribeEvents: ({ callIds, campaignIds } = {}) => {
+        const params = new URLSearchParams()
+        if (callIds?.length) params.set('call_ids', callIds.join(','))
+        if (campaignIds?.length) params.set('campaign_ids', campaignIds.join(','))
+        return new EventSource(`${API_BASE_URL}/api/voice/events?${params}`)
+    },
     completeCall: (callId, outcome) => api.post(`/api/voice/call/${callId}/complete`, { outcome }),
     getVoices: (language) => api.get('/api/voice/voices', { params: { language } })
 }